@@ -0,0 +1,121 @@
+import argparse
+import os
+import pathlib
+import sys
+import time
+from decimal import Decimal, ROUND_HALF_EVEN, localcontext
+
+import numpy as np
+
+from src.currencyconverter.bnr_xml import parse_latest
+from src.currencyconverter.currency_catalog import load_catalog
+from src.currencyconverter.fixed_point import FixedPointEngine, ROUNDING_MODES, minor_unit_exponents
+
+
+"""
+================== Fixed-point benchmark ==================
+
+Compares the int64 fixed-point conversions with a 'decimal.Decimal' reference on the same random
+workload: every result must be identical, and the throughput of both is reported.
+
+Usage (from the project directory):
+    - python -m benchmarks.fixed_point_benchmark
+    - python -m benchmarks.fixed_point_benchmark --rows 1000000 --rounding ROUND_HALF_UP
+
+Note:
+    - The rates are the BNR publication of the test fixtures, so the results are reproducible.
+    - The float conversion used before (rates rounded to 2 decimals, then the result rounded) is
+    measured too, with the number of results it gets wrong.
+"""
+
+
+RATES_FIXTURE = os.path.join(pathlib.Path(__file__).resolve().parent.parent, 'tests', 'fixtures', 'nbrfxrates.xml')
+
+
+def decimal_reference(fixed_point: FixedPointEngine, amounts: list[int], sources: list[int], targets: list[int],
+                      rounding: str) -> list[int]:
+    """
+    Convert the minor units one by one with Decimal (the exact reference).
+    """
+    rates = [Decimal(int(rate)) for rate in fixed_point.scaled_rates]
+    powers = [Decimal(10) ** int(exponent) for exponent in fixed_point.exponents]
+    with localcontext() as context:
+        context.prec = 60
+        return [int((amount * rates[source] * powers[target] / (rates[target] * powers[source]))
+                    .to_integral_value(rounding))
+                for amount, source, target in zip(amounts, sources, targets)]
+
+
+def float_conversion(ron_rates: np.ndarray, exponents: np.ndarray, amounts: np.ndarray, sources: np.ndarray,
+                     targets: np.ndarray) -> np.ndarray:
+    """
+    Convert the minor units with float rates rounded to 2 decimals (the previous conversion).
+    """
+    units = amounts / 10.0 ** exponents[sources]
+    rates = (ron_rates[sources] / ron_rates[targets]).round(2)
+    return np.rint((units * rates).round(2) * 10.0 ** exponents[targets]).astype(np.int64)
+
+
+def run(rows: int, rounding: str, seed: int = 0) -> dict[str, float]:
+    """
+    Run the benchmark.
+
+    Parameters:
+        rows (int): The number of converted amounts.
+        rounding (str): The rounding mode.
+        seed (int, optional): The seed of the random workload.
+
+    Returns:
+        dict[str, float]: The measurements (rows per second, speedup and the number of mismatches).
+    """
+    _, ron_rates = parse_latest(RATES_FIXTURE)
+    fixed_point = FixedPointEngine(ron_rates, exponents=minor_unit_exponents(load_catalog()))
+    rng = np.random.default_rng(seed)
+    amounts = rng.integers(-10 ** 13, 10 ** 13, rows)
+    sources = rng.integers(0, len(ron_rates), rows)
+    targets = rng.integers(0, len(ron_rates), rows)
+
+    started = time.perf_counter()
+    converted = fixed_point.convert_minor_many(amounts, sources, targets, rounding)
+    fixed_point_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    expected = decimal_reference(fixed_point, amounts.tolist(), sources.tolist(), targets.tolist(), rounding)
+    decimal_elapsed = time.perf_counter() - started
+
+    values = np.fromiter(ron_rates.values(), dtype=np.float64, count=len(ron_rates))
+    started = time.perf_counter()
+    floats = float_conversion(values, fixed_point.exponents, amounts, sources, targets)
+    float_elapsed = time.perf_counter() - started
+
+    expected = np.array(expected, dtype=np.int64)
+    return {
+        'fixed_point_rows_per_second': rows / fixed_point_elapsed,
+        'decimal_rows_per_second': rows / decimal_elapsed,
+        'float_rows_per_second': rows / float_elapsed,
+        'speedup': decimal_elapsed / fixed_point_elapsed,
+        'fixed_point_mismatches': int((converted != expected).sum()),
+        'float_mismatches': int((floats != expected).sum()),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Run the benchmark from the command line.
+
+    Returns:
+        int: The exit code (1 if a fixed-point result differs from the Decimal reference).
+    """
+    parser = argparse.ArgumentParser(description='Fixed-point conversions vs. the Decimal reference.')
+    parser.add_argument('--rows', type=int, default=200_000)
+    parser.add_argument('--rounding', choices=ROUNDING_MODES, default=ROUND_HALF_EVEN)
+    args = parser.parse_args(argv)
+
+    results = run(args.rows, args.rounding)
+    for name, value in results.items():
+        print(f'{name}: {value:,}' if isinstance(value, int) else f'{name}: {value:,.2f}')
+    return 1 if results['fixed_point_mismatches'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,433 @@
+import argparse
+import datetime
+import fnmatch
+import json
+import os
+import pathlib
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from decimal import Decimal
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from src.currencyconverter.batch_converter import BatchConverter
+from src.currencyconverter.bnr_xml import parse_latest
+from src.currencyconverter.cross_rates import CrossRateEngine
+from src.currencyconverter.currency_catalog import load_catalog
+from src.currencyconverter.currency_converter import CurrencyConvertor
+from src.currencyconverter.currency_model import CurrencyModel
+from src.currencyconverter.excel_converter import ExcelConverter
+from src.currencyconverter.fixed_point import FixedPointEngine, minor_unit_exponents
+from src.currencyconverter.fixture_server import FixtureServer
+from src.currencyconverter.frame_converter import FrameConverter, convert_frame
+from src.currencyconverter.http_client import HttpClient
+from src.currencyconverter.rate_analytics import RateAnalytics, RateHistory
+from src.currencyconverter.rate_cache import RateCache, RateSnapshot
+from src.currencyconverter.rate_parsers import HTML_PARSERS
+from src.currencyconverter.rate_providers import BnrXmlProvider, CursBnrProvider, RateProvider
+
+
+"""
+================== Benchmark suite ==================
+
+Times each stage of a refresh, of a conversion and of an export on fixed inputs (the test fixtures),
+and the bulk conversions from 10^3 to 10^7 rows. The results can be saved as a JSON baseline, and
+a later run compared to it: the stages slower than the baseline beyond a threshold are reported as
+regressions.
+
+Usage (from the project directory):
+    - python -m benchmarks.suite run
+    - python -m benchmarks.suite run --save benchmarks/baselines/default.json
+    - python -m benchmarks.suite compare benchmarks/baselines/default.json --threshold 0.25
+    - python -m benchmarks.suite compare benchmarks/baselines/default.json --current results.json
+    - python -m benchmarks.suite run --only 'bulk_*' --max-rows 1000000
+
+Note:
+    - The network stages run against the fixture server (see 'fixture_server'), so the results
+    don't depend on the connection. They are timed for each provider alone, so every run times the
+    same code path.
+    - Each stage is run 'repeat' times (fewer for the bulk stages above 10^5 rows) and its median
+    duration is compared; the minimum is kept in the baseline as well.
+    - A baseline is only meaningful on the machine it was recorded on.
+"""
+
+
+BASELINES_DIR = os.path.join(pathlib.Path(__file__).resolve().parent, 'baselines')
+FIXTURES_DIR = os.path.join(pathlib.Path(__file__).resolve().parent.parent, 'tests', 'fixtures')
+HISTORY_DAYS = 20 * 260  # 20 years of publications
+BULK_ROWS = (10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7)
+DEFAULT_REPEAT = 15
+DEFAULT_THRESHOLD = 0.25
+BASELINE_FORMAT_VERSION = 1
+
+
+class Workload:
+    """
+    The Workload class holds the fixed inputs of the benchmarks and the resources they share (the
+    fixture server and a temporary directory).
+
+    Attributes:
+        page (bytes): The saved cursbnr.ro page.
+        ron_rates (dict[str, float]): The rates of the saved BNR publication.
+        snapshot (RateSnapshot): The snapshot of these rates.
+        server (FixtureServer): The server replaying the rate sources.
+        temp_dir (str): The directory of the caches and of the exported files.
+    """
+    def __init__(self):
+        with open(os.path.join(FIXTURES_DIR, 'cursbnr.html'), 'rb') as file:
+            self.page = file.read()
+        published, self.ron_rates = parse_latest(os.path.join(FIXTURES_DIR, 'nbrfxrates.xml'))
+        self.snapshot = RateSnapshot(self.ron_rates, 'fixtures', published=published)
+        self.server = FixtureServer(FIXTURES_DIR).start()
+        self.http_client = HttpClient(retries=0)
+        self.temp_dir = tempfile.mkdtemp()
+
+    def close(self) -> None:
+        self.http_client.close()
+        self.server.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def provider(self, name: str) -> RateProvider:
+        """
+        Build a provider of the replayed sources ('bnr_xml' or 'cursbnr').
+        """
+        if name == 'bnr_xml':
+            return BnrXmlProvider(self.server.url_for('nbrfxrates'))
+        return CursBnrProvider(self.server.url_for('cursbnr'))
+
+    def currency_converter(self, currency_for_reference: str = 'USD', provider: str = 'bnr_xml') -> CurrencyConvertor:
+        """
+        Build a CurrencyConvertor querying one replayed source, with its own cache directory.
+        """
+        cache_dir = tempfile.mkdtemp(dir=self.temp_dir)
+        return CurrencyConvertor(currency_for_reference, rate_cache=RateCache(cache_dir, ttl=datetime.timedelta(0)),
+                                 http_client=self.http_client, providers=[self.provider(provider)])
+
+    def loaded_converter(self) -> CurrencyConvertor:
+        """
+        Build a CurrencyConvertor with the saved rates and the continents already loaded.
+        """
+        currency_converter = self.currency_converter()
+        currency_converter.apply_snapshot(self.snapshot)
+        currency_converter._update_rates_to_reference()
+        currency_converter._load_catalog()
+        currency_converter._group_continents_currencies()
+        currency_converter._fetch_currencies_values()
+        return currency_converter
+
+
+def _parse_page(workload: Workload) -> Callable[[], object]:
+    return lambda: HTML_PARSERS['targeted'](workload.page)
+
+
+def _fetch_exchange_rates(provider: str) -> Callable[[Workload], Callable[[], object]]:
+    def factory(workload: Workload) -> Callable[[], object]:
+        currency_converter = workload.currency_converter(provider=provider)
+
+        def fetch():
+            # Without a cached snapshot, the rates are downloaded and parsed again
+            if os.path.exists(currency_converter.rate_cache.file_path):
+                os.remove(currency_converter.rate_cache.file_path)
+            currency_converter._fetch_exchange_rates()
+        return fetch
+    return factory
+
+
+def _revalidate_exchange_rates(provider: str) -> Callable[[Workload], Callable[[], object]]:
+    def factory(workload: Workload) -> Callable[[], object]:
+        currency_converter = workload.currency_converter(provider=provider)
+        currency_converter._fetch_exchange_rates()
+        # The cache keeps the validators of the first response: the next fetches are answered with 304
+        return currency_converter._fetch_exchange_rates
+    return factory
+
+
+def _update_rates_to_reference(workload: Workload) -> Callable[[], object]:
+    currency_converter = workload.currency_converter()
+
+    def update():
+        currency_converter.apply_snapshot(workload.snapshot)
+        currency_converter._update_rates_to_reference()
+    return update
+
+
+def _group_currencies(workload: Workload) -> Callable[[], object]:
+    currency_converter = workload.loaded_converter()
+
+    def group():
+        currency_converter._load_catalog()
+        currency_converter._group_continents_currencies()
+        currency_converter._fetch_currencies_values()
+    return group
+
+
+def _update_values(workload: Workload) -> Callable[[], object]:
+    currency_converter = workload.loaded_converter()
+    currency_model = CurrencyModel(currency_converter.currency_registry)
+    fixed_point = currency_converter.fixed_point
+    amounts = iter([Decimal('1234.56'), Decimal('98.7')] * 10 ** 6)
+    # The window converts the amount to every displayed currency on each change
+    return lambda: currency_model.convert(fixed_point, next(amounts), 'EUR')
+
+
+def _export_csv(workload: Workload) -> Callable[[], object]:
+    currency_converter = workload.loaded_converter()
+    currency_model = CurrencyModel(currency_converter.currency_registry)
+    return ExcelConverter(workload.temp_dir, 'benchmark', currency_model).export_to_csv
+
+
+def _history(workload: Workload) -> RateHistory:
+    """
+    Build 20 years of daily rates around the fixture rates (a random walk of each currency).
+    """
+    codes = list(workload.ron_rates)
+    rng = np.random.default_rng(0)
+    walk = np.exp(np.cumsum(rng.normal(0, 0.005, (HISTORY_DAYS, len(codes))), axis=0))
+    values = walk * np.array(list(workload.ron_rates.values()))
+    dates = np.datetime64('2004-01-01') + np.arange(HISTORY_DAYS)
+    history = RateHistory(codes)
+    history.append_many([(str(day), dict(zip(codes, row))) for day, row in zip(dates, values.tolist())])
+    return history
+
+
+def _analytics(workload: Workload) -> Callable[[], object]:
+    history = _history(workload)
+
+    def compute():
+        analytics = RateAnalytics(history, base='EUR', window=20)
+        return analytics.period_summary('M')
+    return compute
+
+
+def _analytics_update(workload: Workload) -> Callable[[], object]:
+    history = _history(workload)
+    analytics = RateAnalytics(history, base='EUR', window=20)
+    dates = (str(np.datetime64('2004-01-01') + day) for day in range(HISTORY_DAYS, 10 * HISTORY_DAYS))
+
+    def update():
+        # One new publication: only the trailing window is computed again
+        history.append(next(dates), workload.ron_rates)
+        return analytics.update()
+    return update
+
+
+def _bulk_batch_converter(rows: int) -> Callable[[Workload], Callable[[], object]]:
+    def factory(workload: Workload) -> Callable[[], object]:
+        batch_converter = BatchConverter(CrossRateEngine(workload.ron_rates))
+        codes = list(workload.ron_rates)
+        rng = np.random.default_rng(0)
+        chunk = pd.DataFrame({
+            'amount': rng.uniform(0, 10 ** 6, rows).round(2),
+            'currency': pd.Categorical.from_codes(rng.integers(0, len(codes), rows), codes),
+            'target': pd.Categorical.from_codes(rng.integers(0, len(codes), rows), codes),
+        })
+        return lambda: batch_converter.convert_chunk(chunk)
+    return factory
+
+
+def _bulk_frame_converter(rows: int) -> Callable[[Workload], Callable[[], object]]:
+    def factory(workload: Workload) -> Callable[[], object]:
+        history = _history(workload)
+        frame_converter = FrameConverter.from_history(history)
+        codes = list(workload.ron_rates)
+        rng = np.random.default_rng(0)
+        frame = pd.DataFrame({
+            'amount': rng.uniform(0, 10 ** 6, rows).round(2),
+            'currency': pd.Categorical.from_codes(rng.integers(0, len(codes), rows), codes),
+            'target': pd.Categorical.from_codes(rng.integers(0, len(codes), rows), codes),
+            'date': np.datetime64('2004-01-01') + rng.integers(0, HISTORY_DAYS, rows),
+        })
+        return lambda: convert_frame(frame, 'amount', 'currency', to='USD', rates=frame_converter,
+                                     target_col='target', date_col='date')
+    return factory
+
+
+def _bulk_fixed_point(rows: int) -> Callable[[Workload], Callable[[], object]]:
+    def factory(workload: Workload) -> Callable[[], object]:
+        fixed_point = FixedPointEngine(workload.ron_rates, exponents=minor_unit_exponents(load_catalog()))
+        rng = np.random.default_rng(0)
+        amounts = rng.integers(-10 ** 13, 10 ** 13, rows)
+        sources = rng.integers(0, len(workload.ron_rates), rows)
+        targets = rng.integers(0, len(workload.ron_rates), rows)
+        return lambda: fixed_point.convert_minor_many(amounts, sources, targets)
+    return factory
+
+
+# name -> (factory of the timed function, number of rows processed by one call)
+BENCHMARKS = {
+    'parse_page': (_parse_page, None),
+    'fetch_exchange_rates_bnr_xml': (_fetch_exchange_rates('bnr_xml'), None),
+    'fetch_exchange_rates_cursbnr': (_fetch_exchange_rates('cursbnr'), None),
+    'revalidate_exchange_rates_bnr_xml': (_revalidate_exchange_rates('bnr_xml'), None),
+    'revalidate_exchange_rates_cursbnr': (_revalidate_exchange_rates('cursbnr'), None),
+    'update_rates_to_reference': (_update_rates_to_reference, None),
+    'group_currencies': (_group_currencies, None),
+    'update_values': (_update_values, None),
+    'export_csv': (_export_csv, None),
+    'analytics': (_analytics, None),
+    'analytics_update': (_analytics_update, None),
+}
+for _rows in BULK_ROWS:
+    BENCHMARKS[f'bulk_batch_converter_{_rows}'] = (_bulk_batch_converter(_rows), _rows)
+    BENCHMARKS[f'bulk_frame_converter_{_rows}'] = (_bulk_frame_converter(_rows), _rows)
+    BENCHMARKS[f'bulk_fixed_point_{_rows}'] = (_bulk_fixed_point(_rows), _rows)
+
+
+def measure(function: Callable[[], object], repeat: int) -> dict[str, float]:
+    """
+    Time a function (after one warm-up call).
+
+    Returns:
+        dict[str, float]: The median and the minimum durations, in seconds.
+    """
+    function()
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - started)
+    return {'median': statistics.median(durations), 'min': min(durations)}
+
+
+def run(patterns: list[str] | None = None, repeat: int = DEFAULT_REPEAT, max_rows: int = BULK_ROWS[-1]) -> dict:
+    """
+    Run the benchmarks.
+
+    Parameters:
+        patterns (list[str], optional): The names of the run benchmarks (shell-style wildcards, all
+        the benchmarks if not provided).
+        repeat (int, optional): The number of timed calls of each benchmark.
+        max_rows (int, optional): The largest bulk conversion.
+
+    Returns:
+        dict: The results, in the format of the baselines.
+    """
+    results = {}
+    workload = Workload()
+    try:
+        for name, (factory, rows) in BENCHMARKS.items():
+            if patterns and not any(fnmatch.fnmatch(name, pattern) for pattern in patterns):
+                continue
+            if rows is not None and rows > max_rows:
+                continue
+            # The large bulk conversions take seconds: fewer calls are enough for a stable median
+            calls = repeat if rows is None or rows <= 10 ** 5 else max(3, repeat // 5)
+            result = measure(factory(workload), calls)
+            if rows is not None:
+                result['rows'] = rows
+                result['rows_per_second'] = rows / result['median']
+            results[name] = result
+    finally:
+        workload.close()
+    return {
+        'format_version': BASELINE_FORMAT_VERSION,
+        'created': datetime.datetime.now().replace(microsecond=0).isoformat(),
+        'python': platform.python_version(),
+        'machine': platform.platform(),
+        'results': results,
+    }
+
+
+def compare(baseline: dict, current: dict,
+            threshold: float = DEFAULT_THRESHOLD) -> list[tuple[str, float, float, bool]]:
+    """
+    Compare the median durations of a run with a baseline.
+
+    Parameters:
+        baseline (dict): The baseline results.
+        current (dict): The results of the run.
+        threshold (float, optional): The tolerated slowdown (0.25: up to 25% slower).
+
+    Returns:
+        list[tuple[str, float, float, bool]]: The name, the baseline and the current durations of each
+        benchmark in both, and whether it regressed.
+    """
+    comparisons = []
+    for name, result in current['results'].items():
+        if name in baseline['results']:
+            before, after = baseline['results'][name]['median'], result['median']
+            comparisons.append((name, before, after, after > before * (1 + threshold)))
+    return comparisons
+
+
+def load_results(path: str) -> dict:
+    """
+    Load the results saved by 'run --save'.
+
+    Raises:
+        ValueError: If the file isn't in the format of the baselines.
+    """
+    with open(path, encoding='utf-8') as file:
+        results = json.load(file)
+    if not isinstance(results, dict) or results.get('format_version') != BASELINE_FORMAT_VERSION:
+        raise ValueError(f'{path} is not a benchmark baseline')
+    return results
+
+
+def save_results(results: dict, path: str) -> None:
+    """
+    Save the results of a run as a baseline.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(results, file, indent=2)
+        file.write('\n')
+
+
+def _format_duration(seconds: float) -> str:
+    return f'{seconds * 1000:.3f} ms' if seconds < 1 else f'{seconds:.3f} s'
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Run or compare the benchmarks from the command line.
+
+    Returns:
+        int: The exit code (1 if 'compare' found a regression).
+    """
+    parser = argparse.ArgumentParser(prog='benchmarks.suite', description='Time the hot paths of the application.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    run_parser = commands.add_parser('run', help='run the benchmarks')
+    run_parser.add_argument('--save', help='save the results as a baseline')
+    compare_parser = commands.add_parser('compare', help='compare a run with a baseline')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('--current', help='saved results to compare (a new run if not provided)')
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    for command_parser in (run_parser, compare_parser):
+        command_parser.add_argument('--only', nargs='+', help='names of the benchmarks (wildcards allowed)')
+        command_parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+        command_parser.add_argument('--max-rows', type=int, default=BULK_ROWS[-1])
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        results = run(args.only, args.repeat, args.max_rows)
+        for name, result in results['results'].items():
+            throughput = f'  {result["rows_per_second"]:,.0f} rows/sec' if 'rows' in result else ''
+            print(f'{name:<32}{_format_duration(result["median"]):>14}{throughput}')
+        if args.save:
+            save_results(results, args.save)
+        return 0
+
+    try:
+        baseline = load_results(args.baseline)
+        current = load_results(args.current) if args.current else run(args.only, args.repeat, args.max_rows)
+    except (OSError, ValueError) as e:
+        print(e)
+        return 2
+    regressions = 0
+    for name, before, after, regressed in compare(baseline, current, args.threshold):
+        regressions += regressed
+        print(f'{name:<32}{_format_duration(before):>14}{_format_duration(after):>14}{after / before - 1:>+9.1%}'
+              f'{"  REGRESSION" if regressed else ""}')
+    print(f'{regressions} regression(s) beyond {args.threshold:.0%}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
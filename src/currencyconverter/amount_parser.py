@@ -0,0 +1,69 @@
+import re
+from decimal import Decimal
+
+
+"""
+================== Amount parser ==================
+
+Tokenizer of the typed amounts: one or several '<amount> <currency code>' terms, separated by '+',
+',' or ';' (or only by spaces), such as '10EUR + 5.5 GBP, 300JPY'.
+
+Note:
+    - The spaces between an amount and its currency code, and around the separators, are optional.
+    - The currency codes are case-insensitive; the decimal separator is '.'.
+    - The patterns are compiled once: parsing a typed line costs a few microseconds.
+"""
+
+
+TERM_PATTERN = re.compile(r'\s*(?P<amount>[+-]?(?:\d+(?:\.\d*)?|\.\d+))\s*(?P<currency>[A-Za-z]{3})(?![A-Za-z])')
+SEPARATOR_PATTERN = re.compile(r'\s*[+,;]|\s+')
+TRAILING_PATTERN = re.compile(r'\s*')
+
+
+class AmountParseException(Exception):
+    """
+    Custom exception class for an invalid input, raised when the typed text isn't a list of
+    '<amount> <currency code>' terms.
+
+    Attributes:
+        position (int): The position of the first invalid character.
+    """
+    def __init__(self, position: int, reason: str):
+        super().__init__(f'{reason} (at position {position})')
+        self.position = position
+
+
+def parse_amounts(text: str) -> list[tuple[Decimal, str]]:
+    """
+    Split a typed text into its amounts and currency codes.
+
+    Parameters:
+        text (str): The typed text, such as '10EUR + 5.5 GBP, 300JPY'.
+
+    Returns:
+        list[tuple[Decimal, str]]: The amount and the (uppercase) currency code of each term.
+
+    Raises:
+        AmountParseException: If the text is empty, or if a term has no amount or no currency code.
+    """
+    terms, position = [], 0
+    while True:
+        match = TERM_PATTERN.match(text, position)
+        if match is None:
+            reason = 'Missing amount or currency code' if text.strip() else 'No amount'
+            raise AmountParseException(position, reason)
+        terms.append((Decimal(match.group('amount')), match.group('currency').upper()))
+        position = match.end()
+        if TRAILING_PATTERN.match(text, position).end() == len(text):
+            return terms
+        separator = SEPARATOR_PATTERN.match(text, position)
+        if separator is None:
+            raise AmountParseException(position, 'Unexpected character')
+        position = separator.end()
+
+
+def format_amounts(terms: list[tuple[Decimal, str]]) -> str:
+    """
+    Format the terms of a typed text, such as '10 EUR + 5.5 GBP'.
+    """
+    return ' + '.join(f'{amount} {currency}' for amount, currency in terms)
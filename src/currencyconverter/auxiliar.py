@@ -1,9 +1,10 @@
-import tkinter.filedialog
+from typing import TYPE_CHECKING
 
-import customtkinter as ctk
+if TYPE_CHECKING:
+    import customtkinter as ctk
 
 
-def browse_folder(folder_path_entry: ctk.CTkEntry) -> None:
+def browse_folder(folder_path_entry: 'ctk.CTkEntry') -> None:
     """
     Open a file dialog to browse for a folder and update a custom tkinter entry widget with the
     selected folder path.
@@ -11,10 +12,15 @@ def browse_folder(folder_path_entry: ctk.CTkEntry) -> None:
     Parameters:
         folder_path_entry (ctk.CTkEntry): The custom tkinter entry widget where the selected folder
         path will be displayed.
+
+    Note:
+        - tkinter is imported on call, so the module can be used without a display.
     """
+    import tkinter.filedialog
+
     folder_path = tkinter.filedialog.askdirectory()
     if folder_path:
-        folder_path_entry.delete(0, ctk.END)
+        folder_path_entry.delete(0, 'end')
         folder_path_entry.insert(0, folder_path)
 
 
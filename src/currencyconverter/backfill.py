@@ -0,0 +1,213 @@
+import datetime
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable
+from urllib.parse import urlsplit
+
+from src.currencyconverter.bnr_calendar import is_business_day, last_publication
+from src.currencyconverter.bnr_xml import BNR_XML_YEAR_URL, iter_cubes
+from src.currencyconverter.http_client import HttpClient, shared_client
+from src.currencyconverter.instrumentation import metrics
+from src.currencyconverter.rate_store import RateStore
+
+
+"""
+================== Historical backfill ==================
+
+Download the yearly BNR archives of a date range into the rates history (see 'rate_store'), several
+archives at once.
+
+Usage:
+    - BackfillJob(RateStore()).run('2014-01-01', '2023-12-31')
+    - python -m src.currencyconverter backfill --start 2014-01-01 --end 2023-12-31
+
+Note:
+    - The job is resumable: a year whose business days (see 'bnr_calendar') are all stored is not
+    downloaded again, and the dates already stored are never written again.
+    - Each archive is stored in one transaction as soon as it is parsed, so an interrupted job only
+    loses the archives in flight.
+    - The downloads run in a bounded thread pool; the requests to each host are limited both in
+    concurrency and in rate (the 429 responses are retried by the HTTP client after 'Retry-After').
+"""
+
+
+DEFAULT_WORKERS = 4
+DEFAULT_PER_HOST = 2
+DEFAULT_REQUESTS_PER_SECOND = 2.0
+
+
+class HostLimiter:
+    """
+    The HostLimiter class bounds the requests to one host: at most 'concurrency' at once, started at
+    most 'requests_per_second' times per second. Used as a context manager around a request.
+
+    Attributes:
+        concurrency (int): The maximum number of concurrent requests.
+        requests_per_second (float or None): The maximum rate of the requests (unlimited if None).
+    """
+    def __init__(self, concurrency: int = DEFAULT_PER_HOST,
+                 requests_per_second: float | None = DEFAULT_REQUESTS_PER_SECOND,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.concurrency = concurrency
+        self.requests_per_second = requests_per_second
+        self._clock = clock
+        self._sleep = sleep
+        self._semaphore = threading.BoundedSemaphore(concurrency)
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def __enter__(self):
+        self._semaphore.acquire()
+        if self.requests_per_second:
+            with self._lock:
+                now = self._clock()
+                start = max(now, self._next_start)
+                self._next_start = start + 1 / self.requests_per_second
+            if start > now:
+                self._sleep(start - now)
+        return self
+
+    def __exit__(self, *exc_info):
+        self._semaphore.release()
+        return False
+
+
+class BackfillReport:
+    """
+    The BackfillReport class summarizes a backfill job.
+
+    Attributes:
+        fetched_years (list[int]): The years whose archive was downloaded and stored.
+        skipped_years (list[int]): The years already complete in the store.
+        stored (int): The number of stored publications.
+        failed (dict[int, str]): The error of each year whose archive couldn't be downloaded or parsed.
+        elapsed (float): The duration of the job, in seconds.
+    """
+    def __init__(self):
+        self.fetched_years = []
+        self.skipped_years = []
+        self.stored = 0
+        self.failed = {}
+        self.elapsed = 0.0
+
+    def __str__(self) -> str:
+        summary = (f'Stored {self.stored} publications from {len(self.fetched_years)} archives '
+                   f'({len(self.skipped_years)} already complete) in {self.elapsed:.1f} s')
+        for year, error in sorted(self.failed.items()):
+            summary += f'\n{year}: {error}'
+        return summary
+
+
+def _to_date(day: datetime.date | str) -> datetime.date:
+    return day if isinstance(day, datetime.date) else datetime.date.fromisoformat(day)
+
+
+class BackfillJob:
+    """
+    The BackfillJob class downloads the yearly archives of a date range into a RateStore.
+
+    Attributes:
+        rate_store (RateStore): The history where the publications are stored.
+        http_client (HttpClient): The client of the archives (the client shared by the process if not
+        provided).
+        url_template (str): The URL of the archive of a year ('{year}' is replaced).
+        workers (int): The number of archives downloaded at once.
+        per_host (int): The number of concurrent requests to one host.
+        requests_per_second (float or None): The maximum rate of the requests to one host.
+    """
+    def __init__(self, rate_store: RateStore, http_client: HttpClient | None = None,
+                 url_template: str = BNR_XML_YEAR_URL, workers: int = DEFAULT_WORKERS,
+                 per_host: int = DEFAULT_PER_HOST, requests_per_second: float | None = DEFAULT_REQUESTS_PER_SECOND):
+        self.rate_store = rate_store
+        self.http_client = http_client if http_client is not None else shared_client()
+        self.url_template = url_template
+        self.workers = workers
+        self.per_host = per_host
+        self.requests_per_second = requests_per_second
+        self._limiters = {}
+        self._limiters_lock = threading.Lock()
+
+    def _limiter(self, url: str) -> HostLimiter:
+        host = urlsplit(url).netloc
+        with self._limiters_lock:
+            limiter = self._limiters.get(host)
+            if limiter is None:
+                limiter = self._limiters[host] = HostLimiter(self.per_host, self.requests_per_second)
+            return limiter
+
+    def is_complete(self, start: datetime.date, end: datetime.date) -> bool:
+        """
+        Check if every business day between two dates (inclusive) has stored rates.
+        """
+        day = start
+        while day <= end:
+            if is_business_day(day) and day.isoformat() not in self.rate_store:
+                return False
+            day += datetime.timedelta(days=1)
+        return True
+
+    def _fetch_year(self, year: int, start: str, end: str) -> list[tuple[str, dict[str, float]]]:
+        """
+        Download and parse the archive of a year, keeping the publications of the range not stored yet.
+        """
+        url = self.url_template.format(year=year)
+        with self._limiter(url):
+            with metrics.span('backfill_fetch'):
+                response = self.http_client.get(url, stream=True)
+                try:
+                    response.raw.decode_content = True
+                    return [(published, exchange_rates) for published, exchange_rates in iter_cubes(response.raw)
+                            if start <= published <= end and published not in self.rate_store]
+                finally:
+                    response.close()
+
+    def run(self, start: datetime.date | str, end: datetime.date | str | None = None,
+            progress: Callable[[int, int], None] | None = None) -> BackfillReport:
+        """
+        Store the publications of a date range.
+
+        Parameters:
+            start (datetime.date or str): The first date.
+            end (datetime.date or str, optional): The last date (the last publication if not provided
+            or if later).
+            progress (Callable[[int, int], None], optional): Called with the year and the number of
+            publications stored after each archive.
+
+        Returns:
+            BackfillReport: The fetched, skipped and failed years.
+        """
+        started = time.perf_counter()
+        report = BackfillReport()
+        start = _to_date(start)
+        last = last_publication().date()
+        end = min(_to_date(end), last) if end is not None else last
+
+        pending = []
+        for year in range(start.year, end.year + 1):
+            year_start, year_end = max(start, datetime.date(year, 1, 1)), min(end, datetime.date(year, 12, 31))
+            if self.is_complete(year_start, year_end):
+                report.skipped_years.append(year)
+            else:
+                pending.append((year, year_start.isoformat(), year_end.isoformat()))
+
+        with ThreadPoolExecutor(max_workers=max(1, self.workers)) as executor:
+            futures = {executor.submit(self._fetch_year, *arguments): arguments[0] for arguments in pending}
+            for future in as_completed(futures):
+                year = futures[future]
+                try:
+                    publications = future.result()
+                except Exception as e:
+                    metrics.increment('errors', stage='backfill')
+                    report.failed[year] = str(e)
+                    continue
+                # The store is only written from this thread, one transaction per archive
+                stored = self.rate_store.append_many(publications)
+                report.stored += stored
+                report.fetched_years.append(year)
+                if progress is not None:
+                    progress(year, stored)
+
+        report.fetched_years.sort()
+        report.elapsed = time.perf_counter() - started
+        return report
@@ -0,0 +1,206 @@
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.currencyconverter.cross_rates import CrossRateEngine
+
+
+"""
+================== Batch converter ==================
+
+Headless conversion of large files with one 'amount,currency[,target]' row per line.
+
+Classes:
+    - BatchReport: The statistics of a conversion run.
+    - BatchConverter: Streams the input file through the exchange rates in fixed-size chunks.
+
+Usage:
+    - python -m src.currencyconverter.batch_converter input.csv output.csv --to USD
+
+Note:
+    - Only one chunk is held in memory at a time, so the memory used doesn't depend on the file size.
+    - The output repeats the input columns and adds the converted amount (empty for unknown currencies
+    and for the amounts that aren't numbers, which are counted instead of failing the run).
+    - The currency codes are case-insensitive ('usd' is 'USD').
+"""
+
+
+DEFAULT_CHUNK_SIZE = 100_000
+INPUT_COLUMNS = ['amount', 'currency', 'target']
+
+
+class BatchReport:
+    """
+    The BatchReport class holds the statistics of a conversion run.
+
+    Attributes:
+        rows (int): The number of converted rows.
+        unknown_rows (int): The number of rows with a currency without exchange rate.
+        invalid_rows (int): The number of rows with an amount that isn't a number (or is missing).
+        elapsed (float): The duration of the run, in seconds.
+    """
+    def __init__(self, rows: int = 0, unknown_rows: int = 0, elapsed: float = 0.0, invalid_rows: int = 0):
+        self.rows = rows
+        self.unknown_rows = unknown_rows
+        self.invalid_rows = invalid_rows
+        self.elapsed = elapsed
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self) -> str:
+        return (f'{self.rows} rows ({self.unknown_rows} with unknown currencies, {self.invalid_rows} with invalid '
+                f'amounts) in {self.elapsed:.2f}s: {self.rows_per_second:,.0f} rows/sec')
+
+
+class BatchConverter:
+    """
+    The BatchConverter class converts amounts in bulk using vectorized NumPy arithmetic over the
+    exchange rates of a CrossRateEngine (fetched once for the whole run).
+
+    Attributes:
+        cross_rates (CrossRateEngine): The exchange rates used for the conversions.
+        default_target (str): The target currency of the rows that don't specify one (upper case).
+        chunk_size (int): The number of rows read, converted and written at once.
+        decimals (int): The number of decimals of the converted amounts.
+    """
+    def __init__(self, cross_rates: CrossRateEngine, default_target: str = 'USD',
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, decimals: int = 2):
+        self.cross_rates = cross_rates
+        self.default_target = default_target.upper()
+        self.chunk_size = chunk_size
+        self.decimals = decimals
+        self._currencies = pd.Index(cross_rates.currencies)
+        # RON values with a trailing NaN, selected by the position -1 of the unknown currencies
+        self._ron_values = np.append(cross_rates.ron_values, np.nan)
+
+    @staticmethod
+    def _categorical_of(currencies: pd.Series) -> tuple[pd.Index, np.ndarray]:
+        """
+        Get the distinct currency codes of a column (normalized to upper case, each one once) and the
+        code of each row (-1 for empty cells).
+        """
+        categorical = pd.Categorical(currencies)
+        return categorical.categories.astype(str).str.strip().str.upper(), categorical.codes
+
+    def _positions_of(self, currencies: pd.Series, missing_position: int = -1) -> np.ndarray:
+        """
+        Map a column of currency codes to positions in the rate vector, through the codes of a
+        categorical (-1 for unknown currencies, 'missing_position' for empty cells).
+        """
+        categories, codes = self._categorical_of(currencies)
+        positions = np.append(self._currencies.get_indexer(categories), missing_position)
+        return positions.take(codes)
+
+    @classmethod
+    def _labels_of(cls, currencies: pd.Series, missing_label: str = '') -> list[str]:
+        """
+        Get the currency codes of a column as a list, with 'missing_label' for empty cells.
+        """
+        categories, codes = cls._categorical_of(currencies)
+        labels = np.append(categories.to_numpy(dtype=object), missing_label)
+        return labels.take(codes).tolist()
+
+    @staticmethod
+    def _amounts_of(amounts: pd.Series) -> np.ndarray:
+        """
+        Parse a column of amounts (NaN for the cells that aren't numbers).
+        """
+        return pd.to_numeric(amounts, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+
+    def convert_chunk(self, chunk: pd.DataFrame, amounts: np.ndarray | None = None) -> np.ndarray:
+        """
+        Convert one chunk of rows.
+
+        Parameters:
+            chunk (pd.DataFrame): The rows, with the 'amount', 'currency' and 'target' columns (the
+            empty targets are replaced by 'default_target').
+            amounts (np.ndarray, optional): The parsed 'amount' column, if already parsed (see '_amounts_of').
+
+        Returns:
+            np.ndarray: The converted amounts (NaN for the rows with unknown currencies or invalid amounts).
+        """
+        default_position = self._currencies.get_indexer([self.default_target])[0]
+        if amounts is None:
+            amounts = self._amounts_of(chunk['amount'])
+        converted = amounts * self._ron_values.take(self._positions_of(chunk['currency']))
+        converted /= self._ron_values.take(self._positions_of(chunk['target'], default_position))
+        return converted.round(self.decimals)
+
+    def _format_chunk(self, chunk: pd.DataFrame, amounts: np.ndarray, converted: np.ndarray) -> str:
+        """
+        Format the output lines of a chunk (the invalid amounts are repeated as they were read).
+        """
+        number_format = f'{{:.{self.decimals}f}}'.format
+        converted = ['' if value != value else number_format(value) for value in converted.tolist()]
+        amounts = [text if value != value else value
+                   for value, text in zip(amounts.tolist(), chunk['amount'].fillna('').tolist())]
+        return ''.join(map('{},{},{},{}\n'.format, amounts, self._labels_of(chunk['currency']),
+                           self._labels_of(chunk['target'], self.default_target), converted))
+
+    def convert_file(self, input_path: str, output_path: str, has_header: bool = False) -> BatchReport:
+        """
+        Convert all the rows of a file, writing the results incrementally.
+
+        Parameters:
+            input_path (str): The path of the input file.
+            output_path (str): The path of the output file.
+            has_header (bool, optional): True if the first line of the input file is a header.
+
+        Returns:
+            BatchReport: The statistics of the run.
+        """
+        report = BatchReport()
+        start = time.perf_counter()
+        reader = pd.read_csv(input_path, header=None, names=INPUT_COLUMNS, skiprows=1 if has_header else 0,
+                             dtype={'amount': str, 'currency': 'category', 'target': 'category'},
+                             skipinitialspace=True, chunksize=self.chunk_size)
+        with reader, open(output_path, 'w', encoding='utf-8', newline='') as output:
+            output.write('amount,currency,target,converted\n')
+            for chunk in reader:
+                # Read as text: a malformed amount only invalidates its row
+                amounts = self._amounts_of(chunk['amount'])
+                converted = self.convert_chunk(chunk, amounts)
+                output.write(self._format_chunk(chunk, amounts, converted))
+                invalid = np.isnan(amounts)
+                report.rows += len(chunk)
+                report.invalid_rows += int(invalid.sum())
+                report.unknown_rows += int((np.isnan(converted) & ~invalid).sum())
+        report.elapsed = time.perf_counter() - start
+        return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Convert a file from the command line, printing the statistics of the run.
+    """
+    from src.currencyconverter.currency_converter import CurrencyConvertor
+
+    parser = argparse.ArgumentParser(description='Convert a file of "amount,currency[,target]" rows.')
+    parser.add_argument('input', help='the input file')
+    parser.add_argument('output', help='the output file')
+    parser.add_argument('--to', default='USD', help='the target currency of the rows without one')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='the rows converted at once')
+    parser.add_argument('--header', action='store_true', help='skip the first line of the input file')
+    args = parser.parse_args(argv)
+
+    currency_converter = CurrencyConvertor('RON')
+    snapshot = currency_converter.fetch_snapshot()
+    if snapshot is not None:
+        currency_converter.apply_snapshot(snapshot)
+    if currency_converter.cross_rates is None:
+        print('Exchange rates are not available.', file=sys.stderr)
+        return 1
+
+    batch_converter = BatchConverter(currency_converter.cross_rates, args.to, args.chunk_size)
+    report = batch_converter.convert_file(args.input, args.output, args.header)
+    print(report, file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
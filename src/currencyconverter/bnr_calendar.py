@@ -0,0 +1,115 @@
+import datetime
+from zoneinfo import ZoneInfo
+
+
+"""
+================== BNR publication calendar ==================
+
+The National Bank of Romania (BNR) publishes the reference exchange rates once per business day,
+shortly after 13:00 (Bucharest time). No rates are published on weekends and on the Romanian legal
+holidays, so the rates published on the last business day stay valid until the next publication.
+
+Functions:
+    - is_business_day: Check if BNR publishes rates on a given day.
+    - last_publication: The most recent publication moment at or before a given moment.
+    - next_publication: The first publication moment strictly after a given moment.
+"""
+
+
+BNR_TIMEZONE = ZoneInfo('Europe/Bucharest')
+PUBLICATION_TIME = datetime.time(13, 0)
+
+# (month, day) pairs of the Romanian legal holidays with a fixed date
+FIXED_HOLIDAYS = {(1, 1), (1, 2), (1, 6), (1, 7), (1, 24), (5, 1), (6, 1), (8, 15), (11, 30), (12, 1),
+                  (12, 25), (12, 26)}
+
+
+def orthodox_easter(year: int) -> datetime.date:
+    """
+    Compute the date of the Orthodox Easter Sunday (Gregorian calendar).
+
+    Parameters:
+        year (int): The year for which the date is computed.
+
+    Returns:
+        datetime.date: The Orthodox Easter Sunday of the given year.
+
+    Note:
+        - Uses the Meeus algorithm for the Julian calendar, shifted by 13 days (valid for 1900-2099).
+    """
+    a, b, c = year % 4, year % 7, year % 19
+    d = (19 * c + 15) % 30
+    e = (2 * a + 4 * b - d + 34) % 7
+    month, day = divmod(d + e + 114, 31)
+    return datetime.date(year, month, day + 1) + datetime.timedelta(days=13)
+
+
+def is_business_day(day: datetime.date) -> bool:
+    """
+    Check if BNR publishes exchange rates on the given day.
+
+    Parameters:
+        day (datetime.date): The day to be checked.
+
+    Returns:
+        bool: False for weekends and Romanian legal holidays, True otherwise.
+    """
+    if day.weekday() >= 5 or (day.month, day.day) in FIXED_HOLIDAYS:
+        return False
+    easter = orthodox_easter(day.year)
+    # Good Friday, Easter Monday and Whit Monday
+    return (day - easter).days not in (-2, 1, 50)
+
+
+def _to_bnr_time(moment: datetime.datetime | None) -> datetime.datetime:
+    """
+    Convert a moment to the BNR timezone (naive moments are considered local time).
+    """
+    if moment is None:
+        return datetime.datetime.now(BNR_TIMEZONE)
+    return moment.astimezone(BNR_TIMEZONE)
+
+
+def _publication_on(day: datetime.date) -> datetime.datetime:
+    """
+    The publication moment of a given day.
+    """
+    return datetime.datetime.combine(day, PUBLICATION_TIME, tzinfo=BNR_TIMEZONE)
+
+
+def last_publication(moment: datetime.datetime | None = None) -> datetime.datetime:
+    """
+    Find the most recent publication moment at or before the given moment.
+
+    Parameters:
+        moment (datetime.datetime, optional): The reference moment (now if not provided).
+
+    Returns:
+        datetime.datetime: The publication moment in the BNR timezone.
+    """
+    moment = _to_bnr_time(moment)
+    day = moment.date()
+    if moment < _publication_on(day):
+        day -= datetime.timedelta(days=1)
+    while not is_business_day(day):
+        day -= datetime.timedelta(days=1)
+    return _publication_on(day)
+
+
+def next_publication(moment: datetime.datetime | None = None) -> datetime.datetime:
+    """
+    Find the first publication moment strictly after the given moment.
+
+    Parameters:
+        moment (datetime.datetime, optional): The reference moment (now if not provided).
+
+    Returns:
+        datetime.datetime: The publication moment in the BNR timezone.
+    """
+    moment = _to_bnr_time(moment)
+    day = moment.date()
+    if moment >= _publication_on(day):
+        day += datetime.timedelta(days=1)
+    while not is_business_day(day):
+        day += datetime.timedelta(days=1)
+    return _publication_on(day)
@@ -0,0 +1,82 @@
+from typing import BinaryIO, Iterator
+
+
+"""
+================== BNR XML feed ==================
+
+Incremental parser for the official BNR exchange rates XML documents: the daily feed (one 'Cube')
+and the yearly archives (one 'Cube' for each business day of the year).
+
+Functions:
+    - iter_cubes: Yield the publication date and the exchange rates of each 'Cube', one by one.
+    - parse_latest: Get the most recent publication of a document.
+
+Note:
+    - Each 'Cube' is cleared (together with its already processed siblings) as soon as it was read,
+    so the memory used while parsing an archive doesn't grow with the number of days.
+    - The rates quoted for several units (the 'multiplier' attribute, used for HUF, JPY, KRW) are
+    stored for one unit.
+"""
+
+
+BNR_XML_URL = 'https://www.bnr.ro/nbrfxrates.xml'
+BNR_XML_YEAR_URL = 'https://www.bnr.ro/files/xml/years/nbrfxrates{year}.xml'
+
+
+class EmptyFeedException(Exception):
+    """
+    Custom exception class for an empty feed, raised when a document contains no exchange rates.
+    """
+    def __init__(self):
+        super().__init__('The XML feed contains no exchange rates')
+
+
+def iter_cubes(source: str | BinaryIO) -> Iterator[tuple[str, dict[str, float]]]:
+    """
+    Parse a BNR XML document incrementally.
+
+    Parameters:
+        source (str or BinaryIO): The path of the document or a binary file-like object (such as a
+        streamed HTTP response).
+
+    Yields:
+        tuple[str, dict[str, float]]: The publication date (ISO format) and the value of one unit of
+        each currency expressed in RON.
+    """
+    from lxml import etree
+
+    for _, cube in etree.iterparse(source, events=('end',), tag='{*}Cube'):
+        exchange_rates = {}
+        for rate in cube.iterchildren('{*}Rate'):
+            try:
+                exchange_rates[rate.get('currency')] = float(rate.text) / int(rate.get('multiplier', 1))
+            except (TypeError, ValueError):
+                continue
+        exchange_rates['RON'] = 1.0000
+        yield cube.get('date'), exchange_rates
+
+        cube.clear()
+        while cube.getprevious() is not None:
+            del cube.getparent()[0]
+
+
+def parse_latest(source: str | BinaryIO) -> tuple[str, dict[str, float]]:
+    """
+    Get the most recent publication of a BNR XML document.
+
+    Parameters:
+        source (str or BinaryIO): The path of the document or a binary file-like object.
+
+    Returns:
+        tuple[str, dict[str, float]]: The publication date (ISO format) and the exchange rates.
+
+    Raises:
+        EmptyFeedException: If the document contains no exchange rates.
+    """
+    latest = None
+    for published, exchange_rates in iter_cubes(source):
+        if latest is None or published >= latest[0]:
+            latest = published, exchange_rates
+    if latest is None:
+        raise EmptyFeedException()
+    return latest
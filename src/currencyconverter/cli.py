@@ -0,0 +1,206 @@
+import argparse
+import os
+import sys
+
+from src.currencyconverter.bnr_xml import BNR_XML_YEAR_URL
+from src.currencyconverter.currency_converter import CurrencyConvertor
+from src.currencyconverter.exceptions import RatesUnavailableException, UnknownCurrencyException
+from src.currencyconverter.instrumentation import metrics
+from src.currencyconverter.rate_store import NoRatesForDateException, RateStore
+
+
+"""
+================== Command line interface ==================
+
+Conversions without the graphical interface, for scripts, cron jobs and servers without a display.
+
+Usage (from the project directory):
+    - python -m src.currencyconverter convert 100 EUR USD
+    - python -m src.currencyconverter convert 100 EUR USD --date 2023-11-15
+    - python -m src.currencyconverter rates --base EUR
+    - python -m src.currencyconverter batch input.csv output.csv --to USD
+    - python -m src.currencyconverter export-history history.xlsx --base EUR --start 2023-01-01
+    - python -m src.currencyconverter serve --port 8080
+    - python -m src.currencyconverter backfill --start 2014-01-01 --end 2023-12-31
+    - python -m src.currencyconverter --profile convert.prof --metrics metrics.json convert 100 EUR USD
+
+Note:
+    - '--profile' writes a cProfile of the whole command (pstats format, readable by 'pstats',
+    snakeviz or flameprof) and '--metrics' the timings and counters of its stages (JSON, or the
+    Prometheus text format for a '.prom' file).
+    - Neither tkinter nor the heavy packages are imported by the 'convert' and 'rates' commands when
+    the cached rates are up-to-date.
+"""
+
+
+def _convert(args: argparse.Namespace) -> None:
+    """
+    Convert an amount at the latest rates (or at the rates valid on a past date).
+    """
+    source, target = args.source.upper(), args.target.upper()
+    if args.date:
+        rate_store = RateStore()
+        try:
+            converted = rate_store.convert(args.amount, source, target, as_of=args.date)
+        finally:
+            rate_store.close()
+    else:
+        converted = CurrencyConvertor(source).convert(args.amount, source, target)
+    print(f'{args.amount:.{args.decimals}f} {source} = {converted:.{args.decimals}f} {target}')
+
+
+def _rates(args: argparse.Namespace) -> None:
+    """
+    Print the latest rates relative to a reference currency.
+    """
+    base = args.base.upper()
+    currency_converter = CurrencyConvertor(base)
+    # Fetches the rates (if needed) and validates the reference currency
+    currency_converter.convert(1, base, base)
+    for currency in sorted(currency_converter.snapshot.rates):
+        print(f'{currency} {currency_converter.convert(1, base, currency):.{args.decimals}f}')
+
+
+def _batch(args: argparse.Namespace) -> int:
+    """
+    Convert a file (see 'batch_converter').
+    """
+    from src.currencyconverter.batch_converter import main as batch_main
+
+    return batch_main(args.arguments)
+
+
+def _export_history(args: argparse.Namespace) -> None:
+    """
+    Export the stored exchange rates history to an XLSX file.
+    """
+    from src.currencyconverter.currency_model import CurrencyModel
+    from src.currencyconverter.currency_registry import CurrencyRegistry
+    from src.currencyconverter.excel_converter import ExcelConverter
+
+    saving_location, file_name = os.path.split(os.path.abspath(args.path))
+    rate_store = RateStore()
+    try:
+        currencies = sorted(rate_store.rates_on(args.end))
+        excel_name = os.path.splitext(file_name)[0]
+        excel_converter = ExcelConverter(saving_location, excel_name, CurrencyModel(CurrencyRegistry()))
+        print(excel_converter.export_history_to_xlsx(rate_store, args.base.upper(), args.start, args.end, currencies,
+                                                     args.measure_memory))
+    finally:
+        rate_store.close()
+
+
+def _serve(args: argparse.Namespace) -> None:
+    """
+    Run the HTTP/JSON conversion service (see 'rate_service') until interrupted.
+    """
+    import asyncio
+
+    from src.currencyconverter.rate_service import RateService
+
+    # The service exposes its metrics ('GET /metrics')
+    metrics.enable()
+    rate_service = RateService(CurrencyConvertor('RON'), args.refresh_interval)
+    try:
+        asyncio.run(rate_service.serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+def _backfill(args: argparse.Namespace) -> int:
+    """
+    Download the yearly archives of a date range into the rates history (see 'backfill').
+    """
+    from src.currencyconverter.backfill import BackfillJob
+
+    rate_store = RateStore()
+    try:
+        backfill_job = BackfillJob(rate_store, url_template=args.url, workers=args.workers, per_host=args.per_host,
+                                   requests_per_second=args.rate or None)
+        report = backfill_job.run(args.start, args.end,
+                                  progress=lambda year, stored: print(f'{year}: {stored} publications stored'))
+    finally:
+        rate_store.close()
+    print(report)
+    return 1 if report.failed else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Parse the command line and run the requested command.
+
+    Parameters:
+        argv (list[str], optional): The command line arguments (sys.argv if not provided).
+
+    Returns:
+        int: The exit code (0 on success).
+    """
+    parser = argparse.ArgumentParser(prog='currencyconverter', description='Currency conversions at the BNR rates.')
+    parser.add_argument('--profile', metavar='PATH', help='write a cProfile of the command to a file')
+    parser.add_argument('--metrics', metavar='PATH', help='write the metrics of the command (JSON or .prom)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    convert_parser = commands.add_parser('convert', help='convert an amount')
+    convert_parser.add_argument('amount', type=float)
+    convert_parser.add_argument('source', help='the currency code of the amount')
+    convert_parser.add_argument('target', help='the currency code of the result')
+    convert_parser.add_argument('--date', help='use the rates valid on a past date (YYYY-MM-DD)')
+    convert_parser.add_argument('--decimals', type=int, default=2)
+    convert_parser.set_defaults(handler=_convert)
+
+    rates_parser = commands.add_parser('rates', help='print the latest rates')
+    rates_parser.add_argument('--base', default='USD', help='the reference currency code')
+    rates_parser.add_argument('--decimals', type=int, default=4)
+    rates_parser.set_defaults(handler=_rates)
+
+    batch_parser = commands.add_parser('batch', help='convert a file of "amount,currency[,target]" rows',
+                                       add_help=False)
+    batch_parser.add_argument('arguments', nargs=argparse.REMAINDER)
+    batch_parser.set_defaults(handler=_batch)
+
+    history_parser = commands.add_parser('export-history', help='export the stored rates history to XLSX')
+    history_parser.add_argument('path', help='the XLSX file')
+    history_parser.add_argument('--base', default='RON', help='the reference currency code')
+    history_parser.add_argument('--start', help='the first exported date (YYYY-MM-DD)')
+    history_parser.add_argument('--end', help='the last exported date (YYYY-MM-DD)')
+    history_parser.add_argument('--measure-memory', action='store_true', help='report the peak memory (slower)')
+    history_parser.set_defaults(handler=_export_history)
+
+    serve_parser = commands.add_parser('serve', help='run the HTTP/JSON conversion service')
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8080)
+    serve_parser.add_argument('--refresh-interval', type=float, default=300.0,
+                              help='the delay between two attempts while the rates of the day are missing, in seconds')
+    serve_parser.set_defaults(handler=_serve)
+
+    backfill_parser = commands.add_parser('backfill', help='download the past rates into the rates history')
+    backfill_parser.add_argument('--start', required=True, help='the first date (YYYY-MM-DD)')
+    backfill_parser.add_argument('--end', help='the last date (YYYY-MM-DD, the last publication by default)')
+    backfill_parser.add_argument('--workers', type=int, default=4, help='the number of archives downloaded at once')
+    backfill_parser.add_argument('--per-host', type=int, default=2, help='the concurrent requests to one host')
+    backfill_parser.add_argument('--rate', type=float, default=2.0,
+                                 help='the maximum requests per second to one host (0 for no limit)')
+    backfill_parser.add_argument('--url', default=BNR_XML_YEAR_URL,
+                                 help='the URL of the yearly archives ("{year}" is replaced)')
+    backfill_parser.set_defaults(handler=_backfill)
+
+    args = parser.parse_args(argv)
+    if args.metrics:
+        metrics.enable()
+    profiler = None
+    if args.profile:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        return args.handler(args) or 0
+    except (RatesUnavailableException, UnknownCurrencyException, NoRatesForDateException) as e:
+        print(e, file=sys.stderr)
+        return 1
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+        if args.metrics:
+            metrics.write(args.metrics)
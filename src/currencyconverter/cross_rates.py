@@ -0,0 +1,124 @@
+import numpy as np
+
+from src.currencyconverter.exceptions import UnknownCurrencyException
+
+
+class CrossRateEngine:
+    """
+    The CrossRateEngine class keeps the RON-denominated exchange rates once and derives the rates
+    for any reference currency on demand, without fetching or parsing anything again.
+
+    Attributes:
+        currencies (list[str]): The currency codes, in the order of the rate vectors.
+        positions (dict[str, int]): The position of each currency code in the rate vectors.
+        ron_values (np.ndarray): The value of one unit of each currency expressed in RON.
+        reciprocals (np.ndarray): The amount of each currency that can be bought with one RON.
+
+    Note:
+        - The amount of currency 'j' for one unit of currency 'i' is ron_values[i] * reciprocals[j],
+        so rebasing is a single vector multiplication.
+    """
+    def __init__(self, ron_rates: dict[str, float]):
+        self.currencies = list(ron_rates)
+        self.positions = {currency: position for position, currency in enumerate(self.currencies)}
+        self.ron_values = np.fromiter(ron_rates.values(), dtype=np.float64, count=len(ron_rates))
+        self.reciprocals = 1.0 / self.ron_values
+        self._matrix = None
+
+    def __contains__(self, currency: str) -> bool:
+        return currency in self.positions
+
+    def __len__(self) -> int:
+        return len(self.currencies)
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """
+        The N x N cross-rate matrix, where matrix[i, j] is the amount of currency 'j' for one unit of
+        currency 'i' (computed on first use).
+        """
+        if self._matrix is None:
+            self._matrix = np.outer(self.ron_values, self.reciprocals)
+        return self._matrix
+
+    def position(self, currency: str) -> int:
+        """
+        Get the position of a currency in the rate vectors.
+
+        Raises:
+            UnknownCurrencyException: If there is no exchange rate for the currency.
+        """
+        try:
+            return self.positions[currency]
+        except KeyError:
+            raise UnknownCurrencyException(currency) from None
+
+    def positions_of(self, currencies: list[str]) -> np.ndarray:
+        """
+        Get the positions of several currencies, to be used with 'numpy.take'.
+
+        Parameters:
+            currencies (list[str]): The currency codes.
+
+        Returns:
+            np.ndarray: An integer array with the position of each currency.
+        """
+        return np.fromiter((self.position(currency) for currency in currencies), dtype=np.intp,
+                           count=len(currencies))
+
+    def rates_for(self, base: str) -> np.ndarray:
+        """
+        Compute the exchange rates of all currencies relative to a reference currency.
+
+        Parameters:
+            base (str): The reference currency code.
+
+        Returns:
+            np.ndarray: The amount of each currency (in the 'currencies' order) for one unit of 'base'.
+        """
+        return self.ron_values[self.position(base)] * self.reciprocals
+
+    def convert_all(self, amount: float, base: str, targets: np.ndarray | None = None) -> np.ndarray:
+        """
+        Convert an amount to all (or to some) currencies in one vectorized operation.
+
+        Parameters:
+            amount (float): The amount to be converted.
+            base (str): The currency code of the amount.
+            targets (np.ndarray, optional): The positions of the target currencies (all if not provided).
+
+        Returns:
+            np.ndarray: The converted amounts.
+        """
+        reciprocals = self.reciprocals if targets is None else self.reciprocals.take(targets)
+        return (amount * self.ron_values[self.position(base)]) * reciprocals
+
+    def convert(self, amount: float, source: str, target: str) -> float:
+        """
+        Convert an amount from one currency to another.
+
+        Parameters:
+            amount (float): The amount to be converted.
+            source (str): The currency code of the amount.
+            target (str): The currency code of the result.
+
+        Returns:
+            float: The converted amount.
+        """
+        return float(amount * self.ron_values[self.position(source)] * self.reciprocals[self.position(target)])
+
+    def rates_dict(self, base: str, decimals: int | None = None) -> dict[str, float]:
+        """
+        Get the exchange rates relative to a reference currency as a dictionary.
+
+        Parameters:
+            base (str): The reference currency code.
+            decimals (int, optional): The number of decimals to round the rates to.
+
+        Returns:
+            dict[str, float]: The currency codes as keys and the rates as values.
+        """
+        rates = self.rates_for(base)
+        if decimals is not None:
+            rates = rates.round(decimals)
+        return dict(zip(self.currencies, rates.tolist()))
@@ -0,0 +1,286 @@
+import csv
+import hashlib
+import io
+import json
+import os
+import pathlib
+import tempfile
+import threading
+from typing import Iterator
+
+from src.currencyconverter.exceptions import UnknownCurrencyException
+from src.currencyconverter.instrumentation import metrics
+from src.currencyconverter.rate_cache import DEFAULT_CACHE_DIR
+
+
+"""
+================== Currency catalog ==================
+
+The ISO 4217 metadata of the currencies (name, numeric code, minor unit exponent), with the continent
+and the display status of each one, read from 'resources/files/currency_catalog.csv'.
+
+Usage:
+    - catalog = load_catalog()
+    - catalog['JPY'].exponent
+    - CurrencyRegistry(catalog.groups())
+
+Note:
+    - The CSV source is compiled once into a JSON file next to the rates cache: the next loads are a
+    single read of that file while the size and the modification time of the source are unchanged
+    (or, if they changed, while its SHA-256 is the same).
+    - Each source has its own compiled file, named after its path (see 'compiled_path_of').
+    - The loaded catalogs are shared by the process: every CurrencyConvertor uses the same instance.
+"""
+
+
+CATALOG_FORMAT_VERSION = 1
+CATALOG_FIELDS = ('code', 'numeric', 'exponent', 'continent', 'listed', 'name')
+DEFAULT_CATALOG_PATH = os.path.join(pathlib.Path(__file__).resolve().parent.parent.parent, 'resources', 'files',
+                                    'currency_catalog.csv')
+DEFAULT_COMPILED_PATH = os.path.join(DEFAULT_CACHE_DIR, 'currency_catalog.json')
+
+
+class CatalogFormatException(Exception):
+    """
+    Custom exception class for an invalid catalog source, raised when a line of the CSV file is
+    malformed.
+    """
+    def __init__(self, line: int, reason: str):
+        super().__init__(f'Invalid currency catalog (line {line}): {reason}')
+
+
+class CatalogEntry:
+    """
+    The CatalogEntry class is the record of one currency of the catalog.
+
+    Attributes:
+        code (str): The alphabetic ISO 4217 code.
+        numeric (str): The numeric ISO 4217 code (3 digits).
+        exponent (int or None): The number of decimals of the minor unit (None if ISO 4217 defines no
+        minor unit, as for the precious metals).
+        continent (str): The continent the currency is displayed with.
+        listed (bool): Whether the currency is displayed by the application.
+        name (str): The ISO 4217 name of the currency.
+    """
+    __slots__ = ('code', 'numeric', 'exponent', 'continent', 'listed', 'name')
+
+    def __init__(self, code: str, numeric: str, exponent: int | None, continent: str, listed: bool, name: str):
+        self.code = code
+        self.numeric = numeric
+        self.exponent = exponent
+        self.continent = continent
+        self.listed = listed
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f'CatalogEntry({self.code!r}, {self.numeric!r}, {self.exponent}, {self.continent!r})'
+
+    def to_list(self) -> list:
+        return [self.code, self.numeric, self.exponent, self.continent, self.listed, self.name]
+
+
+class CurrencyCatalog:
+    """
+    The CurrencyCatalog class holds the catalog entries, by code, in the order of the source.
+
+    Attributes:
+        entries (dict[str, CatalogEntry]): The entries, by code.
+        continents (list[str]): The continents of the listed currencies, in the display order.
+    """
+    def __init__(self, entries: list[CatalogEntry]):
+        self.entries = {entry.code: entry for entry in entries}
+        self.continents = list(dict.fromkeys(entry.continent for entry in entries if entry.listed))
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self.entries
+
+    def __iter__(self) -> Iterator[CatalogEntry]:
+        return iter(self.entries.values())
+
+    def __getitem__(self, code: str) -> CatalogEntry:
+        try:
+            return self.entries[code]
+        except KeyError:
+            raise UnknownCurrencyException(code) from None
+
+    def get(self, code: str) -> CatalogEntry | None:
+        return self.entries.get(code)
+
+    def groups(self) -> list[tuple[str, list[str]]]:
+        """
+        Get the codes of the listed currencies grouped by continent, in the display order (the
+        argument of 'CurrencyRegistry').
+        """
+        groups = {continent: [] for continent in self.continents}
+        for entry in self.entries.values():
+            if entry.listed:
+                groups[entry.continent].append(entry.code)
+        return list(groups.items())
+
+    def to_dict(self) -> dict:
+        return {'currencies': [entry.to_list() for entry in self.entries.values()]}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'CurrencyCatalog':
+        return cls([CatalogEntry(*fields) for fields in data['currencies']])
+
+
+def parse_catalog(text: str) -> CurrencyCatalog:
+    """
+    Parse the CSV source of a catalog.
+
+    Parameters:
+        text (str): The CSV text, with the 'CATALOG_FIELDS' header.
+
+    Returns:
+        CurrencyCatalog: The parsed catalog.
+
+    Raises:
+        CatalogFormatException: If the header or a line is malformed, or if a code is repeated.
+    """
+    reader = csv.reader(io.StringIO(text))
+    if tuple(next(reader, ())) != CATALOG_FIELDS:
+        raise CatalogFormatException(1, f'the header must be {",".join(CATALOG_FIELDS)}')
+    entries, codes = [], set()
+    for line, fields in enumerate(reader, start=2):
+        if not fields:
+            continue
+        if len(fields) != len(CATALOG_FIELDS):
+            raise CatalogFormatException(line, f'{len(fields)} fields instead of {len(CATALOG_FIELDS)}')
+        code, numeric, exponent, continent, listed, name = (field.strip() for field in fields)
+        if len(code) != 3 or not code.isalpha() or not code.isupper():
+            raise CatalogFormatException(line, f'invalid code {code!r}')
+        if code in codes:
+            raise CatalogFormatException(line, f'duplicate code {code}')
+        if len(numeric) != 3 or not numeric.isdigit():
+            raise CatalogFormatException(line, f'invalid numeric code {numeric!r}')
+        if exponent and not exponent.isdigit():
+            raise CatalogFormatException(line, f'invalid exponent {exponent!r}')
+        if listed not in ('0', '1'):
+            raise CatalogFormatException(line, f'invalid listed flag {listed!r}')
+        if not continent:
+            raise CatalogFormatException(line, 'missing continent')
+        codes.add(code)
+        entries.append(CatalogEntry(code, numeric, int(exponent) if exponent else None, continent, listed == '1',
+                                    name))
+    return CurrencyCatalog(entries)
+
+
+def compiled_path_of(source_path: str) -> str:
+    """
+    Get the compiled file of a catalog source: 'DEFAULT_COMPILED_PATH' for the default source, or a
+    file named after the hash of the absolute path of the source, so two sources never share one.
+    """
+    source_path = os.path.abspath(source_path)
+    if source_path == os.path.abspath(DEFAULT_CATALOG_PATH):
+        return DEFAULT_COMPILED_PATH
+    digest = hashlib.sha256(source_path.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(DEFAULT_CACHE_DIR, f'currency_catalog-{digest}.json')
+
+
+def _read_compiled(compiled_path: str) -> dict | None:
+    try:
+        with open(compiled_path, 'r', encoding='utf-8') as file:
+            compiled = json.load(file)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        metrics.increment('errors', stage='catalog_load')
+        print(e)
+        return None
+    if not isinstance(compiled, dict) or compiled.get('format_version') != CATALOG_FORMAT_VERSION:
+        return None
+    return compiled
+
+
+def _write_compiled(compiled_path: str, compiled: dict) -> None:
+    """
+    Atomically write the compiled catalog (a failure only costs a compilation at the next start).
+    """
+    try:
+        directory = os.path.dirname(compiled_path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        file_descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(file_descriptor, 'w', encoding='utf-8') as file:
+                json.dump(compiled, file, separators=(',', ':'))
+            os.replace(temp_path, compiled_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+    except OSError as e:
+        metrics.increment('errors', stage='catalog_store')
+        print(e)
+
+
+def compile_catalog(source_path: str = DEFAULT_CATALOG_PATH, compiled_path: str | None = None) -> CurrencyCatalog:
+    """
+    Load a catalog from its compiled file, compiling the source again if it changed.
+
+    Parameters:
+        source_path (str, optional): The CSV source of the catalog.
+        compiled_path (str, optional): The compiled JSON file (derived from the source path if not provided).
+
+    Returns:
+        CurrencyCatalog: The catalog.
+
+    Raises:
+        OSError: If the source can't be read.
+        CatalogFormatException: If the source is malformed.
+
+    Note:
+        - The compiled file records the size, the modification time and the SHA-256 of the source:
+        the source is only read when its size or its modification time changed, and only parsed
+        again when its content changed.
+    """
+    if compiled_path is None:
+        compiled_path = compiled_path_of(source_path)
+    status = os.stat(source_path)
+    compiled = _read_compiled(compiled_path)
+    source = compiled.get('source', {}) if compiled is not None else {}
+    if source.get('size') == status.st_size and source.get('mtime_ns') == status.st_mtime_ns:
+        return CurrencyCatalog.from_dict(compiled)
+
+    with metrics.span('catalog_compile'):
+        with open(source_path, 'rb') as file:
+            content = file.read()
+        sha256 = hashlib.sha256(content).hexdigest()
+        if source.get('sha256') == sha256:
+            catalog = CurrencyCatalog.from_dict(compiled)
+        else:
+            catalog = parse_catalog(content.decode('utf-8'))
+        compiled = {'format_version': CATALOG_FORMAT_VERSION,
+                    'source': {'size': status.st_size, 'mtime_ns': status.st_mtime_ns, 'sha256': sha256},
+                    **catalog.to_dict()}
+        _write_compiled(compiled_path, compiled)
+    return catalog
+
+
+_shared_catalogs = {}
+_shared_catalogs_lock = threading.Lock()
+
+
+def load_catalog(source_path: str = DEFAULT_CATALOG_PATH, compiled_path: str | None = None,
+                 reload: bool = False) -> CurrencyCatalog:
+    """
+    Get the catalog shared by the process (loaded on first use, see 'compile_catalog').
+
+    Parameters:
+        source_path (str, optional): The CSV source of the catalog.
+        compiled_path (str, optional): The compiled JSON file (derived from the source path if not provided).
+        reload (bool, optional): Load the catalog again (if its source was edited while running).
+    """
+    if compiled_path is None:
+        compiled_path = compiled_path_of(source_path)
+    key = (source_path, compiled_path)
+    catalog = _shared_catalogs.get(key)
+    if catalog is not None and not reload:
+        return catalog
+    with _shared_catalogs_lock:
+        catalog = _shared_catalogs.get(key)
+        if catalog is None or reload:
+            catalog = _shared_catalogs[key] = compile_catalog(source_path, compiled_path)
+        return catalog
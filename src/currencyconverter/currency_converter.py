@@ -1,45 +1,92 @@
-import os
-import pathlib
+import sqlite3
+from typing import TYPE_CHECKING
 
-import requests
+from src.currencyconverter.bnr_xml import BNR_XML_URL
+from src.currencyconverter.currency_catalog import DEFAULT_CATALOG_PATH, load_catalog
+from src.currencyconverter.currency_registry import CurrencyRegistry
+from src.currencyconverter.exceptions import RatesUnavailableException, UnknownCurrencyException
+from src.currencyconverter.http_client import HttpClient, shared_client
+from src.currencyconverter.instrumentation import metrics
+from src.currencyconverter.rate_cache import RateCache, RateSnapshot
+from src.currencyconverter.rate_providers import (DEFAULT_URL, BnrXmlProvider, CursBnrProvider, ProviderPool,
+                                                  RateProvider)
+from src.currencyconverter.rate_store import RateStore
 
-from bs4 import BeautifulSoup
-from src.currencyconverter.auxiliar import read_from_file_by_line
-
-
-DEFAULT_URL = "https://www.cursbnr.ro/"
+if TYPE_CHECKING:
+    from src.currencyconverter.cross_rates import CrossRateEngine
+    from src.currencyconverter.fixed_point import FixedPointEngine
 
 
 class CurrencyConvertor:
     """
     The CurrencyConvertor class is responsible for fetching, processing, grouping and storing the
-    exchange rates from the 'default_url'.
+    exchange rates from the rate providers (by default the official BNR XML feed, and the cursbnr.ro
+    page only if the feed fails).
 
     Attributes:
         currency_for_reference (str): The reference currency code used for exchange rate conversions.
         exchange_rates (dict[str, float]): A dictionary that stores exchange rates for various
         currencies.
-        url (str): The URL used to fetch currency exchange rate data.
-        currencies_resource (str): The file path to a resource file containing continent-currency data.
-        continents (list[str]): A list of continent names based on the continent-currency data.
-        continents_and_currencies (list[str]): A list of continent and currency data read from the
-        resource file.
-        currency_per_continent (dict[str, dict[str, None]]): A dictionary that groups currencies by
-        continent.
+        url (str): The URL of the page of the default providers.
+        xml_url (str): The URL of the BNR XML feed of the default providers.
+        catalog_resource (str): The file path of the currency catalog (ISO 4217 metadata, continent and
+        display status of each currency, see 'currency_catalog').
+        catalog (CurrencyCatalog or None): The currency catalog (shared by the process, loaded on first use).
+        continents (list[str]): A list of continent names based on the catalog.
+        currency_registry (CurrencyRegistry): The displayed currencies grouped by continent, with their
+        values relative to the reference currency.
+        currency_per_continent (dict[str, dict[str, float or None]]): A dictionary that groups the
+        currencies (and their values) by continent, derived from the registry.
+        rate_cache (RateCache): The on-disk cache of the last fetched exchange rates.
+        snapshot (RateSnapshot or None): The snapshot the current exchange rates come from.
+        cross_rates (CrossRateEngine or None): The engine deriving the rates for any reference currency
+        from the snapshot (built on first use).
+        fixed_point (FixedPointEngine or None): The engine converting the amounts exactly, in minor
+        units, from the snapshot and the minor unit exponents of the catalog (built on first use).
+        rate_store (RateStore or None): The history of the exchange rates, where each downloaded
+        publication is appended (no history is kept if not provided).
+        html_parser (str): The name of the parser used for the page ('targeted' or 'full', see
+        'rate_parsers.HTML_PARSERS').
+        http_client (HttpClient): The client of the web sources (the client shared by the process if
+        not provided).
+        providers (list[RateProvider] or None): The sources of the exchange rates (the default
+        providers if not provided).
+        policy (str): How the providers are queried and their responses combined ('ordered', 'fastest'
+        or 'median', see 'rate_providers').
 
     Note:
         - The collected data can be saved and stored into an Excel file for later usage and analysis.
+        - The web source is only contacted when the cached snapshot is outdated; if the source can't
+        be reached, the outdated snapshot is used instead.
+        - Changing the reference currency ('rebase') never fetches the rates again.
+        - An outdated snapshot is revalidated with a conditional request: if the source didn't change,
+        it answers 304 without a body and the snapshot is kept (as fetched now).
+        - The module doesn't depend on tkinter, and the heavy packages (requests, lxml, BeautifulSoup,
+        NumPy) are only imported when they are needed: a conversion served from the cache ('convert')
+        imports none of them.
     """
-    def __init__(self, currency_for_reference):
+    def __init__(self, currency_for_reference, rate_cache: RateCache | None = None, rate_store: RateStore | None = None,
+                 html_parser: str = 'targeted', http_client: HttpClient | None = None,
+                 providers: list[RateProvider] | None = None, policy: str = 'ordered'):
         self.currency_for_reference = currency_for_reference
         self.exchange_rates = {}
         self.url = DEFAULT_URL
-        self.currencies_resource = os.path.join(pathlib.Path(__file__).resolve().parent.parent.parent,
-                                                'resources', 'files', 'currency_per_category')
+        self.xml_url = BNR_XML_URL
+        self.html_parser = html_parser
+        self.http_client = http_client if http_client is not None else shared_client()
+        self.providers = providers
+        self.policy = policy
+        self._provider_pool = None
+        self.rate_cache = rate_cache if rate_cache is not None else RateCache()
+        self.rate_store = rate_store
+        self.snapshot = None
+        self._cross_rates = None
+        self._fixed_point = None
+        self.catalog_resource = DEFAULT_CATALOG_PATH
+        self.catalog = None
         self.exchange_rates = {}
         self.continents = []
-        self.continents_and_currencies = []
-        self.currency_per_continent = {}
+        self.currency_registry = CurrencyRegistry()
 
     def get_exchange_rates(self) -> dict[str, float]:
         """
@@ -51,74 +98,153 @@ class CurrencyConvertor:
         """
         return self.exchange_rates
 
-    def _fetch_exchange_rates(self) -> None:
+    @property
+    def provider_pool(self) -> ProviderPool:
+        """
+        The pool querying the providers (built on first use, with the BNR XML feed then the web page
+        as a fallback if no providers were given).
         """
-        Fetch exchange rates from the web source and populate the 'exchange_rates' dictionary.
+        if self._provider_pool is None:
+            providers = self.providers
+            if providers is None:
+                providers = [BnrXmlProvider(self.xml_url), CursBnrProvider(self.url, html_parser=self.html_parser)]
+            self._provider_pool = ProviderPool(providers, self.http_client, self.policy)
+        return self._provider_pool
+
+    def apply_snapshot(self, snapshot: RateSnapshot) -> None:
+        """
+        Use the exchange rates of a snapshot as the current exchange rates.
+
+        Parameters:
+            snapshot (RateSnapshot): The snapshot (rates relative to RON) to be used.
         """
+        self.snapshot = snapshot
+        self.exchange_rates = dict(snapshot.rates)
+        self._cross_rates = None
+        self._fixed_point = None
+
+    @property
+    def cross_rates(self) -> 'CrossRateEngine | None':
+        """
+        The engine deriving the rates for any reference currency (None if there are no rates).
+        """
+        if self._cross_rates is None and self.snapshot is not None:
+            from src.currencyconverter.cross_rates import CrossRateEngine
+
+            self._cross_rates = CrossRateEngine(self.snapshot.rates)
+        return self._cross_rates
+
+    @property
+    def fixed_point(self) -> 'FixedPointEngine | None':
+        """
+        The engine converting the amounts exactly (None if there are no rates).
+        """
+        if self._fixed_point is None and self.snapshot is not None:
+            from src.currencyconverter.fixed_point import FixedPointEngine, minor_unit_exponents
+
+            if self.catalog is None:
+                self._load_catalog()
+            self._fixed_point = FixedPointEngine(self.snapshot.rates, exponents=minor_unit_exponents(self.catalog))
+        return self._fixed_point
+
+    def fetch_snapshot(self, revalidate: bool = False) -> RateSnapshot | None:
+        """
+        Get the latest exchange rates, from the cache if they are still fresh or from the web source.
+
+        Parameters:
+            revalidate (bool, optional): Ask the source even if the cached rates are fresh (with a
+            conditional request: an unchanged source answers 304), such as when the publication of
+            the day is late.
+
+        Returns:
+            RateSnapshot or None: The latest rates, the outdated cached rates if the source can't be
+            reached, or None if no rates are available at all.
+
+        Note:
+            - The method doesn't change the current exchange rates, so it can run in a worker thread
+            while the current rates are being used.
+        """
+        cached_snapshot = self.rate_cache.load()
+        if cached_snapshot is not None and not revalidate and self.rate_cache.is_fresh(cached_snapshot):
+            metrics.increment('rate_cache_hits')
+            return cached_snapshot
+        metrics.increment('rate_cache_misses')
+
         try:
-            response = requests.get(self.url)
-            soup = BeautifulSoup(response.content, 'lxml')
-            table = soup.find('table', {'id': 'table-currencies'}).tbody
-
-            for tr in table.find_all('tr'):
-                td = tr.find_all('td')
-                currency, value = td[0].text, td[2].text
-                if currency in ['100KRW', '100HUF', '100JPY']:
-                    currency = currency[3::]
-                self.exchange_rates[currency] = float(value)
-            self.exchange_rates['RON'] = 1.0000
+            with metrics.span('fetch'):
+                snapshot = self.provider_pool.fetch(cached_snapshot)
         except Exception as e:
             print(e)
+            return cached_snapshot
 
-    def _update_rates_to_reference(self) -> None:
+        try:
+            self.rate_cache.store(snapshot)
+        except OSError as e:
+            metrics.increment('errors', stage='cache_store')
+            print(e)
+        # Only the publication dates read from the source are written to the history (never a guess)
+        if self.rate_store is not None and snapshot.published is not None:
+            try:
+                self.rate_store.append_snapshot(snapshot.published, snapshot.rates)
+            except sqlite3.Error as e:
+                metrics.increment('errors', stage='rate_store')
+                print(e)
+        return snapshot
+
+    def is_up_to_date(self) -> bool:
         """
-        Update exchange rates to be relative to the reference currency.
+        Check if the current exchange rates are the latest published ones.
         """
-        reference_rate = self.exchange_rates.get(self.currency_for_reference, 1.000)
+        return self.snapshot is not None and self.rate_cache.is_fresh(self.snapshot)
 
-        for currency, value in self.exchange_rates.items():
-            self.exchange_rates[currency] = round((reference_rate / value), 2)
+    def _fetch_exchange_rates(self) -> None:
+        """
+        Fetch exchange rates (from the cache or from the web source) and populate the
+        'exchange_rates' dictionary.
+        """
+        snapshot = self.fetch_snapshot()
+        if snapshot is not None:
+            self.apply_snapshot(snapshot)
 
-    def _fetch_continents_and_currencies_bulk(self) -> None:
+    @metrics.timed('rebase')
+    def _update_rates_to_reference(self) -> None:
         """
-        Read continent-currency data from the resource file.
+        Update exchange rates to be relative to the reference currency.
         """
-        continents_and_currencies = read_from_file_by_line(self.currencies_resource)
-        self.continents_and_currencies = continents_and_currencies
+        if self.cross_rates is None:
+            return
+        if self.currency_for_reference in self.cross_rates:
+            self.exchange_rates = self.cross_rates.rates_dict(self.currency_for_reference, decimals=2)
+        else:
+            # Unknown reference currency: the rates stay relative to one RON
+            rates = self.cross_rates.reciprocals.round(2).tolist()
+            self.exchange_rates = dict(zip(self.cross_rates.currencies, rates))
 
-    def _fetch_continents(self) -> None:
+    def _load_catalog(self) -> None:
         """
-        Extract continent names from the continent-currency data.
+        Load the currency catalog (shared by the process, see 'currency_catalog.load_catalog').
         """
-        continents = [element for element in self.continents_and_currencies if not element.isupper()]
-        self.continents = continents
+        self.catalog = load_catalog(self.catalog_resource)
+        self.continents = self.catalog.continents
 
     def _group_continents_currencies(self) -> None:
         """
-        Group currencies by continent based on continent-currency data.
-        """
-        continent_currencies = {}
-        for element in self.continents_and_currencies:
-            if element in self.continents:
-                if continent_currencies:
-                    self.currency_per_continent[continent] = continent_currencies
-                continent = element
-                continent_currencies = {}
-            else:
-                if continent:
-                    continent_currencies[element] = None
-        if continent_currencies:
-            self.currency_per_continent[continent] = continent_currencies
+        Group the listed currencies of the catalog by continent, building the registry.
+        """
+        self.currency_registry = CurrencyRegistry(self.catalog.groups())
 
     def _fetch_currencies_values(self) -> None:
         """
         Populate currency values based on exchange rates.
         """
-        for continent, currencies in self.currency_per_continent.items():
-            for currency, value in currencies.items():
-                for key in self.exchange_rates.keys():
-                    if currency == key:
-                        currencies[currency] = self.exchange_rates[currency]
+        self.currency_registry.set_values(self.exchange_rates)
+
+    @property
+    def currency_per_continent(self) -> dict[str, dict[str, float | None]]:
+        """
+        The currencies and their values grouped by continent (built from the registry on each access).
+        """
+        return self.currency_registry.as_dict()
 
     def fetch_all_details(self) -> None:
         """
@@ -126,7 +252,57 @@ class CurrencyConvertor:
         """
         self._fetch_exchange_rates()
         self._update_rates_to_reference()
-        self._fetch_continents_and_currencies_bulk()
-        self._fetch_continents()
+        self._load_catalog()
+        self._group_continents_currencies()
+        self._fetch_currencies_values()
+
+    def convert(self, amount: float, source: str, target: str) -> float:
+        """
+        Convert an amount from one currency to another, fetching the rates if needed.
+
+        Parameters:
+            amount (float): The amount to be converted.
+            source (str): The currency code of the amount.
+            target (str): The currency code of the result.
+
+        Returns:
+            float: The converted amount.
+
+        Raises:
+            RatesUnavailableException: If the rates can't be fetched.
+            UnknownCurrencyException: If there is no exchange rate for one of the currencies.
+        """
+        if self.snapshot is None:
+            self._fetch_exchange_rates()
+            if self.snapshot is None:
+                raise RatesUnavailableException()
+        rates = self.snapshot.rates
+        for currency in (source, target):
+            if currency not in rates:
+                raise UnknownCurrencyException(currency)
+        metrics.increment('conversions')
+        return amount * rates[source] / rates[target]
+
+    def load_cached_details(self) -> None:
+        """
+        Organize all necessary details for currency conversion using only the cached exchange rates
+        (of any age), without contacting the web source.
+        """
+        cached_snapshot = self.rate_cache.load()
+        if cached_snapshot is not None:
+            self.apply_snapshot(cached_snapshot)
+        self._update_rates_to_reference()
+        self._load_catalog()
         self._group_continents_currencies()
         self._fetch_currencies_values()
+
+    def rebase(self, currency_for_reference: str) -> None:
+        """
+        Change the reference currency, deriving the new exchange rates from the already fetched ones.
+
+        Parameters:
+            currency_for_reference (str): The new reference currency code.
+        """
+        self.currency_for_reference = currency_for_reference
+        self._update_rates_to_reference()
+        self._fetch_currencies_values()
@@ -1,11 +1,18 @@
 import os
-import re
+import queue
+from decimal import Decimal
 from pathlib import Path
 
 import customtkinter as ctk
 
+from src.currencyconverter.amount_parser import AmountParseException, parse_amounts
 from src.currencyconverter.currency_converter import CurrencyConvertor
+from src.currencyconverter.currency_grid import CurrencyGrid
+from src.currencyconverter.currency_model import CurrencyModel
 from src.currencyconverter.data_validator import DataValidator
+from src.currencyconverter.instrumentation import metrics
+from src.currencyconverter.refresh_scheduler import RefreshScheduler
+from src.currencyconverter.rate_store import RateStore
 
 
 """
@@ -26,6 +33,10 @@ Note:
 """
 
 
+REFRESH_POLL_INTERVAL = 100  # milliseconds
+LIVE_CONVERSION_DELAY = 150  # milliseconds
+
+
 class CurrencyConverterWindow(ctk.CTk):
     """
     The CurrencyConverterWindow is the main window of the application, containing the currency details
@@ -52,20 +63,36 @@ class CurrencyConverterWindow(ctk.CTk):
         placed in order for the icon to load and be displayed: can't provide the lowest delay acceptable).
 
         self.currency_converter (CurrencyConvertor): An instance of the CurrencyConvertor class with
-        'USD' as the initial currency reference.
+        'USD' as the initial currency reference (the downloaded rates are kept in the local history).
 
         self.toplevel_window (ExcelDetails or None): A reference to the ExcelDetails window for saving
         currency details or None if it doesn't exist.
 
         self.index (int): An index used for tracking continents.
 
-        self.currency_widgets (list[ctk.CTkLabel]): A list of currency label widgets.
+        self.currency_model (CurrencyModel): The displayed currencies and their converted values.
+
+        self.currency_grids (list[CurrencyGrid]): The scrollable list of the currencies of each
+        continent (same order as the continents of the model).
 
-        self.value_widgets (list[ctk.CTkEntry]): A list of value entry widgets.
+        self.refresh_scheduler (RefreshScheduler): Refreshes the rates in a worker thread after each
+        publication and notifies the window of the new snapshots.
+
+        self.status_label (ctk.CTkLabel): Displays the state of the rates (refreshing, publication date).
 
     Notes:
         - An initial instance of CurrencyConverter should be provided with a specified currency
         reference (chose USD for convince and international usage)
+        - The window is displayed immediately with the cached rates (or with placeholders) while the
+        latest rates are fetched in the background; the network is never used on the Tk event thread.
+        - The new snapshots published by the scheduler (from its worker thread) are queued and applied
+        from the Tk event loop, which checks the queue every REFRESH_POLL_INTERVAL milliseconds.
+        - The widgets are a view of 'currency_model': only the widgets whose value changed are
+        updated, all at once in an idle callback.
+        - Each continent list only creates the widgets of its visible rows and recycles them when
+        scrolled, so the startup time doesn't grow with the number of currencies.
+        - The typed amounts are converted as the user types, once the typing pauses for
+        LIVE_CONVERSION_DELAY milliseconds, from the rates already loaded (no request is made).
     """
     def __init__(self):
         super().__init__()
@@ -75,45 +102,34 @@ class CurrencyConverterWindow(ctk.CTk):
         self.configure(bg='#222629')
         self.after(250, lambda: self.iconbitmap(os.path.join(Path(__file__).resolve().parent.parent.parent,
                    'resources', 'icons', 'CurrencyConverter.ico')))
-        self.currency_converter = CurrencyConvertor('USD')
+        self.currency_converter = CurrencyConvertor('USD', rate_store=RateStore())
         self.radio_current_option = 0
         self.dropdown_current_option = ''
         self.toplevel_window = None
         self.index = 0
-        self.currency_widgets = []
-        self.value_widgets = []
-
-        self.currency_converter.fetch_all_details()
+        self.currency_grids = []
+        self.refresh_scheduler = RefreshScheduler(self.currency_converter)
+        self._snapshot_changes = queue.SimpleQueue()
+        self.refresh_scheduler.subscribe(self._snapshot_changes.put)
+        self._changed_positions = set()
+        self._live_conversion_job = None
+        self._typed_text = ''
+
+        self.currency_converter.load_cached_details()
+        self.currency_model = CurrencyModel(self.currency_converter.currency_registry)
+        self.currency_model.subscribe(self._schedule_redraw)
 
         self.value_to_convert_entry = ctk.CTkEntry(master=self, placeholder_text='Insert value')
 
-        for index, continent in enumerate(self.currency_converter.continents):
-            self.continent_frame = ctk.CTkFrame(master=self, width=172, height=580, corner_radius=20,
-                                                border_width=1, border_color='#474B4F')
-            self.continent_frame.grid_propagate(False)
-            self.continent_frame.grid(row=0, column=index, padx=15, pady=(13, 0))
-
-            currency_of_continent = self.currency_converter.currency_per_continent[continent]
-            row_index = 0
-            column_index = 0
-
-            for currency_name, currency_value in currency_of_continent.items():
-                currency = ctk.CTkLabel(self.continent_frame, text=currency_name)
-                value = ctk.CTkEntry(self.continent_frame, width=100)
-
-                currency.grid(row=row_index, column=column_index, padx=(10, 5), pady=(5, 5))
-                value.grid(row=row_index, column=column_index+1, padx=(10, 5), pady=(5, 5))
-
-                value.insert(0, currency_value)
-                value.configure(state='disabled')
-                self.currency_widgets.append(currency)
-                self.value_widgets.append(value)
-                row_index += 1
+        for index, positions in enumerate(self.currency_converter.currency_registry.continent_ranges):
+            currency_grid = CurrencyGrid(self, self.currency_model, positions, width=172, height=580,
+                                         corner_radius=20, border_width=1, border_color='#474B4F')
+            currency_grid.grid(row=0, column=index, padx=15, pady=(13, 0))
+            self.currency_grids.append(currency_grid)
 
         self.save_to_excel_button = ctk.CTkButton(master=self, text='Save to Excel', fg_color='#00AF22',
                                                   font=('Halvica', 14, 'bold'), hover_color='#0034B3',
-                                                  command=lambda: self.open_save_details_window(
-                                                      self.currency_widgets, self.value_widgets))
+                                                  command=lambda: self.open_save_details_window())
         self.save_to_excel_button.grid(row=16, column=1, pady=(25, 0))
 
         self.clear_currency_button = ctk.CTkButton(master=self, text='Clear currency', fg_color='#A21900',
@@ -123,32 +139,112 @@ class CurrencyConverterWindow(ctk.CTk):
 
         self.value_to_convert_entry.grid(row=16, column=2, pady=(25, 0))
         self.value_to_convert_entry.bind('<Return>', self.split_value_currency)
+        self.value_to_convert_entry.bind('<KeyRelease>', self._schedule_live_conversion)
+
+        self.status_label = ctk.CTkLabel(master=self, text='', text_color='#A0A0A0')
+        self.status_label.grid(row=16, column=0, pady=(25, 0))
+
+        self.refresh_scheduler.snapshot = self.currency_converter.snapshot
+        self.refresh_scheduler.start()
+        self._show_rates_state()
+        self.after(REFRESH_POLL_INTERVAL, self._poll_snapshot_changes)
+
+    def destroy(self) -> None:
+        """
+        Cancel the planned refreshes and close the window.
+        """
+        self.refresh_scheduler.stop()
+        super().destroy()
+
+    def refresh_rates(self) -> None:
+        """
+        Start fetching the latest rates in the background (unless a refresh is already running).
+        """
+        self.refresh_scheduler.refresh_now()
+        self._show_rates_state()
+
+    def _show_rates_state(self) -> None:
+        """
+        Display the state of the rates (refreshing, publication date or fetch time, offline).
+        """
+        snapshot = self.currency_converter.snapshot
+        if self.refresh_scheduler.in_progress:
+            self.status_label.configure(text='Refreshing rates...')
+        elif snapshot is None:
+            self.status_label.configure(text='Rates not available')
+        else:
+            state = 'Offline, rates' if self.refresh_scheduler.offline else 'Rates'
+            self.status_label.configure(text=f'{state} of {snapshot.publication_label}')
+
+    def _poll_snapshot_changes(self) -> None:
+        """
+        Display the last snapshot published by the scheduler, if any (from the Tk event loop).
+        """
+        snapshot = None
+        while True:
+            try:
+                snapshot = self._snapshot_changes.get_nowait()
+            except queue.Empty:
+                break
+        if snapshot is not None:
+            displayed_snapshot = self.currency_converter.snapshot
+            self.currency_converter.apply_snapshot(snapshot)
+            self.currency_converter.rebase(self.currency_converter.currency_for_reference)
+            if displayed_snapshot is None or displayed_snapshot.version != snapshot.version:
+                self.update_terms(self.currency_model.terms)
+        self._show_rates_state()
+        self.after(REFRESH_POLL_INTERVAL, self._poll_snapshot_changes)
 
     def split_value_currency(self, placeholder) -> None:
         """
-        Split the text from the currency label and extract the value and the currency.
+        Split the text from the currency label into its amounts and currencies, and convert them
+        (such as '27.34EUR' or '10EUR + 5.5 GBP, 300JPY', see 'amount_parser').
 
         Parameters:
             placeholder (event): A placeholder for the 'Return' event.
         """
-        input_string = self.value_to_convert_entry.get()
-        currency_pattern = r'[A-Z]{3}'
+        self._cancel_live_conversion()
+        # Converts with the loaded rates, revalidating them in the background if they are stale
+        self.refresh_scheduler.current()
+        self._convert_typed_amounts(report_errors=True)
+
+    def _schedule_live_conversion(self, event) -> None:
+        """
+        Convert the typed amounts once the typing pauses (each key release restarts the delay).
+        """
+        if event.keysym == 'Return':
+            return
+        self._cancel_live_conversion()
+        self._live_conversion_job = self.after(LIVE_CONVERSION_DELAY, self._convert_typed_amounts)
 
-        match = re.search(currency_pattern, input_string)
+    def _cancel_live_conversion(self) -> None:
+        if self._live_conversion_job is not None:
+            self.after_cancel(self._live_conversion_job)
+            self._live_conversion_job = None
 
-        if match:
-            currency_code = match.group()
-            value_substring = input_string[:match.start()]
-            value_substring = float(value_substring)
-        else:
-            print("Currency code not found in the input string.")
+    def _convert_typed_amounts(self, report_errors: bool = False) -> None:
+        """
+        Parse the typed text and convert its amounts from the loaded rates.
 
+        Parameters:
+            report_errors (bool, optional): Print the parsing and conversion errors (an incomplete
+            text is expected while typing, so the live conversions ignore it).
+        """
+        self._live_conversion_job = None
+        input_string = self.value_to_convert_entry.get()
+        if input_string == self._typed_text and not report_errors:
+            return
+        self._typed_text = input_string
         try:
-            self.update_values(value_substring, currency_code)
+            with metrics.span('parse_input'):
+                terms = parse_amounts(input_string)
+            self.update_terms(terms)
         except Exception as e:
-            print(e)
+            if report_errors or not isinstance(e, AmountParseException):
+                metrics.increment('errors', stage='conversion')
+                print(e)
 
-    def update_values(self, value: float, currency: str) -> None:
+    def update_values(self, value: Decimal | float, currency: str) -> None:
         """
         Update the displayed values for currency conversion.
 
@@ -156,34 +252,61 @@ class CurrencyConverterWindow(ctk.CTk):
             value: The numerical value to convert.
             currency: The currency code for conversion.
         """
-        cc = CurrencyConvertor(currency)
-        cc.fetch_all_details()
-        exchange_rates = cc.exchange_rates
-        for index, widget in enumerate(self.value_widgets):
-            user_value = round(float(exchange_rates[self.currency_widgets[index].cget('text')]), 2)
-            converted_value = round((float(value) * user_value), 2)
-            widget.configure(state='normal')
-            widget.delete(0, 'end')
-            widget.insert(0, str(converted_value))
-            widget.configure(state='disabled')
+        self.update_terms([(value, currency)])
+
+    def update_terms(self, terms: list[tuple[Decimal | float, str]]) -> None:
+        """
+        Update the displayed values with the sum of several amounts (such as '10 EUR + 5.5 GBP').
+
+        Parameters:
+            terms: The amounts and their currency codes.
+
+        Note:
+            - The conversion is derived from the already fetched rates (no new fetch is made).
+            - The values are converted exactly, to the minor unit of each currency (see 'fixed_point').
+            - The model keeps its terms if the conversion fails (such as for an unknown currency).
+        """
+        fixed_point = self.currency_converter.fixed_point
+        if fixed_point is None:
+            print('Exchange rates are not available.')
+            return
+        self.currency_model.convert_many(fixed_point, terms)
+        self.currency_model.published = self.currency_converter.snapshot.publication_label
+
+    def _schedule_redraw(self, changed_positions: list[int]) -> None:
+        """
+        Remember the changed values of the model and redraw them in one idle callback.
+        """
+        if not self._changed_positions:
+            self.after_idle(self._redraw_changed_values)
+        self._changed_positions.update(changed_positions)
+
+    def _redraw_changed_values(self) -> None:
+        """
+        Update the value widgets of the changed values only (the scrolled out values are drawn when
+        scrolled into view).
+        """
+        with metrics.span('render'):
+            changed_positions = sorted(self._changed_positions)
+            for currency_grid in self.currency_grids:
+                currency_grid.redraw(changed_positions)
+        self._changed_positions.clear()
 
     def reset_currency(self) -> None:
         """
         Reset the currency converter to its default state.
         """
-        self.currency_converter = CurrencyConvertor('USD')
+        self.currency_converter.rebase('USD')
         self.update_values(1, 'USD')
+        self._cancel_live_conversion()
         self.value_to_convert_entry.delete(0, 'end')
+        self._typed_text = ''
 
-    def open_save_details_window(self, currency_widgets: list[ctk.CTkLabel], value_widgets: list[ctk.CTkEntry]) -> None:
+    def open_save_details_window(self) -> None:
         """
-        Open a window to save currency details to an Excel file.
-
-        Parameters:
-            currency_widgets (list[ctk.CTkLabel]): List of currency label widgets.
-            value_widgets (list[ctk.CTkEntry]): List of value entry widgets.
+        Open a window to save currency details (read from the currency model) to an Excel file.
         """
         if self.toplevel_window is None or not self.toplevel_window.winfo_exists():
-            self.toplevel_window = DataValidator(currency_widgets, value_widgets)
+            self.toplevel_window = DataValidator(self.currency_model)
         else:
             self.toplevel_window.focus()
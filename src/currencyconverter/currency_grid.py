@@ -0,0 +1,112 @@
+import customtkinter as ctk
+
+from src.currencyconverter.currency_model import CurrencyModel
+from src.currencyconverter.grid_viewport import Viewport
+
+
+"""
+================== Currency grid ==================
+
+The virtualized list of the currencies of a continent: a fixed pool of label and entry rows,
+recycled when the list is scrolled.
+
+Note:
+    - Only the visible rows are widgets, so the startup time and the Tk memory of the window don't
+    grow with the number of currencies.
+    - The grid is a view of a CurrencyModel slice: the values are read from the model when a row is
+    drawn, and the changed values outside of the visible rows cost nothing.
+"""
+
+
+ROW_HEIGHT = 38  # pixels: an entry (28) with its vertical padding
+
+
+class CurrencyGrid(ctk.CTkFrame):
+    """
+    The CurrencyGrid class displays the codes and the values of consecutive currencies of a model.
+
+    Attributes:
+        currency_model (CurrencyModel): The displayed currencies and their converted values.
+        positions (range): The positions (in the model) of the currencies of the grid.
+        viewport (Viewport): The positions shown by the rows.
+        rows (list[tuple[ctk.CTkLabel, ctk.CTkEntry]]): The recycled currency label and value entry
+        of each row.
+        scrollbar (ctk.CTkScrollbar or None): The scrollbar (only if the currencies don't fit).
+    """
+    def __init__(self, master, currency_model: CurrencyModel, positions: range, height: int = 580, **kwargs):
+        super().__init__(master, height=height, **kwargs)
+        self.grid_propagate(False)
+        self.currency_model = currency_model
+        self.positions = positions
+        self.viewport = Viewport(len(positions), (height - 10) // ROW_HEIGHT)
+        self.rows = []
+        self.scrollbar = None
+
+        for row_index in range(self.viewport.visible):
+            currency = ctk.CTkLabel(self, text='', width=40)
+            value = ctk.CTkEntry(self, width=100)
+            currency.grid(row=row_index, column=0, padx=(10, 5), pady=(5, 5))
+            value.grid(row=row_index, column=1, padx=(10, 5), pady=(5, 5))
+            self.rows.append((currency, value))
+            for widget in (currency, value):
+                self._bind_mouse_wheel(widget)
+        self._bind_mouse_wheel(self)
+
+        if self.viewport.scrollable:
+            self.scrollbar = ctk.CTkScrollbar(self, height=height - 30, width=12, command=self._on_scrollbar)
+            self.scrollbar.grid(row=0, column=2, rowspan=max(1, self.viewport.visible), pady=(15, 15))
+        self._draw_rows()
+
+    def _bind_mouse_wheel(self, widget) -> None:
+        widget.bind('<MouseWheel>', self._on_mouse_wheel, add='+')
+        widget.bind('<Button-4>', lambda event: self._scroll_by(-1), add='+')
+        widget.bind('<Button-5>', lambda event: self._scroll_by(1), add='+')
+
+    def _on_mouse_wheel(self, event) -> None:
+        self._scroll_by(-1 if event.delta > 0 else 1)
+
+    def _on_scrollbar(self, *args) -> None:
+        if self.viewport.scroll_command(*args):
+            self._draw_rows()
+
+    def _scroll_by(self, rows: int) -> None:
+        if self.viewport.scroll_by(rows):
+            self._draw_rows()
+
+    @staticmethod
+    def _format_value(value: float | None) -> str:
+        """
+        Format a converted value for display ('-' if not available).
+        """
+        return '-' if value is None else str(value)
+
+    def _draw_row(self, row_index: int) -> None:
+        position = self.positions[self.viewport.first + row_index]
+        currency, value = self.rows[row_index]
+        currency.configure(text=self.currency_model.currencies[position])
+        value.configure(state='normal')
+        value.delete(0, 'end')
+        value.insert(0, self._format_value(self.currency_model.values[position]))
+        value.configure(state='disabled')
+
+    def _draw_rows(self) -> None:
+        """
+        Rebind every row to the currency now shown at its place.
+        """
+        for row_index in range(len(self.rows)):
+            self._draw_row(row_index)
+        if self.scrollbar is not None:
+            self.scrollbar.set(*self.viewport.fractions())
+
+    def redraw(self, changed_positions: list[int]) -> None:
+        """
+        Update the rows showing a changed value (the other positions are drawn when scrolled into view).
+
+        Parameters:
+            changed_positions (list[int]): The changed positions of the model (any continent).
+        """
+        for position in changed_positions:
+            if position in self.positions:
+                row_index = self.viewport.row_of(position - self.positions.start)
+                if row_index is not None:
+                    self._draw_row(row_index)
@@ -0,0 +1,149 @@
+from decimal import Decimal, ROUND_HALF_EVEN
+from typing import TYPE_CHECKING, Callable
+
+from src.currencyconverter.amount_parser import format_amounts
+from src.currencyconverter.currency_registry import CurrencyRegistry
+from src.currencyconverter.instrumentation import metrics
+
+if TYPE_CHECKING:
+    from src.currencyconverter.fixed_point import FixedPointEngine
+
+
+class CurrencyModel:
+    """
+    The CurrencyModel class holds the displayed currencies and their converted values, independently
+    of the widgets displaying them.
+
+    Attributes:
+        currency_registry (CurrencyRegistry): The displayed currencies (the position of a currency in
+        the model is its id in the registry).
+        continents (list[str]): The continent names, in the display order.
+        currencies (list[str]): The currency codes, in the display order (grouped by continent).
+        continent_of (list[str]): The continent of each currency (same order as 'currencies').
+        values (list[float or None]): The converted value of each currency (None if not available).
+        terms (list[tuple[Decimal or float, str]]): The converted amounts and their currency codes.
+        amount (Decimal or float or str): The converted amount (the formatted terms if there are several).
+        currency (str or None): The currency code of the converted amount (None if there are several).
+        published (str or None): The publication date of the rates used for the values (their fetch
+        time if the source didn't state it, see 'RateSnapshot.publication_label').
+
+    Note:
+        - The listeners are notified with the positions of the currencies whose value changed, so a
+        view only has to update the widgets of these currencies.
+        - The initial values are the values of the registry.
+    """
+    def __init__(self, currency_registry: CurrencyRegistry):
+        self.currency_registry = currency_registry
+        self.continents = currency_registry.continents
+        self.currencies = currency_registry.codes
+        self.continent_of = [self.continents[currency.continent_id] for currency in currency_registry]
+        self.values = [value if value == value else None for value in currency_registry.values]
+        self._engine = None
+        self._targets = None
+        self._known = None
+        self.amount = 1
+        self.currency = 'USD'
+        self.terms = [(1, 'USD')]
+        self.published = None
+        self._listeners = []
+
+    def subscribe(self, listener: Callable[[list[int]], None]) -> None:
+        """
+        Register a function called with the positions of the changed values after each change.
+        """
+        self._listeners.append(listener)
+
+    def set_values(self, values: list[float | None]) -> list[int]:
+        """
+        Replace the converted values, notifying the listeners about the ones that changed.
+
+        Parameters:
+            values (list[float or None]): The new value of each currency (display order).
+
+        Returns:
+            list[int]: The positions of the changed values.
+        """
+        changed = [position for position, (old, new) in enumerate(zip(self.values, values)) if old != new]
+        self.values = list(values)
+        if changed:
+            for listener in self._listeners:
+                listener(changed)
+        return changed
+
+    def convert(self, fixed_point: 'FixedPointEngine', amount: Decimal | str | float, currency: str,
+                rounding: str = ROUND_HALF_EVEN) -> list[int]:
+        """
+        Convert an amount to all the displayed currencies, exactly to the minor unit of each currency.
+
+        Parameters:
+            fixed_point (FixedPointEngine): The exchange rates used for the conversion.
+            amount (Decimal or str or float): The amount to be converted.
+            currency (str): The currency code of the amount.
+            rounding (str, optional): The rounding mode of the converted values.
+
+        Returns:
+            list[int]: The positions of the changed values.
+        """
+        return self.convert_many(fixed_point, [(amount, currency)], rounding)
+
+    def convert_many(self, fixed_point: 'FixedPointEngine', terms: list[tuple[Decimal | str | float, str]],
+                     rounding: str = ROUND_HALF_EVEN) -> list[int]:
+        """
+        Convert the sum of several amounts (such as '10 EUR + 5.5 GBP') to all the displayed currencies.
+
+        Parameters:
+            fixed_point (FixedPointEngine): The exchange rates used for the conversion.
+            terms (list[tuple[Decimal or str or float, str]]): The amounts and their currency codes.
+            rounding (str, optional): The rounding mode of the converted values.
+
+        Returns:
+            list[int]: The positions of the changed values.
+
+        Raises:
+            FixedPointOverflowException: If an amount or a sum doesn't fit the fixed-point arithmetic.
+
+        Note:
+            - Each amount is converted to the minor unit of every currency before the sum, so a value
+            is the sum of the values displayed for each amount alone.
+        """
+        from src.currencyconverter.fixed_point import MAX_MINOR_UNITS, FixedPointOverflowException
+
+        if fixed_point is not self._engine:
+            # The positions of the displayed currencies in the rate vectors, mapped once per engine
+            positions = self.currency_registry.positions_in(fixed_point.currencies)
+            self._known = [position >= 0 for position in positions]
+            self._targets = [position for position in positions if position >= 0]
+            self._engine = fixed_point
+        with metrics.span('convert'):
+            # Summed as Python ints: the int64 sum of the terms would wrap around without error
+            minor_units = [0] * len(self._targets)
+            for amount, currency in terms:
+                converted = fixed_point.convert_minor(fixed_point.to_minor(amount, currency, rounding), currency,
+                                                      self._targets, rounding)
+                minor_units = [total + value for total, value in zip(minor_units, converted.tolist())]
+            if any(abs(total) > MAX_MINOR_UNITS for total in minor_units):
+                raise FixedPointOverflowException()
+            # Correctly rounded: the float of each value is the nearest one to its decimal representation
+            converted = iter([total / 10.0 ** exponent
+                              for total, exponent in zip(minor_units, fixed_point.exponents[self._targets].tolist())])
+        metrics.increment('conversions')
+        self.terms = list(terms)
+        if len(terms) == 1:
+            self.amount, self.currency = terms[0]
+        else:
+            self.amount, self.currency = format_amounts(terms), None
+        return self.set_values([next(converted) if is_known else None for is_known in self._known])
+
+    def items(self) -> list[tuple[str, float | None]]:
+        """
+        Get the currency codes with their converted values (display order).
+        """
+        return list(zip(self.currencies, self.values))
+
+    def items_by_continent(self) -> dict[str, list[tuple[str, float | None]]]:
+        """
+        Get the currency codes with their converted values, grouped by continent.
+        """
+        items = self.items()
+        return {continent: items[ids.start:ids.stop]
+                for continent, ids in zip(self.continents, self.currency_registry.continent_ranges)}
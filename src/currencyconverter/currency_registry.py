@@ -0,0 +1,150 @@
+import array
+import math
+from typing import Iterable, Iterator
+
+from src.currencyconverter.exceptions import UnknownCurrencyException
+
+
+class Currency:
+    """
+    The Currency class is the record of one currency of the registry.
+
+    Attributes:
+        id (int): The dense id of the currency (its position in the registry and in the value array).
+        code (str): The currency code.
+        continent_id (int): The position of the continent of the currency in 'CurrencyRegistry.continents'.
+    """
+    __slots__ = ('id', 'code', 'continent_id')
+
+    def __init__(self, id: int, code: str, continent_id: int):
+        self.id = id
+        self.code = code
+        self.continent_id = continent_id
+
+    def __repr__(self) -> str:
+        return f'Currency({self.id}, {self.code!r}, {self.continent_id})'
+
+
+class CurrencyRegistry:
+    """
+    The CurrencyRegistry class holds the displayed currencies, grouped by continent, with dense integer
+    ids and their values in one contiguous array indexed by id.
+
+    Attributes:
+        currencies (list[Currency]): The currency records, by id.
+        ids (dict[str, int]): The id of each currency code.
+        continents (list[str]): The continent names, in the display order.
+        continent_ranges (list[range]): The ids of the currencies of each continent (same order as
+        'continents').
+        values (array.array): The value of each currency, by id (NaN if not available).
+
+    Note:
+        - The ids are given in the display order, continent after continent, so the currencies of a
+        continent have consecutive ids: their values are a slice (a view) of 'values'.
+        - A currency listed under several continents is only kept under the first one.
+        - The arrays are standard library arrays (the module doesn't import NumPy); NumPy can use
+        them without copying ('numpy.frombuffer').
+    """
+    def __init__(self, groups: Iterable[tuple[str, Iterable[str]]] = ()):
+        self.currencies = []
+        self.ids = {}
+        self.continents = []
+        self.continent_ranges = []
+        for continent_id, (continent, codes) in enumerate(groups):
+            start = len(self.currencies)
+            for code in codes:
+                if code not in self.ids:
+                    self.ids[code] = len(self.currencies)
+                    self.currencies.append(Currency(len(self.currencies), code, continent_id))
+            self.continents.append(continent)
+            self.continent_ranges.append(range(start, len(self.currencies)))
+        self._missing_values = array.array('d', [math.nan]) * len(self.currencies)
+        self.values = array.array('d', self._missing_values)
+
+    def __len__(self) -> int:
+        return len(self.currencies)
+
+    def __contains__(self, code: str) -> bool:
+        return code in self.ids
+
+    def __iter__(self) -> Iterator[Currency]:
+        return iter(self.currencies)
+
+    @property
+    def codes(self) -> list[str]:
+        """
+        The currency codes, by id.
+        """
+        return [currency.code for currency in self.currencies]
+
+    def id_of(self, code: str) -> int:
+        """
+        Get the id of a currency.
+
+        Raises:
+            UnknownCurrencyException: If the currency isn't in the registry.
+        """
+        try:
+            return self.ids[code]
+        except KeyError:
+            raise UnknownCurrencyException(code) from None
+
+    def continent_slice(self, continent: str) -> slice:
+        """
+        Get the slice of the ids (and of the values) of the currencies of a continent.
+        """
+        ids = self.continent_ranges[self.continents.index(continent)]
+        return slice(ids.start, ids.stop)
+
+    def continent_values(self, continent: str) -> memoryview:
+        """
+        Get the values of the currencies of a continent (a view of 'values', without copying).
+        """
+        return memoryview(self.values)[self.continent_slice(continent)]
+
+    def positions_in(self, codes: list[str]) -> array.array:
+        """
+        Map the ids to the positions of the currencies in another currency list, such as the rate
+        vectors of an engine, to gather their values with one 'take'.
+
+        Parameters:
+            codes (list[str]): The currency codes of the other list.
+
+        Returns:
+            array.array: The position of each currency (by id) in 'codes', or -1 if it isn't listed.
+        """
+        positions = array.array('q', [-1]) * len(self.currencies)
+        for position, code in enumerate(codes):
+            currency_id = self.ids.get(code)
+            if currency_id is not None:
+                positions[currency_id] = position
+        return positions
+
+    def set_values(self, values: dict[str, float]) -> None:
+        """
+        Replace the values of the currencies (the currencies without a value get NaN).
+
+        Parameters:
+            values (dict[str, float]): The currency codes as keys and their values as values (the
+            codes not in the registry are ignored).
+        """
+        self.values[:] = self._missing_values
+        for code, value in values.items():
+            currency_id = self.ids.get(code)
+            if currency_id is not None:
+                self.values[currency_id] = value
+
+    def value(self, code: str) -> float | None:
+        """
+        Get the value of a currency (None if not available).
+        """
+        value = self.values[self.id_of(code)]
+        return None if math.isnan(value) else value
+
+    def as_dict(self) -> dict[str, dict[str, float | None]]:
+        """
+        Get the values grouped by continent, as nested dictionaries (None if not available).
+        """
+        values = [None if math.isnan(value) else value for value in self.values]
+        return {continent: {self.currencies[currency_id].code: values[currency_id] for currency_id in ids}
+                for continent, ids in zip(self.continents, self.continent_ranges)}
@@ -5,7 +5,8 @@ from pathlib import Path
 
 import customtkinter as ctk
 
-from src.currencyconverter.excel_converter import ExcelConverter
+from src.currencyconverter.currency_model import CurrencyModel
+from src.currencyconverter.excel_converter import ExcelConverter, ExportReport
 from src.currencyconverter.auxiliar import browse_folder
 
 
@@ -43,10 +44,8 @@ class DataValidator(ctk.CTkToplevel):
     save the file.
 
     Attributes:
-        currency_widgets (list[ctk.CTkLabel]): A list of currency widgets from the main window.
-
-        value_widgets (list[ctk.CTkFrame]): A list of value entries from the main window.
-        currencies.
+        currency_model (CurrencyModel): The model holding the currencies and the values displayed in
+        the main window.
 
         self.title (str): The title of the application.
 
@@ -63,13 +62,12 @@ class DataValidator(ctk.CTkToplevel):
         placed in order for the icon to load and be displayed: can't provide the lowest delay acceptable).
 
     Note:
-        - The DataValidator class also provide the option to save the data to a CSV file if the checks
-        pass and the details are valid.
+        - The DataValidator class also provide the option to save the data to an XLSX file (one sheet
+        for each continent) if the checks pass and the details are valid.
     """
-    def __init__(self, currency_widgets, value_widgets):
+    def __init__(self, currency_model: CurrencyModel):
         super().__init__()
-        self.currency_widgets = currency_widgets
-        self.value_widgets = value_widgets
+        self.currency_model = currency_model
         self.title(' Currency Converter')
         self.geometry('300x185')
         self.resizable(False, False)
@@ -115,24 +113,23 @@ class DataValidator(ctk.CTkToplevel):
             if re.search(r'[\\!/?:*\[\]]', excel_name):
                 raise InvalidNameException()
 
-            self.save_to_excel(saving_location, excel_name, self.currency_widgets, self.value_widgets)
+            self.save_to_excel(saving_location, excel_name, self.currency_model)
         except (InvalidLengthException, InvalidNameException, FileNotFoundError) as e:
             traceback.print_exception()
             print(e)
 
     @staticmethod
-    def save_to_excel(saving_location: str, excel_name: str, currency_widgets: list[ctk.CTkLabel],
-                      value_widgets: list[ctk.CTkEntry]) -> None:
+    def save_to_excel(saving_location: str, excel_name: str, currency_model: CurrencyModel) -> ExportReport:
         """
         Save currency conversion details to an Excel file.
 
         Parameters:
             saving_location (str): The location where the Excel file should be saved.
             excel_name (str): The name of the Excel file.
-            currency_widgets (list[ctk.CTkLabel]): List of custom tkinter label widgets representing
-            currency names.
-            value_widgets (list[ctk.CTkEntry]): List of custom tkinter entry widgets representing
-            currency values.
+            currency_model (CurrencyModel): The model holding the currencies and their values.
+
+        Returns:
+            ExportReport: The summary of the export.
         """
-        ec = ExcelConverter(saving_location, excel_name, currency_widgets, value_widgets)
-        ec.export_to_csv()
+        ec = ExcelConverter(saving_location, excel_name, currency_model)
+        return ec.export_to_xlsx()
@@ -1,29 +1,73 @@
+import csv
+import datetime
 import os.path
+import time
+import tracemalloc
+from typing import Iterable
 
-import pandas as pd
-import customtkinter as ctk
+from src.currencyconverter.amount_parser import format_amounts
+from src.currencyconverter.currency_model import CurrencyModel
+from src.currencyconverter.instrumentation import metrics
+from src.currencyconverter.rate_store import RateStore
+
+
+METADATA_SHEET = 'Metadata'
+HISTORY_SHEET = 'History'
+INVALID_SHEET_CHARACTERS = str.maketrans({character: ' ' for character in '\\/?*[]:'})
+
+
+class ExportReport:
+    """
+    The ExportReport class summarizes an export.
+
+    Attributes:
+        path (str): The path of the written file.
+        rows (int): The number of written data rows.
+        elapsed (float): The duration of the export, in seconds.
+        peak_memory (int or None): The peak memory allocated while exporting, in bytes (None if it
+        wasn't measured).
+    """
+    def __init__(self, path: str, rows: int, elapsed: float, peak_memory: int | None = None):
+        self.path = path
+        self.rows = rows
+        self.elapsed = elapsed
+        self.peak_memory = peak_memory
+
+    def __str__(self) -> str:
+        report = f'{self.rows} rows written to {self.path} in {self.elapsed:.2f}s'
+        if self.peak_memory is not None:
+            report += f' (peak memory {self.peak_memory / 2 ** 20:.1f} MiB)'
+        return report
+
+
+def _sheet_title(name: str) -> str:
+    """
+    Get a valid worksheet title (at most 31 characters, without the characters forbidden by Excel).
+    """
+    return name.translate(INVALID_SHEET_CHARACTERS).strip()[:31] or 'Sheet'
 
 
 class ExcelConverter:
     """
-    The ExcelConverter class is responsible for extracting the data from the main window and
-    providing all the methods necessary for storing the corresponding data into an Excel file.
+    The ExcelConverter class is responsible for extracting the data from the currency model of the
+    main window and providing all the methods necessary for storing the corresponding data into an
+    Excel file.
 
     Attributes:
-        _saving_location (str): The directory where the CSV file will be saved.
+        _saving_location (str): The directory where the file will be saved.
         _excel_name (str): The name of the Excel file (without the file extension).
-        _currency_widgets (list[ctk.CTkLabel]): A list of currency label widgets.
-        _value_widgets (list[ctk.CTkEntry]): A list of value entry widgets.
+        _currency_model (CurrencyModel): The model holding the currencies and their values.
 
     Note:
-        - The class is saving the data into a CSV file type.
+        - The data is read from the model, never from the widgets.
+        - The XLSX files are written with the write-only mode of openpyxl: the rows are streamed to
+        the file, so the exported history is never held in memory at once.
+        - openpyxl is only imported when a workbook is written.
     """
-    def __init__(self, saving_location: str, excel_name: str, currency_widgets: list[ctk.CTkLabel],
-                 value_widgets: list[ctk.CTkEntry]):
+    def __init__(self, saving_location: str, excel_name: str, currency_model: CurrencyModel):
         self._saving_location = saving_location
         self._excel_name = excel_name
-        self._currency_widgets = currency_widgets
-        self._value_widgets = value_widgets
+        self._currency_model = currency_model
 
     @property
     def saving_location(self):
@@ -33,43 +77,118 @@ class ExcelConverter:
     def excel_name(self):
         return self._excel_name
 
-    def extract_currency_from_widgets(self) -> list[str]:
+    def _path(self, extension: str) -> str:
+        return os.path.join(self.saving_location, self.excel_name + extension)
+
+    def export_to_csv(self) -> None:
+        """
+        Export currency and value data to a CSV file.
         """
-        Extract currency names from the currency label widgets.
+        with metrics.span('export', format='csv'), \
+                open(self._path('.csv'), 'w', encoding='utf-8', newline='') as file:
+            writer = csv.writer(file, lineterminator='\n')
+            writer.writerow(('Currency', 'Value'))
+            writer.writerows(self._currency_model.items())
 
-        Returns:
-            list[str]: A list of currency names.
+    def _write_metadata(self, workbook, rows: Iterable[tuple[str, object]]) -> None:
+        """
+        Append the metadata sheet to a write-only workbook.
         """
-        currencies = [currency_widget.cget('text') for currency_widget in self._currency_widgets]
-        return currencies
+        sheet = workbook.create_sheet(METADATA_SHEET)
+        sheet.append(('Field', 'Value'))
+        for row in rows:
+            sheet.append(row)
+        sheet.append(('Exported at', datetime.datetime.now().replace(microsecond=0).isoformat(sep=' ')))
 
-    def extract_values_from_widgets(self) -> list[float]:
+    def export_to_xlsx(self) -> ExportReport:
         """
-        Extract numerical values from the value entry widgets.
+        Export the currency values to an XLSX file, with one sheet for each continent and a
+        metadata sheet (publication date of the rates, converted amount and reference currency, or
+        the converted terms for the sum of several amounts).
 
         Returns:
-            list[float]: A list of numerical values.
+            ExportReport: The summary of the export.
         """
-        values = [float(value_widget.get()) for value_widget in self._value_widgets]
-        return values
+        from openpyxl import Workbook
+
+        started = time.perf_counter()
+        model = self._currency_model
+        workbook = Workbook(write_only=True)
+        rows = 0
+        for continent, items in model.items_by_continent().items():
+            sheet = workbook.create_sheet(_sheet_title(continent))
+            sheet.append(('Currency', 'Value'))
+            for item in items:
+                sheet.append(item)
+            rows += len(items)
+        # The sum of several amounts has no single currency: the terms are written instead
+        reference = model.currency if model.currency is not None else format_amounts(model.terms)
+        self._write_metadata(workbook, (('Rates published', model.published),
+                                        ('Amount', model.amount),
+                                        ('Reference currency', reference)))
+        path = self._path('.xlsx')
+        workbook.save(path)
+        elapsed = time.perf_counter() - started
+        metrics.observe('export', elapsed, format='xlsx')
+        return ExportReport(path, rows, elapsed)
 
-    def _construct_currency_values(self) -> dict[str, float]:
+    def export_history_to_xlsx(self, rate_store: RateStore, base: str = 'RON',
+                               start: datetime.date | str | None = None, end: datetime.date | str | None = None,
+                               currencies: list[str] | None = None, measure_memory: bool = False) -> ExportReport:
         """
-        Construct a dictionary with currency-value pairs.
+        Export the stored exchange rates history to an XLSX file, one row for each publication date
+        and one column for each currency of the model.
+
+        Parameters:
+            rate_store (RateStore): The history of the published exchange rates.
+            base (str, optional): The reference currency (the cells hold the amount of each currency
+            for one unit of it).
+            start (datetime.date or str, optional): The first exported date (the first publication if
+            not provided).
+            end (datetime.date or str, optional): The last exported date (the last publication if not
+            provided).
+            currencies (list[str], optional): The exported currencies (the currencies of the model if
+            not provided).
+            measure_memory (bool, optional): Measure the peak memory allocated while exporting
+            (tracing the allocations makes the export several times slower).
 
         Returns:
-            dict[str, float]: A dictionary with currency names as keys and their respective values
-            as values.
-        """
-        currencies, values = self.extract_currency_from_widgets(), self.extract_values_from_widgets()
-        currencies_and_values = {currency: values[index] for index, currency in enumerate(currencies)}
-        return currencies_and_values
+            ExportReport: The summary of the export.
 
-    def export_to_csv(self) -> None:
+        Note:
+            - The rows are read from the database and written to the file one by one.
+            - The cells of the currencies not published on a date are left empty.
         """
-        Export currency and value data to a CSV file.
-        """
-        currencies_and_values = self._construct_currency_values()
-        data = [{'Currency': currency, 'Value': value} for currency, value in currencies_and_values.items()]
-        df = pd.DataFrame(data=data)
-        df.to_csv(os.path.join(self.saving_location, self.excel_name + '.csv'), encoding='utf-8', index=False)
+        from openpyxl import Workbook
+
+        tracing = measure_memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        elif measure_memory:
+            tracemalloc.reset_peak()
+        started = time.perf_counter()
+        try:
+            currencies = self._currency_model.currencies if currencies is None else currencies
+            workbook = Workbook(write_only=True)
+            sheet = workbook.create_sheet(HISTORY_SHEET)
+            sheet.append(['Date', *currencies])
+            rows = 0
+            first = last = None
+            for published, exchange_rates in rate_store.iter_publications(start, end):
+                base_value = exchange_rates.get(base)
+                sheet.append([published, *(round(base_value / exchange_rates[currency], 4)
+                                           if base_value and currency in exchange_rates else None
+                                           for currency in currencies)])
+                first, last = first or published, published
+                rows += 1
+            self._write_metadata(workbook, (('First date', first), ('Last date', last),
+                                            ('Reference currency', base)))
+            path = self._path('.xlsx')
+            workbook.save(path)
+            peak_memory = tracemalloc.get_traced_memory()[1] if measure_memory else None
+        finally:
+            if tracing:
+                tracemalloc.stop()
+        elapsed = time.perf_counter() - started
+        metrics.observe('export', elapsed, format='history')
+        return ExportReport(path, rows, elapsed, peak_memory)
@@ -0,0 +1,16 @@
+class UnknownCurrencyException(Exception):
+    """
+    Custom exception class for an unknown currency, raised when a conversion involves a currency
+    code for which there is no exchange rate.
+    """
+    def __init__(self, currency: str):
+        super().__init__(f'Unknown currency: {currency}')
+
+
+class RatesUnavailableException(Exception):
+    """
+    Custom exception class for missing exchange rates, raised when the rates can't be fetched from
+    any source and there is no cached snapshot to fall back to.
+    """
+    def __init__(self):
+        super().__init__('Exchange rates are not available')
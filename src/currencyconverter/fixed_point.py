@@ -0,0 +1,298 @@
+from decimal import (Context, Decimal, ROUND_CEILING, ROUND_DOWN, ROUND_FLOOR, ROUND_HALF_DOWN, ROUND_HALF_EVEN,
+                     ROUND_HALF_UP, ROUND_UP)
+from typing import TYPE_CHECKING, Iterable
+
+import numpy as np
+
+from src.currencyconverter.exceptions import UnknownCurrencyException
+
+if TYPE_CHECKING:
+    from src.currencyconverter.currency_catalog import CatalogEntry
+
+
+"""
+================== Fixed-point conversions ==================
+
+Exact currency conversions with integers: the amounts are integer minor units (cents, fils, ...) as
+defined by the ISO 4217 exponents (see 'currency_catalog') and the exchange rates are integers scaled by
+10 ** rate_decimals.
+
+Constants:
+    - DEFAULT_EXPONENT: The minor unit exponent of the currencies without a given exponent.
+    - ROUNDING_MODES: The supported rounding modes (the 'decimal' module constants).
+
+Note:
+    - The converted amount is the exact quotient amount * rate(source) / rate(target), rounded once
+    to the minor unit of the target with the requested rounding mode: it is the same result as a
+    'decimal.Decimal' computation with enough precision, computed with int64 NumPy arrays.
+    - The products would overflow 64 bits for large amounts, so the division is done in limbs of 21
+    bits (see '_divide'): the intermediate values always stay below 2 ** 63.
+    - The few pairs of currencies whose conversion factor is too large for the limbs (such as a very
+    high-valued currency against a very low-valued one) are converted with 'decimal' instead.
+    - The module doesn't read the catalog: the exponents are given to the engine (a CurrencyConvertor
+    gives those of its catalog, see 'minor_unit_exponents').
+"""
+
+
+DEFAULT_EXPONENT = 2
+# No minor unit in ISO 4217 (metals, SDR): kept with the 4 decimals of the BNR quotes
+NO_MINOR_UNIT_EXPONENT = 4
+DEFAULT_RATE_DECIMALS = 6
+ROUNDING_MODES = (ROUND_HALF_EVEN, ROUND_HALF_UP, ROUND_HALF_DOWN, ROUND_DOWN, ROUND_UP, ROUND_FLOOR, ROUND_CEILING)
+
+LIMB_BITS = 21
+LIMB_MASK = (1 << LIMB_BITS) - 1
+MAX_NUMERATOR = 1 << 43
+MAX_DENOMINATOR = 1 << 41
+MAX_QUOTIENT = np.iinfo(np.int64).max >> 1
+MAX_MINOR_UNITS = np.iinfo(np.int64).max
+# Enough digits for the exact product of an int64 amount by a conversion factor
+EXACT_CONTEXT = Context(prec=80)
+
+
+class FixedPointOverflowException(Exception):
+    """
+    Custom exception class for an overflow, raised when an amount (or a rate) is too large for the
+    64 bits fixed-point arithmetic.
+    """
+    def __init__(self):
+        super().__init__('The amount is too large for the fixed-point conversion')
+
+
+def minor_unit_exponents(catalog: Iterable['CatalogEntry']) -> dict[str, int]:
+    """
+    Get the number of decimals of the minor unit of each currency of a catalog (ISO 4217).
+    """
+    return {entry.code: NO_MINOR_UNIT_EXPONENT if entry.exponent is None else entry.exponent for entry in catalog}
+
+
+def _divide(amounts: np.ndarray, numerators: np.ndarray, denominators: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Compute the quotient and the remainder of amounts * numerators / denominators without overflow.
+
+    Note:
+        - amounts >= 0, 0 < numerators < 2 ** 43 and 0 < denominators < 2 ** 41 (the conversion
+        factors are checked when the engine is built).
+        - With amounts = high * d + low and n = n1 * 2 ** 21 + n0, the product low * n is divided one
+        limb at a time, so no intermediate value exceeds 2 ** 63.
+    """
+    high, low = np.divmod(amounts, denominators)
+    if np.any(high > MAX_QUOTIENT // numerators):
+        raise FixedPointOverflowException()
+    upper, upper_remainder = np.divmod(low * (numerators >> LIMB_BITS), denominators)
+    lower, remainder = np.divmod((upper_remainder << LIMB_BITS) + low * (numerators & LIMB_MASK), denominators)
+    return high * numerators + (upper << LIMB_BITS) + lower, remainder
+
+
+def _round(quotients: np.ndarray, remainders: np.ndarray, denominators: np.ndarray, negative: np.ndarray,
+           rounding: str) -> np.ndarray:
+    """
+    Round the quotients of the absolute values and restore the signs.
+    """
+    inexact = remainders > 0
+    if rounding == ROUND_HALF_EVEN:
+        twice = remainders << 1
+        increment = (twice > denominators) | ((twice == denominators) & (quotients & 1 == 1))
+    elif rounding == ROUND_HALF_UP:
+        increment = (remainders << 1) >= denominators
+    elif rounding == ROUND_HALF_DOWN:
+        increment = (remainders << 1) > denominators
+    elif rounding == ROUND_DOWN:
+        increment = np.zeros_like(inexact)
+    elif rounding == ROUND_UP:
+        increment = inexact
+    elif rounding == ROUND_FLOOR:
+        increment = inexact & negative
+    elif rounding == ROUND_CEILING:
+        increment = inexact & ~negative
+    else:
+        raise ValueError(f'Unsupported rounding mode: {rounding}')
+    rounded = quotients + increment
+    return np.where(negative, -rounded, rounded)
+
+
+class FixedPointEngine:
+    """
+    The FixedPointEngine class converts integer minor units between currencies, exactly, with the
+    exchange rates stored as scaled integers.
+
+    Attributes:
+        currencies (list[str]): The currency codes, in the order of the rate vectors.
+        positions (dict[str, int]): The position of each currency code in the rate vectors.
+        rate_decimals (int): The number of decimals kept from the exchange rates.
+        scaled_rates (np.ndarray): The value of one unit of each currency expressed in RON, multiplied
+        by 10 ** rate_decimals (int64).
+        exponents (np.ndarray): The minor unit exponent of each currency (int64).
+        minor_unit_exponents (dict[str, int]): The given exponents, by currency code ('DEFAULT_EXPONENT'
+        for the missing currencies).
+
+    Note:
+        - The BNR quotes have 4 decimals (6 for the ones quoted for 100 units), so the default 6 rate
+        decimals keep them exactly.
+        - The conversion factor of every pair of currencies, (rate(i) * 10 ** exponent(j)) /
+        (rate(j) * 10 ** exponent(i)), is reduced once when the engine is built, so a conversion only
+        indexes the factor matrices.
+        - A pair whose reduced factor doesn't fit the limbs of '_divide' doesn't disable the engine: its
+        conversions are computed exactly with 'decimal' (see '_convert_exact').
+    """
+    def __init__(self, ron_rates: dict[str, float], rate_decimals: int = DEFAULT_RATE_DECIMALS,
+                 exponents: dict[str, int] | None = None):
+        self.currencies = list(ron_rates)
+        self.positions = {currency: position for position, currency in enumerate(self.currencies)}
+        self.rate_decimals = rate_decimals
+        values = np.fromiter(ron_rates.values(), dtype=np.float64, count=len(ron_rates))
+        self.scaled_rates = np.rint(values * 10 ** rate_decimals).astype(np.int64)
+        self.minor_unit_exponents = dict(exponents) if exponents is not None else {}
+        self.exponents = np.fromiter((self.exponent_of(currency) for currency in self.currencies),
+                                     dtype=np.int64, count=len(self.currencies))
+        powers = 10 ** self.exponents
+        numerators = np.outer(self.scaled_rates, powers)
+        denominators = np.outer(powers, self.scaled_rates)
+        divisors = np.gcd(numerators, denominators)
+        numerators, denominators = numerators // divisors, denominators // divisors
+        self._exact_pairs = (numerators >= MAX_NUMERATOR) | (denominators >= MAX_DENOMINATOR)
+        self._exact_factors = {(int(source), int(target)): (int(numerators[source, target]),
+                                                            int(denominators[source, target]))
+                               for source, target in zip(*np.nonzero(self._exact_pairs))}
+        # The factors of the exact pairs are replaced by 1 / 1 in the vectorized computation
+        self._numerators = np.where(self._exact_pairs, 1, numerators)
+        self._denominators = np.where(self._exact_pairs, 1, denominators)
+
+    def __contains__(self, currency: str) -> bool:
+        return currency in self.positions
+
+    def position(self, currency: str) -> int:
+        """
+        Get the position of a currency in the rate vectors.
+
+        Raises:
+            UnknownCurrencyException: If there is no exchange rate for the currency.
+        """
+        try:
+            return self.positions[currency]
+        except KeyError:
+            raise UnknownCurrencyException(currency) from None
+
+    def positions_of(self, currencies: list[str]) -> np.ndarray:
+        """
+        Get the positions of several currencies, to be used as 'sources' or 'targets'.
+        """
+        return np.fromiter((self.position(currency) for currency in currencies), dtype=np.intp,
+                           count=len(currencies))
+
+    def exponent_of(self, currency: str) -> int:
+        """
+        Get the number of decimals of the minor unit of a currency.
+        """
+        return self.minor_unit_exponents.get(currency, DEFAULT_EXPONENT)
+
+    def to_minor(self, amount: Decimal | str | int | float, currency: str, rounding: str = ROUND_HALF_EVEN) -> int:
+        """
+        Express an amount in the minor units of its currency (rounded if it has more decimals).
+
+        Raises:
+            ValueError: If the amount isn't a finite number.
+            FixedPointOverflowException: If the amount doesn't fit 64 bits in minor units.
+        """
+        amount = amount if isinstance(amount, Decimal) else Decimal(str(amount))
+        if not amount.is_finite():
+            raise ValueError(f'Invalid amount: {amount}')
+        minor_units = int(amount.scaleb(self.exponent_of(currency), EXACT_CONTEXT).to_integral_value(rounding))
+        if abs(minor_units) > MAX_MINOR_UNITS:
+            raise FixedPointOverflowException()
+        return minor_units
+
+    def from_minor(self, minor_units: int, currency: str) -> Decimal:
+        """
+        Express an amount of minor units in units of its currency.
+        """
+        return Decimal(int(minor_units)).scaleb(-self.exponent_of(currency))
+
+    def convert_minor_many(self, amounts: np.ndarray | int, sources: np.ndarray | int, targets: np.ndarray | int,
+                           rounding: str = ROUND_HALF_EVEN) -> np.ndarray:
+        """
+        Convert minor units between currencies, element-wise (the arguments are broadcast together).
+
+        Parameters:
+            amounts (np.ndarray or int): The amounts, in minor units of their currencies.
+            sources (np.ndarray or int): The positions of the currencies of the amounts.
+            targets (np.ndarray or int): The positions of the target currencies.
+            rounding (str, optional): The rounding mode (one of 'ROUNDING_MODES').
+
+        Returns:
+            np.ndarray: The converted amounts, in minor units of the target currencies (int64).
+
+        Raises:
+            FixedPointOverflowException: If a converted amount doesn't fit the fixed-point arithmetic.
+        """
+        try:
+            amounts = np.asarray(amounts, dtype=np.int64)
+        except OverflowError:
+            raise FixedPointOverflowException() from None
+        amounts, sources, targets = np.broadcast_arrays(amounts, sources, targets)
+        numerators, denominators = self._numerators[sources, targets], self._denominators[sources, targets]
+
+        negative = amounts < 0
+        absolute = np.abs(amounts)
+        if np.any(absolute < 0):
+            raise FixedPointOverflowException()
+        quotients, remainders = _divide(absolute, numerators, denominators)
+        converted = _round(quotients, remainders, denominators, negative, rounding)
+        if self._exact_factors:
+            exact = self._exact_pairs[sources, targets]
+            if np.any(exact):
+                converted = self._convert_exact(converted, amounts, sources, targets, exact, rounding)
+        return converted
+
+    def _convert_exact(self, converted: np.ndarray, amounts: np.ndarray, sources: np.ndarray, targets: np.ndarray,
+                       exact: np.ndarray, rounding: str) -> np.ndarray:
+        """
+        Convert the elements of the pairs whose factor doesn't fit the limbs with 'decimal' (the other
+        elements of 'converted' are kept).
+        """
+        converted = converted.reshape(-1).copy()
+        amounts, sources, targets = amounts.reshape(-1), sources.reshape(-1), targets.reshape(-1)
+        for index in np.flatnonzero(exact).tolist():
+            numerator, denominator = self._exact_factors[(int(sources[index]), int(targets[index]))]
+            quotient = EXACT_CONTEXT.divide(EXACT_CONTEXT.multiply(Decimal(int(amounts[index])), numerator),
+                                            denominator)
+            minor_units = int(quotient.to_integral_value(rounding))
+            if abs(minor_units) > MAX_MINOR_UNITS:
+                raise FixedPointOverflowException()
+            converted[index] = minor_units
+        return converted.reshape(exact.shape)
+
+    def convert_minor(self, amounts: np.ndarray | int, source: str, targets: np.ndarray | None = None,
+                      rounding: str = ROUND_HALF_EVEN) -> np.ndarray:
+        """
+        Convert minor units of one currency to all (or to some) currencies.
+
+        Parameters:
+            amounts (np.ndarray or int): The amounts, in minor units of 'source'.
+            source (str): The currency code of the amounts.
+            targets (np.ndarray, optional): The positions of the target currencies (all if not provided).
+            rounding (str, optional): The rounding mode (one of 'ROUNDING_MODES').
+
+        Returns:
+            np.ndarray: The converted amounts, in minor units of the target currencies (int64).
+        """
+        targets = np.arange(len(self.currencies)) if targets is None else targets
+        return self.convert_minor_many(amounts, self.position(source), targets, rounding)
+
+    def convert(self, amount: Decimal | str | int, source: str, target: str,
+                rounding: str = ROUND_HALF_EVEN) -> Decimal:
+        """
+        Convert an amount from one currency to another, exactly.
+
+        Parameters:
+            amount (Decimal or str or int): The amount to be converted.
+            source (str): The currency code of the amount.
+            target (str): The currency code of the result.
+            rounding (str, optional): The rounding mode (one of 'ROUNDING_MODES').
+
+        Returns:
+            Decimal: The converted amount, with the decimals of the minor unit of the target.
+        """
+        minor_units = self.convert_minor_many(self.to_minor(amount, source, rounding), self.position(source),
+                                              self.position(target), rounding)
+        return self.from_minor(minor_units, target)
@@ -0,0 +1,346 @@
+import argparse
+import http.server
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+from src.currencyconverter.http_client import HttpClient
+
+
+"""
+================== Record/replay fixture server ==================
+
+Records the responses of the rate sources (status, headers and body) into fixtures, and replays them
+from a local HTTP server with simulated upstream conditions (latency, errors, throttling), so the
+whole fetching path can be tested and timed offline.
+
+Fixture format (in the fixtures directory):
+    - <name>.json: {"url": ..., "status": ..., "headers": {...}, "body": "<body file name>"}
+    - the body file, with the raw (decoded) content of the response.
+
+Usage (from the project directory):
+    - python -m src.currencyconverter.fixture_server record https://www.cursbnr.ro/ cursbnr --dir tests/fixtures
+    - python -m src.currencyconverter.fixture_server serve --dir tests/fixtures --port 8000 --latency 0.3
+
+Note:
+    - A recording is served at '/<name>'; the conditional requests are answered with 304 when the
+    'If-None-Match' or 'If-Modified-Since' header matches the recorded validators.
+    - The random errors use a seeded generator, so a run can be reproduced.
+"""
+
+
+# Describe the transfer of the original response, not of the replayed body
+SKIPPED_HEADERS = frozenset({'content-encoding', 'content-length', 'transfer-encoding', 'connection', 'keep-alive'})
+
+
+class UpstreamConditions:
+    """
+    The UpstreamConditions class describes how a replayed source behaves.
+
+    Attributes:
+        latency (float): The delay before each response, in seconds.
+        jitter (float): A random extra delay (between 0 and 'jitter' seconds) added to the latency.
+        error_rate (float): The probability of answering with 'error_status' instead of the recording.
+        error_status (int): The status code of the simulated errors.
+        requests_per_second (float or None): The throttling limit: the requests above it are answered
+        with 429 and a 'Retry-After' header (no limit if None).
+    """
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0, error_status: int = 503,
+                 requests_per_second: float | None = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.requests_per_second = requests_per_second
+
+
+class Recording:
+    """
+    The Recording class holds one recorded response.
+
+    Attributes:
+        name (str): The name of the recording (the replayed path is '/<name>').
+        url (str): The URL the response was recorded from.
+        status (int): The status code.
+        headers (dict[str, str]): The response headers.
+        body (bytes): The response content.
+    """
+    def __init__(self, name: str, url: str, status: int, headers: dict[str, str], body: bytes):
+        self.name = name
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    @classmethod
+    def load(cls, fixtures_dir: str, name: str) -> 'Recording':
+        """
+        Load a recording from the fixtures directory.
+        """
+        with open(os.path.join(fixtures_dir, name + '.json'), encoding='utf-8') as file:
+            metadata = json.load(file)
+        with open(os.path.join(fixtures_dir, metadata['body']), 'rb') as file:
+            body = file.read()
+        return cls(name, metadata['url'], int(metadata['status']), dict(metadata['headers']), body)
+
+    def save(self, fixtures_dir: str, body_file: str | None = None) -> None:
+        """
+        Save the recording to the fixtures directory.
+        """
+        body_file = body_file or self.name + '.body'
+        os.makedirs(fixtures_dir, exist_ok=True)
+        with open(os.path.join(fixtures_dir, body_file), 'wb') as file:
+            file.write(self.body)
+        metadata = {'url': self.url, 'status': self.status, 'headers': self.headers, 'body': body_file}
+        with open(os.path.join(fixtures_dir, self.name + '.json'), 'w', encoding='utf-8') as file:
+            json.dump(metadata, file, indent=2)
+            file.write('\n')
+
+
+def record(url: str, name: str, fixtures_dir: str, http_client: HttpClient | None = None) -> Recording:
+    """
+    Download a response and save it as a recording.
+
+    Parameters:
+        url (str): The recorded URL.
+        name (str): The name of the recording.
+        fixtures_dir (str): The fixtures directory.
+        http_client (HttpClient, optional): The client used for the request.
+
+    Returns:
+        Recording: The saved recording.
+    """
+    response = (http_client or HttpClient()).get(url)
+    headers = {name: value for name, value in response.headers.items() if name.lower() not in SKIPPED_HEADERS}
+    recording = Recording(name, url, response.status_code, headers, response.content)
+    recording.save(fixtures_dir)
+    return recording
+
+
+class _Route:
+    """
+    A replayed path: the recording, its conditions and the state of its throttling (token bucket).
+    """
+    def __init__(self, recording: Recording, conditions: UpstreamConditions):
+        self.recording = recording
+        self.conditions = conditions
+        self.tokens = conditions.requests_per_second or 0.0
+        self.updated = time.monotonic()
+        self.requests = 0
+
+    def take_token(self) -> bool:
+        """
+        Consume one request of the throttling budget (always True without a limit).
+        """
+        limit = self.conditions.requests_per_second
+        if limit is None:
+            return True
+        now = time.monotonic()
+        self.tokens = min(limit, self.tokens + (now - self.updated) * limit)
+        self.updated = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class _ReplayHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Answer the requests of the fixture server.
+    """
+    server: 'FixtureServer'
+
+    def do_GET(self):
+        route, delay, outcome = self.server.resolve(self.path.split('?', 1)[0], self.headers)
+        if route is None:
+            self.send_error(404)
+            return
+        time.sleep(delay)
+        recording = route.recording
+        if outcome == 'throttled':
+            self.send_response(429)
+            self.send_header('Retry-After', '1')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        elif outcome == 'error':
+            self.send_response(route.conditions.error_status)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        elif outcome == 'not_modified':
+            self.send_response(304)
+            for name in ('ETag', 'Last-Modified'):
+                if name in recording.headers:
+                    self.send_header(name, recording.headers[name])
+            self.end_headers()
+        else:
+            self.send_response(recording.status)
+            for name, value in recording.headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(recording.body)))
+            self.end_headers()
+            self.wfile.write(recording.body)
+
+    def log_message(self, *args):
+        pass
+
+
+class FixtureServer(http.server.ThreadingHTTPServer):
+    """
+    The FixtureServer class replays the recordings of a fixtures directory from a local HTTP server
+    (running in a background thread).
+
+    Attributes:
+        fixtures_dir (str): The fixtures directory.
+        conditions (UpstreamConditions): The conditions of the routes added without their own.
+        base_url (str): The URL of the server ('http://127.0.0.1:<port>').
+
+    Note:
+        - Every recording of the directory is served at '/<name>'; 'add_route' serves a recording
+        under another path with other conditions (such as a slow or a flaky copy of a source).
+        - The server is used as a context manager: it starts on enter and stops on exit.
+    """
+    daemon_threads = True
+
+    def __init__(self, fixtures_dir: str, conditions: UpstreamConditions | None = None, port: int = 0,
+                 seed: int = 0):
+        super().__init__(('127.0.0.1', port), _ReplayHandler)
+        self.fixtures_dir = fixtures_dir
+        self.conditions = conditions or UpstreamConditions()
+        self.base_url = f'http://127.0.0.1:{self.server_address[1]}'
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._routes = {}
+        self._thread = None
+        for file_name in sorted(os.listdir(fixtures_dir)):
+            if file_name.endswith('.json'):
+                name = file_name[:-len('.json')]
+                self.add_route(name, name)
+
+    def add_route(self, path: str, recording_name: str, conditions: UpstreamConditions | None = None) -> str:
+        """
+        Serve a recording under a path.
+
+        Parameters:
+            path (str): The served path (without the leading '/').
+            recording_name (str): The name of the recording.
+            conditions (UpstreamConditions, optional): The conditions of the path (the server ones if
+            not provided).
+
+        Returns:
+            str: The URL of the path.
+        """
+        recording = Recording.load(self.fixtures_dir, recording_name)
+        with self._lock:
+            self._routes['/' + path] = _Route(recording, conditions or self.conditions)
+        return self.url_for(path)
+
+    def url_for(self, path: str) -> str:
+        """
+        Get the URL of a served path.
+        """
+        return f'{self.base_url}/{path}'
+
+    def request_count(self, path: str) -> int:
+        """
+        Get the number of requests received by a path.
+        """
+        with self._lock:
+            return self._routes['/' + path].requests
+
+    def resolve(self, path: str, headers) -> tuple[_Route | None, float, str]:
+        """
+        Decide the answer to a request: the route, the delay and the outcome ('ok', 'not_modified',
+        'error' or 'throttled').
+        """
+        with self._lock:
+            route = self._routes.get(path)
+            if route is None:
+                return None, 0.0, 'error'
+            route.requests += 1
+            conditions = route.conditions
+            delay = conditions.latency + self._random.uniform(0, conditions.jitter)
+            if not route.take_token():
+                return route, 0.0, 'throttled'
+            if conditions.error_rate and self._random.random() < conditions.error_rate:
+                return route, delay, 'error'
+        recorded = route.recording.headers
+        if (headers.get('If-None-Match') is not None and headers.get('If-None-Match') == recorded.get('ETag')) or \
+                (headers.get('If-Modified-Since') is not None and
+                 headers.get('If-Modified-Since') == recorded.get('Last-Modified')):
+            return route, delay, 'not_modified'
+        return route, delay, 'ok'
+
+    def start(self) -> 'FixtureServer':
+        """
+        Start serving in a background thread.
+        """
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Stop serving and close the socket.
+        """
+        if self._thread is not None:
+            self.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.server_close()
+
+    def __enter__(self) -> 'FixtureServer':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Record a response or replay a fixtures directory from the command line.
+
+    Returns:
+        int: The exit code (0 on success).
+    """
+    parser = argparse.ArgumentParser(prog='fixture_server', description='Record and replay the rate sources.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    record_parser = commands.add_parser('record', help='record a response into the fixtures directory')
+    record_parser.add_argument('url')
+    record_parser.add_argument('name')
+    record_parser.add_argument('--dir', default='tests/fixtures')
+
+    serve_parser = commands.add_parser('serve', help='replay the fixtures directory')
+    serve_parser.add_argument('--dir', default='tests/fixtures')
+    serve_parser.add_argument('--port', type=int, default=8000)
+    serve_parser.add_argument('--latency', type=float, default=0.0)
+    serve_parser.add_argument('--jitter', type=float, default=0.0)
+    serve_parser.add_argument('--error-rate', type=float, default=0.0)
+    serve_parser.add_argument('--requests-per-second', type=float)
+    serve_parser.add_argument('--seed', type=int, default=0)
+
+    args = parser.parse_args(argv)
+    if args.command == 'record':
+        recording = record(args.url, args.name, args.dir)
+        print(f'{recording.url} -> {os.path.join(args.dir, recording.name)}.json ({recording.status}, '
+              f'{len(recording.body)} bytes)')
+        return 0
+
+    conditions = UpstreamConditions(args.latency, args.jitter, args.error_rate,
+                                    requests_per_second=args.requests_per_second)
+    server = FixtureServer(args.dir, conditions, args.port, args.seed)
+    print(f'Serving {args.dir} at {server.base_url}/<name>')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
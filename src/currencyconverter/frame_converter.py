@@ -0,0 +1,246 @@
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from src.currencyconverter.cross_rates import CrossRateEngine
+from src.currencyconverter.currency_converter import CurrencyConvertor
+from src.currencyconverter.exceptions import UnknownCurrencyException
+from src.currencyconverter.rate_analytics import RateHistory
+from src.currencyconverter.rate_store import RateStore
+
+
+"""
+================== Frame converter ==================
+
+Vectorized conversion of the amounts of a DataFrame (one transaction per row, in any currency) for
+in-process analytics, at the current exchange rates or at the rates valid on the date of each row.
+
+Usage:
+    - convert_frame(transactions, 'amount', 'currency', to='EUR', rates=currency_converter)
+    - convert_frame(transactions, 'amount', 'currency', rates=RateHistory.from_store(RateStore()),
+      target_col='target', date_col='booked')
+
+Note:
+    - The currency codes are mapped to positions in the rate vector through the codes of a categorical
+    (each distinct code is looked up once), and the rates of the rows are gathered with 'numpy.take':
+    there is no Python loop over the rows. The columns of 'category' dtype are the fastest, as their
+    codes are used as they are.
+    - The dates are resolved the same way: each distinct date is searched once among the publication
+    dates (the nearest publication on or before it, as 'RateStore.resolve_date' does).
+    - The rows with an unknown currency, a missing amount or a date before the first publication are
+    converted to NaN.
+    - The history of the RateStore of a CurrencyConvertor is read once and kept until the store is
+    written again (see 'RateStore.revision').
+"""
+
+
+class FrameConverter:
+    """
+    The FrameConverter class converts columns of amounts using a matrix of RON values (one row per
+    publication date, one column per currency).
+
+    Attributes:
+        currencies (pd.Index): The currency codes, in the order of the columns.
+        dates (np.ndarray or None): The publication dates (datetime64, increasing), in the order of the
+        rows (None for a single set of rates without date).
+
+    Note:
+        - The matrix gets a trailing NaN row and a trailing NaN column, selected by the dates before the
+        first publication and by the unknown currencies.
+    """
+    def __init__(self, ron_values: np.ndarray, currencies: list[str], dates: list[str] | None = None):
+        ron_values = np.atleast_2d(np.asarray(ron_values, dtype=np.float64))
+        if ron_values.shape[1] != len(currencies) or (dates is not None and ron_values.shape[0] != len(dates)):
+            raise ValueError('The RON values must have one row per date and one column per currency')
+        self.currencies = pd.Index(currencies)
+        self.dates = np.array(dates, dtype='datetime64[ns]') if dates is not None else None
+        self._values = np.full((ron_values.shape[0] + 1, ron_values.shape[1] + 1), np.nan)
+        self._values[:-1, :-1] = ron_values
+        self._flat_values = self._values.ravel()
+        self._day_table = None
+
+    @classmethod
+    def from_cross_rates(cls, cross_rates: CrossRateEngine) -> 'FrameConverter':
+        """
+        Use the current exchange rates of a CrossRateEngine (the same rates for every row).
+        """
+        return cls(cross_rates.ron_values, cross_rates.currencies)
+
+    @classmethod
+    def from_history(cls, history: RateHistory) -> 'FrameConverter':
+        """
+        Use the exchange rates of a RateHistory (the rates valid on the date of each row).
+        """
+        return cls(history.values, history.currencies, history.dates)
+
+    def position(self, currency: str) -> int:
+        """
+        Get the column of a currency code (the trailing NaN column if unknown).
+        """
+        position = self.currencies.get_indexer([currency])[0]
+        return len(self.currencies) if position < 0 else int(position)
+
+    def positions_of(self, currencies: pd.Series, missing_position: int | None = None) -> np.ndarray:
+        """
+        Map a column of currency codes to columns of the matrix, through the codes of a categorical (the
+        trailing NaN column for unknown currencies, 'missing_position' or the NaN column for empty cells).
+        """
+        unknown_position = len(self.currencies)
+        categorical = pd.Categorical(currencies)
+        positions = self.currencies.get_indexer(categorical.categories)
+        positions = np.append(np.where(positions < 0, unknown_position, positions),
+                              unknown_position if missing_position is None else missing_position)
+        return positions.take(categorical.codes)
+
+    def rows_of(self, dates: pd.Series | None) -> np.ndarray | int:
+        """
+        Map a column of dates to rows of the matrix: the publication valid on each date (the trailing
+        NaN row for the dates before the first publication and the empty cells).
+
+        Raises:
+            ValueError: If the rates have no dates.
+        """
+        if dates is None:
+            # The last publication for every row
+            return len(self._values) - 2
+        if self.dates is None:
+            raise ValueError('Converting at the rates of a date requires a history of the rates')
+        missing_row = len(self._values) - 1
+        if pd.api.types.is_datetime64_dtype(dates) and len(self.dates):
+            return self._day_rows(np.asarray(dates, dtype='datetime64[D]'))
+        codes, uniques = pd.factorize(dates)
+        rows = np.searchsorted(self.dates, pd.to_datetime(uniques).to_numpy(dtype='datetime64[ns]'),
+                               side='right') - 1
+        rows = np.append(np.where(rows < 0, missing_row, rows), missing_row)
+        return rows.take(codes)
+
+    def _day_rows(self, days: np.ndarray) -> np.ndarray:
+        """
+        Map days to rows of the matrix through a table of the row of each day from the first to the last
+        publication (built on first use), preceded by the NaN row for the days before the first
+        publication (and NaT) and followed by the last row for the days after the last publication.
+        """
+        first_day, last_day = self.dates[[0, -1]].astype('datetime64[D]').astype(np.int64)
+        if self._day_table is None:
+            days_of_table = np.arange(first_day, last_day + 1).astype('datetime64[D]').astype('datetime64[ns]')
+            rows = np.searchsorted(self.dates, days_of_table, side='right') - 1
+            self._day_table = np.concatenate(([len(self._values) - 1], rows, [len(self.dates) - 1]))
+        # Clipped before the subtraction, as NaT is the smallest integer
+        indexes = np.clip(days.view(np.int64), first_day - 1, last_day + 1)
+        indexes -= first_day - 1
+        return self._day_table.take(indexes)
+
+    def rates_of(self, positions: np.ndarray | int, rows: np.ndarray | int) -> np.ndarray | float:
+        """
+        Gather the RON values of the given columns on the given rows of the matrix (the rows being given
+        as offsets in the flattened matrix when they are an array, see 'convert').
+        """
+        if np.ndim(rows) == 0:
+            return self._values[rows].take(positions)
+        return self._flat_values.take(rows + positions)
+
+    def convert(self, amounts: np.ndarray, currencies: pd.Series, to: str = 'USD',
+                targets: pd.Series | None = None, dates: pd.Series | None = None) -> np.ndarray:
+        """
+        Convert a column of amounts.
+
+        Parameters:
+            amounts (np.ndarray): The amounts to be converted.
+            currencies (pd.Series): The currency code of each amount.
+            to (str, optional): The target currency code (of the empty cells of 'targets' if provided).
+            targets (pd.Series, optional): The target currency code of each amount.
+            dates (pd.Series, optional): The date of each amount (the last publication if not provided).
+
+        Returns:
+            np.ndarray: The converted amounts (NaN for the rows that can't be converted).
+        """
+        rows = self.rows_of(dates)
+        if np.ndim(rows):
+            # Computed once for the amounts and the targets
+            rows *= self._values.shape[1]
+        target_positions = self.position(to) if targets is None else self.positions_of(targets, self.position(to))
+        converted = np.asarray(amounts, dtype=np.float64) * self.rates_of(self.positions_of(currencies), rows)
+        converted /= self.rates_of(target_positions, rows)
+        return converted
+
+
+# The FrameConverter of the history of each RateStore, with the revision of the store it was read at
+_history_converters = weakref.WeakKeyDictionary()
+
+
+def _history_converter_of(rate_store: RateStore) -> FrameConverter:
+    """
+    Get the FrameConverter of the whole history of a RateStore (read again only if the store changed).
+    """
+    revision, frame_converter = _history_converters.get(rate_store, (None, None))
+    if revision != rate_store.revision:
+        revision = rate_store.revision
+        frame_converter = FrameConverter.from_history(RateHistory.from_store(rate_store))
+        _history_converters[rate_store] = revision, frame_converter
+    return frame_converter
+
+
+def _frame_converter_of(rates: CurrencyConvertor | CrossRateEngine | RateHistory | FrameConverter,
+                        dated: bool) -> FrameConverter:
+    """
+    Get the FrameConverter of a source of exchange rates (a CurrencyConvertor provides its current rates,
+    or the history of its RateStore for the conversions at the rates of a date).
+    """
+    if isinstance(rates, FrameConverter):
+        return rates
+    if isinstance(rates, RateHistory):
+        return FrameConverter.from_history(rates)
+    if isinstance(rates, CrossRateEngine):
+        return FrameConverter.from_cross_rates(rates)
+    if dated:
+        if rates.rate_store is None:
+            raise ValueError('Converting at the rates of a date requires a history of the rates')
+        return _history_converter_of(rates.rate_store)
+    if rates.snapshot is None:
+        snapshot = rates.fetch_snapshot()
+        if snapshot is not None:
+            rates.apply_snapshot(snapshot)
+    if rates.cross_rates is None:
+        raise ValueError('Exchange rates are not available')
+    return FrameConverter.from_cross_rates(rates.cross_rates)
+
+
+def convert_frame(frame: pd.DataFrame, amount_col: str, currency_col: str, to: str = 'USD',
+                  rates: CurrencyConvertor | CrossRateEngine | RateHistory | FrameConverter | None = None,
+                  target_col: str | None = None, date_col: str | None = None,
+                  decimals: int | None = None) -> pd.Series:
+    """
+    Convert the amounts of a DataFrame.
+
+    Parameters:
+        frame (pd.DataFrame): The rows to be converted.
+        amount_col (str): The column of the amounts.
+        currency_col (str): The column of the currency codes of the amounts.
+        to (str, optional): The target currency code (of the rows without target, if 'target_col' is provided).
+        rates (CurrencyConvertor or CrossRateEngine or RateHistory or FrameConverter, optional): The
+        exchange rates (those of a CurrencyConvertor relative to RON, fetched now, if not provided).
+        target_col (str, optional): The column of the target currency code of each row.
+        date_col (str, optional): The column of the date of each row, converted at the rates valid on it.
+        decimals (int, optional): The number of decimals to round the converted amounts to.
+
+    Returns:
+        pd.Series: The converted amounts, with the index of the frame (NaN for the rows with an unknown
+        currency or a date without rates).
+
+    Raises:
+        UnknownCurrencyException: If 'to' has no exchange rate.
+        ValueError: If 'date_col' is provided without a history of the rates.
+    """
+    if rates is None:
+        rates = CurrencyConvertor('RON')
+    frame_converter = _frame_converter_of(rates, date_col is not None)
+    if to not in frame_converter.currencies:
+        raise UnknownCurrencyException(to)
+    targets = frame[target_col] if target_col is not None else None
+    dates = frame[date_col] if date_col is not None else None
+    converted = frame_converter.convert(frame[amount_col].to_numpy(dtype=np.float64, na_value=np.nan),
+                                        frame[currency_col], to, targets, dates)
+    if decimals is not None:
+        converted = converted.round(decimals)
+    return pd.Series(converted, index=frame.index, name=amount_col)
@@ -0,0 +1,80 @@
+"""
+================== Grid viewport ==================
+
+The scrolling logic of a virtualized list: which rows of a (possibly long) list are shown by a fixed
+number of widget rows, independently of any GUI toolkit.
+
+Usage:
+    - viewport = Viewport(total=170, visible=15)
+    - viewport.scroll_by(3)
+    - for row, position in enumerate(viewport.visible_positions()): ...
+
+Note:
+    - The widget rows are recycled: row 'n' always shows the position 'first + n', so scrolling only
+    changes the texts of the existing widgets, whatever the length of the list.
+"""
+
+
+class Viewport:
+    """
+    The Viewport class tracks the visible part of a list shown by a fixed number of rows.
+
+    Attributes:
+        total (int): The number of positions of the list.
+        visible (int): The number of rows displayed at once (at most 'total').
+        first (int): The position shown by the first row.
+    """
+    def __init__(self, total: int, visible: int):
+        self.total = total
+        self.visible = max(0, min(visible, total))
+        self.first = 0
+
+    @property
+    def scrollable(self) -> bool:
+        return self.visible < self.total
+
+    def scroll_to(self, first: int) -> bool:
+        """
+        Show the rows starting at a position (clamped to the list).
+
+        Returns:
+            bool: Whether the visible positions changed.
+        """
+        first = max(0, min(first, self.total - self.visible))
+        changed = first != self.first
+        self.first = first
+        return changed
+
+    def scroll_by(self, rows: int) -> bool:
+        return self.scroll_to(self.first + rows)
+
+    def scroll_command(self, action: str, value: str, unit: str | None = None) -> bool:
+        """
+        Apply a scrollbar command: ('moveto', fraction) or ('scroll', count, 'units' or 'pages').
+
+        Returns:
+            bool: Whether the visible positions changed.
+        """
+        if action == 'moveto':
+            return self.scroll_to(round(float(value) * self.total))
+        step = self.visible if unit == 'pages' else 1
+        return self.scroll_by(int(value) * step)
+
+    def visible_positions(self) -> range:
+        return range(self.first, self.first + self.visible)
+
+    def row_of(self, position: int) -> int | None:
+        """
+        Get the row showing a position (None if the position is scrolled out of view).
+        """
+        if self.first <= position < self.first + self.visible:
+            return position - self.first
+        return None
+
+    def fractions(self) -> tuple[float, float]:
+        """
+        Get the visible part of the list as fractions, as expected by a scrollbar.
+        """
+        if not self.total:
+            return 0.0, 1.0
+        return self.first / self.total, (self.first + self.visible) / self.total
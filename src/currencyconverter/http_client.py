@@ -0,0 +1,167 @@
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    import requests
+
+
+DEFAULT_CONNECT_TIMEOUT = 3.05
+DEFAULT_READ_TIMEOUT = 10.0
+DEFAULT_TOTAL_TIMEOUT = 30.0
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF = 0.5
+MAX_RETRY_AFTER = 10.0
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+NOT_MODIFIED = 304
+USER_AGENT = 'CurrencyConverter (+https://github.com/edg96/CurrencyConverter)'
+
+
+class HttpClient:
+    """
+    The HttpClient class performs the HTTP requests of the rate sources through one pooled session,
+    with bounded timeouts, jittered retries and conditional requests.
+
+    Attributes:
+        connect_timeout (float): The maximum duration of establishing a connection, in seconds.
+        read_timeout (float): The maximum time to wait for the server between two received bytes.
+        total_timeout (float): The maximum duration of a request, retries included: no retry is made
+        past it.
+        retries (int): The number of retries after a connection error, a timeout or a 429/5xx response.
+        backoff (float): The base delay of the retries (the delay before the retry n is a random
+        duration between 0 and backoff * 2 ** n, "full jitter").
+
+    Note:
+        - The session (and its connection pool) is created on first use and shared by all the
+        requests, so the TCP and TLS handshakes are only paid once per host.
+        - The conditional requests send the 'ETag' and the 'Last-Modified' validators of a previous
+        response: an unchanged resource is answered with 304 and no body.
+        - requests is only imported when the first request is made.
+    """
+    def __init__(self, connect_timeout: float = DEFAULT_CONNECT_TIMEOUT, read_timeout: float = DEFAULT_READ_TIMEOUT,
+                 total_timeout: float = DEFAULT_TOTAL_TIMEOUT, retries: int = DEFAULT_RETRIES,
+                 backoff: float = DEFAULT_BACKOFF, sleep: Callable[[float], None] = time.sleep):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.total_timeout = total_timeout
+        self.retries = retries
+        self.backoff = backoff
+        self._sleep = sleep
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self) -> 'requests.Session':
+        """
+        The pooled session (created on first use).
+        """
+        with self._lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                session.headers.update({'User-Agent': USER_AGENT, 'Accept-Encoding': 'gzip, deflate'})
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                self._session = session
+            return self._session
+
+    def close(self) -> None:
+        """
+        Close the pooled connections.
+        """
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    @staticmethod
+    def conditional_headers(validators: dict[str, str] | None) -> dict[str, str]:
+        """
+        Build the headers of a conditional request from the validators of a previous response.
+        """
+        headers = {}
+        if validators:
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+        return headers
+
+    @staticmethod
+    def validators_of(response: 'requests.Response') -> dict[str, str]:
+        """
+        Get the validators ('etag', 'last_modified') of a response, to be sent with the next request.
+        """
+        validators = {'etag': response.headers.get('ETag'), 'last_modified': response.headers.get('Last-Modified')}
+        return {name: value for name, value in validators.items() if isinstance(value, str)}
+
+    def _retry_delay(self, attempt: int, response: 'requests.Response | None') -> float:
+        """
+        Get the delay before a retry: the 'Retry-After' of the response (capped) or a jittered backoff.
+        """
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if isinstance(retry_after, str) and retry_after.isdigit():
+            return min(float(retry_after), MAX_RETRY_AFTER)
+        return random.uniform(0, self.backoff * 2 ** attempt)
+
+    def get(self, url: str, stream: bool = False, validators: dict[str, str] | None = None) -> 'requests.Response':
+        """
+        Send a GET request, retrying the transient failures.
+
+        Parameters:
+            url (str): The requested URL.
+            stream (bool, optional): Don't download the body before returning (see 'requests').
+            validators (dict[str, str], optional): The validators of a previous response of the URL, to
+            make a conditional request.
+
+        Returns:
+            requests.Response: The response (with the status code 304 if the resource didn't change).
+
+        Raises:
+            requests.RequestException: If the request still fails after the retries, or if the
+            response has an error status code.
+        """
+        import requests
+
+        deadline = time.monotonic() + self.total_timeout
+        headers = self.conditional_headers(validators)
+        attempt = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            response, error = None, None
+            try:
+                response = self.session.get(url, stream=stream, headers=headers,
+                                            timeout=(min(self.connect_timeout, remaining),
+                                                     min(self.read_timeout, remaining)))
+                if response.status_code not in RETRY_STATUS_CODES:
+                    response.raise_for_status()
+                    return response
+                error = requests.HTTPError(f'{response.status_code} Server Error for url: {url}', response=response)
+                response.close()
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+
+            delay = self._retry_delay(attempt, response)
+            if attempt >= self.retries or time.monotonic() + delay >= deadline:
+                raise error
+            self._sleep(delay)
+            attempt += 1
+
+
+_shared_client = None
+_shared_client_lock = threading.Lock()
+
+
+def shared_client() -> HttpClient:
+    """
+    Get the HTTP client shared by all the rate sources of the process (created on first use).
+    """
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            _shared_client = HttpClient()
+        return _shared_client
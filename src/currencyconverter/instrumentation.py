@@ -0,0 +1,268 @@
+import bisect
+import functools
+import json
+import threading
+import time
+from typing import Callable
+
+
+"""
+================== Instrumentation ==================
+
+Timing spans, counters and histograms around the hot paths (fetch, parse, rebase, render, export,
+conversions), exportable as JSON or as Prometheus text.
+
+Usage:
+    - metrics.enable()
+    - with metrics.span('fetch', provider='bnr-xml'): ...
+    - metrics.increment('rate_cache_hits')
+    - print(metrics.to_prometheus())
+
+Note:
+    - The instrumentation is disabled by default: a disabled span is a shared object doing nothing,
+    so the instrumented code only pays an attribute check.
+    - Every span records its duration in the '<name>_seconds' histogram and counts its failures in
+    the 'errors' counter (with the 'stage' label).
+"""
+
+
+PREFIX = 'currencyconverter_'
+# Seconds: from the in-memory conversions (microseconds) to the slow downloads (seconds)
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """
+    The Histogram class counts observations in fixed buckets.
+
+    Attributes:
+        buckets (tuple[float]): The upper bounds of the buckets (a last, unbounded bucket is implied).
+        counts (list[int]): The number of observations of each bucket (not cumulative).
+        count (int): The number of observations.
+        sum (float): The sum of the observations.
+    """
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def to_dict(self) -> dict:
+        return {'count': self.count, 'sum': self.sum, 'mean': self.sum / self.count if self.count else 0.0,
+                'buckets': {str(bound): count for bound, count in zip(self.buckets + ('+Inf',), self.counts)}}
+
+
+class _NoSpan:
+    """
+    The span returned while the instrumentation is disabled.
+    """
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+class _Span:
+    """
+    A timed stage: its duration is recorded when it ends, and its exception (if any) is counted.
+    """
+    __slots__ = ('metrics', 'key', 'started')
+
+    def __init__(self, metrics: 'Metrics', key: tuple):
+        self.metrics = metrics
+        self.key = key
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.metrics.record(self.key, time.perf_counter() - self.started)
+        if exc_type is not None:
+            self.metrics.increment('errors', stage=self.key[0])
+        return False
+
+
+def _key(name: str, labels: dict[str, str]) -> tuple:
+    return (name,) + tuple(sorted(labels.items()))
+
+
+def _escape(value: str) -> str:
+    """
+    Escape a label value for the Prometheus text format (backslash, double quote and line feed).
+    """
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: tuple, extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in labels]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Metrics:
+    """
+    The Metrics class records the spans, the counters and the histograms of the process.
+
+    Attributes:
+        enabled (bool): Whether anything is recorded.
+        started (float): When the recording started ('time.monotonic'), for the rates per second.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.started = time.monotonic()
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def enable(self) -> None:
+        """
+        Start recording (from scratch).
+        """
+        self.reset()
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self.started = time.monotonic()
+
+    def span(self, name: str, **labels: str):
+        """
+        Time a stage, to be used as a context manager ('<name>_seconds' histogram).
+        """
+        if not self.enabled:
+            return _NO_SPAN
+        return _Span(self, _key(name, labels))
+
+    def timed(self, name: str) -> Callable[[Callable], Callable]:
+        """
+        Decorate a function so that each call is a span.
+        """
+        def decorator(function: Callable) -> Callable:
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def increment(self, name: str, value: int = 1, **labels: str) -> None:
+        """
+        Add a value to a counter ('<name>_total').
+        """
+        if not self.enabled:
+            return
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """
+        Record a duration measured elsewhere in a histogram ('<name>_seconds').
+        """
+        if self.enabled:
+            self.record(_key(name, labels), value)
+
+    def record(self, key: tuple, value: float) -> None:
+        """
+        Record an observation in the histogram of a key (the name followed by the sorted labels).
+        """
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def counter(self, name: str, **labels: str) -> int:
+        """
+        Get the value of a counter (0 if it was never incremented).
+        """
+        with self._lock:
+            return self._counters.get(_key(name, labels), 0)
+
+    def histogram(self, name: str, **labels: str) -> Histogram | None:
+        """
+        Get a histogram (None if nothing was observed).
+        """
+        with self._lock:
+            return self._histograms.get(_key(name, labels))
+
+    def summary(self) -> dict[str, float]:
+        """
+        Get the derived figures: the cache hit rate and the conversions per second.
+        """
+        elapsed = time.monotonic() - self.started
+        hits, misses = self.counter('rate_cache_hits'), self.counter('rate_cache_misses')
+        return {'uptime_seconds': elapsed,
+                'cache_hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+                'conversions_per_second': self.counter('conversions') / elapsed if elapsed else 0.0}
+
+    def to_dict(self) -> dict:
+        """
+        Export the metrics as a dictionary (the JSON export).
+        """
+        def label(key: tuple) -> str:
+            return key[0] + _format_labels(key[1:])
+
+        with self._lock:
+            counters = {label(key): value for key, value in sorted(self._counters.items())}
+            histograms = {label(key): histogram.to_dict() for key, histogram in sorted(self._histograms.items())}
+        return {'counters': counters, 'spans': histograms, 'summary': self.summary()}
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """
+        Export the metrics in the Prometheus text format.
+        """
+        lines = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(self._histograms.items())
+        for name in sorted({key[0] for key, _ in counters}):
+            lines.append(f'# TYPE {PREFIX}{name}_total counter')
+            for key, value in counters:
+                if key[0] == name:
+                    lines.append(f'{PREFIX}{name}_total{_format_labels(key[1:])} {value}')
+        for name in sorted({key[0] for key, _ in histograms}):
+            lines.append(f'# TYPE {PREFIX}{name}_seconds histogram')
+            for key, histogram in histograms:
+                if key[0] != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(histogram.buckets + ('+Inf',), histogram.counts):
+                    cumulative += count
+                    bucket_labels = _format_labels(key[1:], f'le="{bound}"')
+                    lines.append(f'{PREFIX}{name}_seconds_bucket{bucket_labels} {cumulative}')
+                lines.append(f'{PREFIX}{name}_seconds_sum{_format_labels(key[1:])} {histogram.sum}')
+                lines.append(f'{PREFIX}{name}_seconds_count{_format_labels(key[1:])} {histogram.count}')
+        for name, value in self.summary().items():
+            lines.append(f'# TYPE {PREFIX}{name} gauge')
+            lines.append(f'{PREFIX}{name} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: str) -> None:
+        """
+        Write the metrics to a file: Prometheus text for a '.prom' or '.txt' file, JSON otherwise.
+        """
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(self.to_prometheus() if path.endswith(('.prom', '.txt')) else self.to_json())
+
+
+metrics = Metrics()
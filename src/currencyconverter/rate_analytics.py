@@ -0,0 +1,270 @@
+import datetime
+import math
+
+import numpy as np
+import pandas as pd
+
+from src.currencyconverter.exceptions import UnknownCurrencyException
+from src.currencyconverter.rate_store import RateStore
+
+
+"""
+================== Rate analytics ==================
+
+Time-series statistics of the stored exchange rates (see 'rate_store'), relative to any reference
+currency: moving averages, rolling volatility, percent changes and the minimum/maximum of each period.
+
+Usage:
+    - history = RateHistory.from_store(RateStore(), start='2004-01-01')
+    - analytics = RateAnalytics(history, base='EUR', window=20)
+    - analytics.frame('moving_average')
+    - history.append('2024-01-03', rates); analytics.update()
+
+Note:
+    - The history is a dense date x currency matrix of the RON values (NaN where a currency wasn't
+    published), so every statistic is a vectorized pandas window operation over all the currencies.
+    - The rolling statistics are kept up-to-date incrementally: after new dates are appended, only
+    the trailing window is computed again.
+    - The volatility is the standard deviation of the daily log returns over the window (not
+    annualized: multiply by sqrt(252) for a yearly figure).
+"""
+
+
+INITIAL_CAPACITY = 256
+
+
+class _GrowingMatrix:
+    """
+    A float matrix whose rows are appended in amortized constant time (the capacity is doubled when
+    full), exposing its filled rows as a view.
+    """
+    def __init__(self, columns: int, capacity: int = INITIAL_CAPACITY):
+        self._data = np.full((max(1, capacity), columns), np.nan)
+        self.rows = 0
+
+    @property
+    def array(self) -> np.ndarray:
+        return self._data[:self.rows]
+
+    def extend(self, rows: np.ndarray) -> None:
+        needed = self.rows + len(rows)
+        if needed > len(self._data):
+            data = np.full((max(needed, 2 * len(self._data)), self._data.shape[1]), np.nan)
+            data[:self.rows] = self.array
+            self._data = data
+        self._data[self.rows:needed] = rows
+        self.rows = needed
+
+
+class RateHistory:
+    """
+    The RateHistory class holds the RON values of several currencies over the publication dates.
+
+    Attributes:
+        currencies (list[str]): The currency codes, in the order of the columns.
+        positions (dict[str, int]): The column of each currency code.
+        dates (list[str]): The publication dates (ISO format, increasing), in the order of the rows.
+    """
+    def __init__(self, currencies: list[str], capacity: int = INITIAL_CAPACITY):
+        self.currencies = list(currencies)
+        self.positions = {currency: position for position, currency in enumerate(self.currencies)}
+        self.dates = []
+        self._values = _GrowingMatrix(len(self.currencies), capacity)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    @property
+    def values(self) -> np.ndarray:
+        """
+        The value of one unit of each currency expressed in RON (one row per date, NaN if missing).
+        """
+        return self._values.array
+
+    def append_many(self, publications: list[tuple[str, dict[str, float]]]) -> int:
+        """
+        Append the exchange rates of later publication dates (the currencies not in the history are
+        ignored).
+
+        Parameters:
+            publications (list[tuple[str, dict[str, float]]]): Pairs of publication date (ISO format)
+            and exchange rates (the value of one unit of each currency expressed in RON).
+
+        Returns:
+            int: The number of appended dates.
+
+        Raises:
+            ValueError: If a date isn't later than the last date of the history.
+        """
+        rows = np.full((len(publications), len(self.currencies)), np.nan)
+        last = self.dates[-1] if self.dates else ''
+        for row, (published, exchange_rates) in enumerate(publications):
+            if published <= last:
+                raise ValueError(f'The publication {published} is not later than {last}')
+            last = published
+            for currency, value in exchange_rates.items():
+                position = self.positions.get(currency)
+                if position is not None:
+                    rows[row, position] = value
+        self._values.extend(rows)
+        self.dates.extend(published for published, _ in publications)
+        return len(publications)
+
+    def append(self, published: str, exchange_rates: dict[str, float]) -> None:
+        self.append_many([(published, exchange_rates)])
+
+    @classmethod
+    def from_store(cls, rate_store: RateStore, start: datetime.date | str | None = None,
+                   end: datetime.date | str | None = None, currencies: list[str] | None = None) -> 'RateHistory':
+        """
+        Read the publications of a date range from a RateStore.
+
+        Parameters:
+            rate_store (RateStore): The stored history.
+            start (datetime.date or str, optional): The first date (the first publication if not provided).
+            end (datetime.date or str, optional): The last date (the last publication if not provided).
+            currencies (list[str], optional): The currencies (those of any publication of the range if
+            not provided, NaN on the dates without their rate).
+        """
+        if currencies is None:
+            currencies = rate_store.currencies(start, end)
+        history = cls(currencies)
+        history.append_many(list(rate_store.iter_publications(start, end)))
+        return history
+
+    def rates(self, base: str, start: int = 0) -> np.ndarray:
+        """
+        Compute the exchange rates relative to a reference currency.
+
+        Parameters:
+            base (str): The reference currency code.
+            start (int, optional): The first row (only the rows from it are computed).
+
+        Returns:
+            np.ndarray: The amount of each currency for one unit of 'base' (one row per date).
+
+        Raises:
+            UnknownCurrencyException: If the reference currency isn't in the history.
+        """
+        if base not in self.positions:
+            raise UnknownCurrencyException(base)
+        values = self.values[start:]
+        return values[:, [self.positions[base]]] / values
+
+
+class RateAnalytics:
+    """
+    The RateAnalytics class computes the rolling statistics of a RateHistory relative to a reference
+    currency, and updates them when dates are appended to the history.
+
+    Attributes:
+        history (RateHistory): The analysed history.
+        base (str): The reference currency code.
+        window (int): The number of publications of the rolling windows.
+        moving_average (np.ndarray): The mean rate over the window ending at each date (NaN for the
+        first dates).
+        volatility (np.ndarray): The standard deviation of the daily log returns over the window
+        ending at each date.
+        percent_change (np.ndarray): The change of the rate since the previous date, in percent.
+
+    Note:
+        - The statistics have one row per date and one column per currency of the history.
+    """
+    STATISTICS = ('moving_average', 'volatility', 'percent_change')
+
+    def __init__(self, history: RateHistory, base: str = 'RON', window: int = 20):
+        if base not in history.positions:
+            raise UnknownCurrencyException(base)
+        if window < 2:
+            raise ValueError('The window must hold at least 2 publications')
+        self.history = history
+        self.base = base
+        self.window = window
+        self._statistics = {name: _GrowingMatrix(len(history.currencies), len(history))
+                            for name in self.STATISTICS}
+        self.update()
+
+    @property
+    def moving_average(self) -> np.ndarray:
+        return self._statistics['moving_average'].array
+
+    @property
+    def volatility(self) -> np.ndarray:
+        return self._statistics['volatility'].array
+
+    @property
+    def percent_change(self) -> np.ndarray:
+        return self._statistics['percent_change'].array
+
+    def update(self) -> int:
+        """
+        Compute the statistics of the dates appended to the history since the last update (from the
+        trailing window only).
+
+        Returns:
+            int: The number of computed dates.
+        """
+        computed = self._statistics['moving_average'].rows
+        added = len(self.history) - computed
+        if added <= 0:
+            return 0
+        # The window ending at the first new date starts 'window - 1' dates before it, and its returns
+        # need one more date
+        start = max(0, computed - self.window)
+        rates = pd.DataFrame(self.history.rates(self.base, start))
+        returns = np.log(rates).diff()
+        statistics = {
+            'moving_average': rates.rolling(self.window, min_periods=self.window).mean(),
+            'volatility': returns.rolling(self.window, min_periods=self.window).std(),
+            'percent_change': (rates / rates.shift(1) - 1) * 100,
+        }
+        for name, frame in statistics.items():
+            self._statistics[name].extend(frame.to_numpy()[-added:])
+        return added
+
+    def _index(self) -> pd.DatetimeIndex:
+        return pd.DatetimeIndex(pd.to_datetime(self.history.dates), name='Date')
+
+    def frame(self, statistic: str = 'moving_average') -> pd.DataFrame:
+        """
+        Get a statistic as a DataFrame (one row per date, one column per currency).
+
+        Parameters:
+            statistic (str, optional): 'rates' or one of 'STATISTICS'.
+        """
+        if statistic == 'rates':
+            values = self.history.rates(self.base)
+        elif statistic in self.STATISTICS:
+            values = self._statistics[statistic].array
+        else:
+            raise ValueError(f'Unknown statistic: {statistic}')
+        return pd.DataFrame(values, index=self._index(), columns=self.history.currencies)
+
+    def period_summary(self, frequency: str = 'M') -> pd.DataFrame:
+        """
+        Summarize the rates of each period: minimum, maximum and change from the first to the last
+        date of the period (in percent).
+
+        Parameters:
+            frequency (str, optional): The periods ('W', 'M', 'Q' or 'Y', see 'pandas.Period').
+
+        Returns:
+            pd.DataFrame: One row per period, the columns being ('min' | 'max' | 'change', currency).
+        """
+        rates = self.frame('rates')
+        periods = rates.groupby(rates.index.to_period(frequency))
+        first, last = periods.first(), periods.last()
+        return pd.concat({'min': periods.min(), 'max': periods.max(), 'change': (last / first - 1) * 100}, axis=1)
+
+    def latest(self, currency: str) -> dict[str, float | None]:
+        """
+        Get the last rate and the last statistics of a currency (None if not available).
+        """
+        position = self.history.positions.get(currency)
+        if position is None:
+            raise UnknownCurrencyException(currency)
+        if not len(self.history):
+            return {name: None for name in ('rate',) + self.STATISTICS}
+        values = {'rate': self.history.rates(self.base, len(self.history) - 1)[0, position]}
+        values.update((name, self._statistics[name].array[-1, position]) for name in self.STATISTICS)
+        return {name: None if math.isnan(value) else float(value) for name, value in values.items()}
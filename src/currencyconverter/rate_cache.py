@@ -0,0 +1,196 @@
+import datetime
+import hashlib
+import json
+import math
+import os
+import pathlib
+import tempfile
+import time
+
+from src.currencyconverter.bnr_calendar import last_publication
+from src.currencyconverter.instrumentation import metrics
+
+
+CACHE_FORMAT_VERSION = 1
+DEFAULT_CACHE_DIR = os.path.join(pathlib.Path.home(), '.currencyconverter')
+DEFAULT_CACHE_FILE = 'rates_snapshot.json'
+DEFAULT_TTL = datetime.timedelta(days=7)
+
+
+class CorruptCacheEntryException(Exception):
+    """
+    Custom exception class for a corrupt cache entry, raised when the content of the snapshot file
+    can't be decoded or doesn't pass the integrity checks.
+    """
+    def __init__(self, reason: str):
+        super().__init__(f'Corrupt cache entry: {reason}')
+
+
+class RateSnapshot:
+    """
+    The RateSnapshot class holds one set of exchange rates as they were published by the source,
+    together with the details needed to decide if they are still up-to-date.
+
+    Attributes:
+        rates (dict[str, float]): The exchange rates (value of one currency unit expressed in RON).
+        source (str): The URL (or the name) of the source that provided the rates.
+        fetched_at (float): The moment (UNIX timestamp) when the rates were fetched.
+        published (str or None): The publication date (ISO format) of the rates, if known.
+        validators (dict[str, str]): The HTTP validators ('etag', 'last_modified') of the response
+        the rates were parsed from, used to revalidate them with a conditional request.
+    """
+    def __init__(self, rates: dict[str, float], source: str, fetched_at: float | None = None,
+                 published: str | None = None, validators: dict[str, str] | None = None):
+        self.rates = rates
+        self.source = source
+        self.fetched_at = time.time() if fetched_at is None else fetched_at
+        self.published = published
+        self.validators = validators or {}
+
+    @property
+    def version(self) -> str:
+        """
+        A short content hash identifying the rates (equal rates produce equal versions).
+        """
+        payload = json.dumps([self.published, sorted(self.rates.items())], separators=(',', ':'))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+    @property
+    def publication_label(self) -> str:
+        """
+        The publication date for display, or the fetch time (local time) if the source didn't state it.
+        """
+        if self.published is not None:
+            return self.published
+        fetched_at = datetime.datetime.fromtimestamp(self.fetched_at).strftime('%Y-%m-%d %H:%M')
+        return f'date unknown, fetched {fetched_at}'
+
+    def to_dict(self) -> dict:
+        """
+        Convert the snapshot into a JSON serializable dictionary.
+        """
+        return {'rates': self.rates, 'source': self.source, 'fetched_at': self.fetched_at,
+                'published': self.published, 'validators': self.validators}
+
+    def revalidated(self) -> 'RateSnapshot':
+        """
+        Get a copy of the snapshot fetched now, for a source that confirmed the rates didn't change.
+        """
+        return RateSnapshot(self.rates, self.source, published=self.published, validators=self.validators)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'RateSnapshot':
+        """
+        Build a snapshot from a dictionary produced by 'to_dict', validating the content.
+
+        Raises:
+            CorruptCacheEntryException: If a field is missing or holds an invalid value.
+        """
+        try:
+            rates = {str(currency): float(value) for currency, value in data['rates'].items()}
+            validators = {str(name): str(value) for name, value in (data.get('validators') or {}).items()}
+            snapshot = cls(rates, str(data['source']), float(data['fetched_at']), data.get('published'), validators)
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            raise CorruptCacheEntryException(f'invalid field ({e})')
+        if not rates or not all(math.isfinite(value) and value > 0 for value in rates.values()):
+            raise CorruptCacheEntryException('invalid rates')
+        return snapshot
+
+
+class RateCache:
+    """
+    The RateCache class stores the last fetched exchange rates on the disk so that the application
+    can start (and convert) without contacting the web source while the rates are still valid.
+
+    Attributes:
+        cache_dir (str): The directory where the snapshot file is kept.
+        file_path (str): The path of the snapshot file.
+        ttl (datetime.timedelta): The maximum age of a snapshot, regardless of the publication
+        schedule.
+
+    Note:
+        - A snapshot is fresh if it was fetched after the last BNR publication and is not older
+        than 'ttl'.
+        - The file is written atomically (temporary file + rename), so a crash while saving never
+        leaves a truncated snapshot behind.
+    """
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, ttl: datetime.timedelta = DEFAULT_TTL,
+                 file_name: str = DEFAULT_CACHE_FILE):
+        self.cache_dir = cache_dir
+        self.file_path = os.path.join(cache_dir, file_name)
+        self.ttl = ttl
+
+    @staticmethod
+    def _checksum(payload: dict) -> str:
+        """
+        Compute the checksum of a snapshot payload.
+        """
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def load(self) -> RateSnapshot | None:
+        """
+        Load the snapshot stored on the disk.
+
+        Returns:
+            RateSnapshot or None: The stored snapshot, or None if there is no snapshot or the
+            stored one is corrupt.
+        """
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as file:
+                entry = json.load(file)
+            if not isinstance(entry, dict) or entry.get('format_version') != CACHE_FORMAT_VERSION:
+                raise CorruptCacheEntryException('unknown format version')
+            if entry.get('checksum') != self._checksum(entry.get('snapshot')):
+                raise CorruptCacheEntryException('checksum mismatch')
+            return RateSnapshot.from_dict(entry['snapshot'])
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, CorruptCacheEntryException) as e:
+            metrics.increment('errors', stage='cache_load')
+            print(e)
+            return None
+
+    def store(self, snapshot: RateSnapshot) -> None:
+        """
+        Atomically write a snapshot to the disk, replacing the previous one.
+
+        Parameters:
+            snapshot (RateSnapshot): The snapshot to be stored.
+        """
+        payload = snapshot.to_dict()
+        entry = {'format_version': CACHE_FORMAT_VERSION, 'checksum': self._checksum(payload),
+                 'snapshot': payload}
+        os.makedirs(self.cache_dir, exist_ok=True)
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(file_descriptor, 'w', encoding='utf-8') as file:
+                json.dump(entry, file)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, self.file_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    def is_fresh(self, snapshot: RateSnapshot, now: datetime.datetime | None = None) -> bool:
+        """
+        Check if a snapshot still holds the latest published rates.
+
+        Parameters:
+            snapshot (RateSnapshot): The snapshot to be checked.
+            now (datetime.datetime, optional): The reference moment (now if not provided).
+
+        Returns:
+            bool: True if the snapshot was fetched after the last publication and within 'ttl', and
+            (if its publication date is known) holds the rates of the last publication.
+
+        Note:
+            - A snapshot fetched after the publication time can still hold the rates of the previous
+            publication (when the source is late), so its publication date is checked as well.
+        """
+        now = now or datetime.datetime.now(datetime.timezone.utc)
+        fetched_at = datetime.datetime.fromtimestamp(snapshot.fetched_at, datetime.timezone.utc)
+        publication = last_publication(now)
+        if snapshot.published is not None and snapshot.published < publication.date().isoformat():
+            return False
+        return publication <= fetched_at <= now and now - fetched_at <= self.ttl
@@ -0,0 +1,102 @@
+import re
+
+
+"""
+================== Exchange rates table parsers ==================
+
+Parsers extracting the exchange rates from the 'table-currencies' table of the cursbnr.ro page.
+
+Functions:
+    - parse_rates_full: Builds a BeautifulSoup tree of the whole page (reference implementation).
+    - parse_rates_targeted: Locates the table in the raw page and only parses the table itself.
+
+Note:
+    - Both parsers return the value of one currency unit expressed in RON: the rows quoted for
+    multiple units (such as '100HUF') are divided by the quoted amount.
+    - The parser used by CurrencyConvertor is selected by name through 'HTML_PARSERS'.
+    - BeautifulSoup and lxml are only imported when a page is parsed.
+"""
+
+
+CURRENCIES_TABLE_ID = 'table-currencies'
+QUOTED_CURRENCY_PATTERN = re.compile(r'(\d*)([A-Z]{3})')
+CURRENCIES_TABLE_PATTERN = re.compile(rb'<table[^>]*\bid=["\']?' + CURRENCIES_TABLE_ID.encode() + rb'\b', re.IGNORECASE)
+TABLE_END_PATTERN = re.compile(rb'</table\s*>', re.IGNORECASE)
+
+
+class RatesTableNotFoundException(Exception):
+    """
+    Custom exception class for a missing exchange rates table, raised when the page doesn't contain
+    the 'table-currencies' table.
+    """
+    def __init__(self):
+        super().__init__(f'Table not found: {CURRENCIES_TABLE_ID}')
+
+
+def _add_rate(exchange_rates: dict[str, float], quoted_currency: str, value: str) -> None:
+    """
+    Add the rate of one table row, converting the quotes for multiple units to one unit.
+    """
+    quoted_currency = quoted_currency.strip()
+    match = QUOTED_CURRENCY_PATTERN.fullmatch(quoted_currency)
+    if match and match.group(1):
+        exchange_rates[match.group(2)] = float(value) / int(match.group(1))
+    else:
+        exchange_rates[quoted_currency] = float(value)
+
+
+def parse_rates_full(content: bytes) -> dict[str, float]:
+    """
+    Parse the exchange rates by building the BeautifulSoup tree of the whole page.
+
+    Parameters:
+        content (bytes): The content of the page.
+
+    Returns:
+        dict[str, float]: The value of one unit of each currency expressed in RON.
+    """
+    from bs4 import BeautifulSoup
+
+    exchange_rates = {}
+    soup = BeautifulSoup(content, 'lxml')
+    table = soup.find('table', {'id': CURRENCIES_TABLE_ID})
+    if table is None or table.tbody is None:
+        raise RatesTableNotFoundException()
+
+    for tr in table.tbody.find_all('tr'):
+        td = tr.find_all('td')
+        _add_rate(exchange_rates, td[0].text, td[2].text)
+    return exchange_rates
+
+
+def parse_rates_targeted(content: bytes) -> dict[str, float]:
+    """
+    Parse the exchange rates by locating the table in the raw page and parsing only the table.
+
+    Parameters:
+        content (bytes): The content of the page.
+
+    Returns:
+        dict[str, float]: The value of one unit of each currency expressed in RON.
+    """
+    from lxml import etree
+
+    table_start = CURRENCIES_TABLE_PATTERN.search(content)
+    if table_start is None:
+        raise RatesTableNotFoundException()
+    table_end = TABLE_END_PATTERN.search(content, table_start.end())
+    table_content = content[table_start.start():table_end.end() if table_end else len(content)]
+
+    exchange_rates = {}
+    table = etree.fromstring(table_content, etree.HTMLParser(encoding='utf-8'))
+    for tr in table.iter('tr'):
+        td = tr.findall('td')
+        if len(td) >= 3:
+            _add_rate(exchange_rates, ''.join(td[0].itertext()), ''.join(td[2].itertext()))
+    return exchange_rates
+
+
+HTML_PARSERS = {
+    'full': parse_rates_full,
+    'targeted': parse_rates_targeted,
+}
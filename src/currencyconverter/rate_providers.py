@@ -0,0 +1,349 @@
+import abc
+import concurrent.futures
+import math
+import statistics
+import threading
+import time
+from typing import BinaryIO
+
+from src.currencyconverter.bnr_xml import BNR_XML_URL, EmptyFeedException, parse_latest
+from src.currencyconverter.http_client import NOT_MODIFIED, HttpClient
+from src.currencyconverter.instrumentation import metrics
+from src.currencyconverter.rate_cache import RateSnapshot
+from src.currencyconverter.rate_parsers import HTML_PARSERS
+
+
+"""
+================== Rate providers ==================
+
+The sources of the exchange rates and the pool querying them concurrently.
+
+Classes:
+    - RateProvider: The interface of a source ('fetch' returns a snapshot with the rates in RON).
+    - BnrXmlProvider: The official BNR XML feed.
+    - CursBnrProvider: The 'table-currencies' table of the cursbnr.ro page.
+    - EcbXmlProvider: The ECB euro foreign exchange reference rates (converted to RON).
+    - ProviderPool: Queries the providers and picks the result with a policy.
+
+Policies:
+    - 'ordered' (default): The providers are queried one after the other, in their order: the next one
+    is only queried if the previous one failed or missed its deadline (the BNR XML feed first, the
+    cursbnr.ro page only as a fallback).
+    - 'fastest': The providers are queried in parallel and the first valid response wins; the slower
+    providers are not waited for.
+    - 'median': Waits for the responses of all the providers (until their deadlines) and takes the
+    median rate of each currency quoted by at least 'quorum' providers.
+
+Note:
+    - Every provider has its own deadline: a response arriving later is discarded, so a slow source
+    never delays the refresh beyond it.
+    - The requests run in daemon threads: a request still running when the pool returns never delays
+    the exit of the process.
+    - The ECB publishes its rates at 16:00 CET and they slightly differ from the BNR ones, so the
+    provider isn't used by default.
+"""
+
+
+DEFAULT_URL = 'https://www.cursbnr.ro/'
+ECB_XML_URL = 'https://www.ecb.europa.eu/stats/eurofxref/eurofxref-daily.xml'
+DEFAULT_DEADLINE = 10.0
+POLICIES = ('ordered', 'fastest', 'median')
+
+
+class NoValidRatesException(Exception):
+    """
+    Custom exception class for a failed refresh, raised when no provider returned valid exchange
+    rates before its deadline.
+    """
+    def __init__(self, errors: dict[str, str]):
+        details = '; '.join(f'{name}: {error}' for name, error in errors.items()) or 'no provider'
+        super().__init__(f'No valid exchange rates ({details})')
+
+
+class RateProvider(abc.ABC):
+    """
+    The RateProvider class is the interface of the exchange rates sources.
+
+    Attributes:
+        name (str): The name of the provider.
+        url (str): The URL of the source (also the 'source' of the snapshots it returns).
+        deadline (float): The maximum duration of a fetch, in seconds.
+    """
+    name = 'provider'
+
+    def __init__(self, url: str, deadline: float = DEFAULT_DEADLINE):
+        self.url = url
+        self.deadline = deadline
+
+    @abc.abstractmethod
+    def fetch(self, http_client: HttpClient, validators: dict[str, str] | None = None) -> RateSnapshot | None:
+        """
+        Download and parse the exchange rates.
+
+        Parameters:
+            http_client (HttpClient): The client used for the requests.
+            validators (dict[str, str], optional): The validators of the previous response of the source.
+
+        Returns:
+            RateSnapshot or None: The value of one unit of each currency expressed in RON, or None if
+            the source didn't change since the previous response.
+        """
+
+
+class BnrXmlProvider(RateProvider):
+    """
+    The BnrXmlProvider class streams and incrementally parses the official BNR XML feed.
+    """
+    name = 'bnr-xml'
+
+    def __init__(self, url: str = BNR_XML_URL, deadline: float = DEFAULT_DEADLINE):
+        super().__init__(url, deadline)
+
+    def fetch(self, http_client: HttpClient, validators: dict[str, str] | None = None) -> RateSnapshot | None:
+        response = http_client.get(self.url, stream=True, validators=validators)
+        try:
+            if response.status_code == NOT_MODIFIED:
+                return None
+            response.raw.decode_content = True
+            with metrics.span('parse', provider=self.name):
+                published, exchange_rates = parse_latest(response.raw)
+        finally:
+            response.close()
+        return RateSnapshot(exchange_rates, self.url, published=published,
+                            validators=http_client.validators_of(response))
+
+
+class CursBnrProvider(RateProvider):
+    """
+    The CursBnrProvider class scrapes the exchange rates table of the cursbnr.ro page.
+
+    Attributes:
+        html_parser (str): The name of the parser used for the page (see 'rate_parsers.HTML_PARSERS').
+
+    Note:
+        - The page doesn't state the publication date, so its snapshots have no publication date (they
+        are never written to the rates history, and are never considered as the rates of the day).
+    """
+    name = 'cursbnr'
+
+    def __init__(self, url: str = DEFAULT_URL, deadline: float = DEFAULT_DEADLINE, html_parser: str = 'targeted'):
+        super().__init__(url, deadline)
+        self.html_parser = html_parser
+
+    def fetch(self, http_client: HttpClient, validators: dict[str, str] | None = None) -> RateSnapshot | None:
+        response = http_client.get(self.url, validators=validators)
+        if response.status_code == NOT_MODIFIED:
+            return None
+        with metrics.span('parse', provider=self.name):
+            exchange_rates = HTML_PARSERS[self.html_parser](response.content)
+        exchange_rates['RON'] = 1.0000
+        return RateSnapshot(exchange_rates, self.url, validators=http_client.validators_of(response))
+
+
+def parse_ecb_latest(source: str | BinaryIO) -> tuple[str, dict[str, float]]:
+    """
+    Parse an ECB reference rates document (amount of each currency for one EUR).
+
+    Parameters:
+        source (str or BinaryIO): The path of the document or a binary file-like object.
+
+    Returns:
+        tuple[str, dict[str, float]]: The publication date (ISO format) and the value of one unit of
+        each currency expressed in RON.
+
+    Raises:
+        EmptyFeedException: If the document contains no RON rate (needed to express the rates in RON).
+    """
+    from lxml import etree
+
+    published, per_euro = None, {}
+    for _, cube in etree.iterparse(source, events=('end',), tag='{*}Cube'):
+        if cube.get('currency') is not None:
+            try:
+                per_euro[cube.get('currency')] = float(cube.get('rate'))
+            except (TypeError, ValueError):
+                continue
+        elif cube.get('time') is not None:
+            published = cube.get('time')
+            break
+    ron_per_euro = per_euro.pop('RON', None)
+    if not ron_per_euro:
+        raise EmptyFeedException()
+    exchange_rates = {currency: ron_per_euro / rate for currency, rate in per_euro.items() if rate > 0}
+    exchange_rates['EUR'] = ron_per_euro
+    exchange_rates['RON'] = 1.0000
+    return published, exchange_rates
+
+
+class EcbXmlProvider(RateProvider):
+    """
+    The EcbXmlProvider class reads the ECB euro foreign exchange reference rates.
+    """
+    name = 'ecb'
+
+    def __init__(self, url: str = ECB_XML_URL, deadline: float = DEFAULT_DEADLINE):
+        super().__init__(url, deadline)
+
+    def fetch(self, http_client: HttpClient, validators: dict[str, str] | None = None) -> RateSnapshot | None:
+        response = http_client.get(self.url, stream=True, validators=validators)
+        try:
+            if response.status_code == NOT_MODIFIED:
+                return None
+            response.raw.decode_content = True
+            with metrics.span('parse', provider=self.name):
+                published, exchange_rates = parse_ecb_latest(response.raw)
+        finally:
+            response.close()
+        return RateSnapshot(exchange_rates, self.url, published=published,
+                            validators=http_client.validators_of(response))
+
+
+def is_valid(snapshot: RateSnapshot) -> bool:
+    """
+    Check if a snapshot holds usable exchange rates (at least one rate besides RON, all positive).
+    """
+    rates = snapshot.rates
+    return len(rates) > 1 and all(math.isfinite(value) and value > 0 for value in rates.values())
+
+
+class ProviderPool:
+    """
+    The ProviderPool class queries several providers (one daemon thread for each request) and
+    combines their responses with a policy.
+
+    Attributes:
+        providers (list[RateProvider]): The queried providers, in the order of preference.
+        http_client (HttpClient): The client shared by the providers.
+        policy (str): 'ordered', 'fastest' or 'median' (see the module documentation).
+        quorum (int): The minimum number of providers quoting a currency for the 'median' policy.
+
+    Note:
+        - Every request gets its own daemon thread: a provider still running when the pool returns
+        keeps its thread until its request times out, without delaying the next fetch or the exit of
+        the process.
+    """
+    def __init__(self, providers: list[RateProvider], http_client: HttpClient, policy: str = 'ordered',
+                 quorum: int = 2):
+        if policy not in POLICIES:
+            raise ValueError(f'Unknown policy: {policy}')
+        self.providers = providers
+        self.http_client = http_client
+        self.policy = policy
+        self.quorum = quorum
+
+    def _fetch_one(self, provider: RateProvider, cached_snapshot: RateSnapshot | None) -> RateSnapshot:
+        """
+        Fetch the rates of one provider, turning a 'not modified' answer into the revalidated cache.
+        """
+        revalidating = cached_snapshot is not None and cached_snapshot.source == provider.url
+        with metrics.span('provider_fetch', provider=provider.name):
+            snapshot = provider.fetch(self.http_client, cached_snapshot.validators if revalidating else None)
+        if snapshot is None:
+            metrics.increment('not_modified', provider=provider.name)
+            return cached_snapshot.revalidated()
+        if not is_valid(snapshot):
+            raise EmptyFeedException()
+        return snapshot
+
+    def fetch(self, cached_snapshot: RateSnapshot | None = None) -> RateSnapshot:
+        """
+        Query the providers and combine their responses.
+
+        Parameters:
+            cached_snapshot (RateSnapshot, optional): The outdated snapshot, revalidated with a
+            conditional request to the provider it came from.
+
+        Returns:
+            RateSnapshot: The exchange rates chosen by the policy.
+
+        Raises:
+            NoValidRatesException: If no provider (or less than 'quorum' providers for the 'median'
+            policy) returned valid rates before its deadline.
+        """
+        if self.policy == 'ordered':
+            return self._fetch_ordered(cached_snapshot)
+        return self._collect(cached_snapshot)
+
+    def _start(self, provider: RateProvider, cached_snapshot: RateSnapshot | None) -> concurrent.futures.Future:
+        """
+        Fetch the rates of one provider in a daemon thread.
+        """
+        future = concurrent.futures.Future()
+
+        def run():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(self._fetch_one(provider, cached_snapshot))
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, name=f'rate-provider-{provider.name}', daemon=True).start()
+        return future
+
+    def _fetch_ordered(self, cached_snapshot: RateSnapshot | None) -> RateSnapshot:
+        """
+        Query the providers one after the other until one returns valid rates before its deadline.
+        """
+        errors = {}
+        for provider in self.providers:
+            future = self._start(provider, cached_snapshot)
+            try:
+                return future.result(timeout=provider.deadline)
+            except concurrent.futures.TimeoutError:
+                errors[provider.name] = 'deadline exceeded'
+            except Exception as e:
+                errors[provider.name] = str(e)
+        raise NoValidRatesException(errors)
+
+    def _collect(self, cached_snapshot: RateSnapshot | None) -> RateSnapshot:
+        """
+        Query all the providers in parallel and apply the policy to their responses.
+        """
+        started = time.monotonic()
+        futures = {self._start(provider, cached_snapshot): provider for provider in self.providers}
+        deadlines = {future: started + provider.deadline for future, provider in futures.items()}
+        pending, snapshots, errors = set(futures), [], {}
+        while pending:
+            timeout = max(deadlines[future] for future in pending) - time.monotonic()
+            done, pending = concurrent.futures.wait(pending, timeout=max(timeout, 0),
+                                                    return_when=concurrent.futures.FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                provider = futures[future]
+                if time.monotonic() > deadlines[future]:
+                    errors[provider.name] = 'deadline exceeded'
+                elif future.exception() is not None:
+                    errors[provider.name] = str(future.exception())
+                elif self.policy == 'fastest':
+                    return future.result()
+                else:
+                    snapshots.append(future.result())
+            # The providers past their deadline are not waited for
+            for future in [future for future in pending if time.monotonic() > deadlines[future]]:
+                pending.discard(future)
+                errors[futures[future].name] = 'deadline exceeded'
+        for future in pending:
+            errors[futures[future].name] = 'deadline exceeded'
+
+        if self.policy == 'median' and len(snapshots) >= self.quorum:
+            return self._median(snapshots)
+        if self.policy == 'median':
+            errors['quorum'] = f'{len(snapshots)} of {self.quorum} providers'
+        raise NoValidRatesException(errors)
+
+    def _median(self, snapshots: list[RateSnapshot]) -> RateSnapshot:
+        """
+        Combine the snapshots into the median rate of each currency quoted by at least 'quorum' of them.
+        """
+        quotes = {}
+        for snapshot in snapshots:
+            for currency, value in snapshot.rates.items():
+                quotes.setdefault(currency, []).append(value)
+        rates = {currency: statistics.median(values) for currency, values in quotes.items()
+                 if len(values) >= self.quorum}
+        dates = [snapshot.published for snapshot in snapshots if snapshot.published is not None]
+        published = statistics.median_low(dates) if dates else None
+        source = 'median:' + ','.join(snapshot.source for snapshot in snapshots)
+        return RateSnapshot(rates, source, published=published)
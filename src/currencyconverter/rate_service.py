@@ -0,0 +1,418 @@
+import asyncio
+import json
+from decimal import Decimal
+from typing import TYPE_CHECKING
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from src.currencyconverter.currency_converter import CurrencyConvertor
+from src.currencyconverter.exceptions import UnknownCurrencyException
+from src.currencyconverter.fixed_point import FixedPointOverflowException
+from src.currencyconverter.instrumentation import metrics
+from src.currencyconverter.refresh_scheduler import RefreshScheduler
+
+if TYPE_CHECKING:
+    from src.currencyconverter.cross_rates import CrossRateEngine
+    from src.currencyconverter.fixed_point import FixedPointEngine
+    from src.currencyconverter.rate_cache import RateSnapshot
+
+
+"""
+================== Rate service ==================
+
+A local HTTP/JSON conversion service for the other applications, holding the current snapshot in
+memory and refreshing it in the background after each publication (see 'refresh_scheduler').
+
+Endpoints:
+    - GET /rates?base=EUR: The rates of all the currencies relative to 'base' (RON by default).
+    - GET /convert?amount=100&from=EUR&to=USD: One exact conversion (see 'fixed_point').
+    - POST /convert: A batch of conversions, the body being a JSON list of
+    {"amount": ..., "from": ..., "to": ...} objects; an invalid item (unknown currency, amount too
+    large, ...) gets an "error" instead of a "result", without failing the batch.
+    - GET /metrics: The metrics of the service, in the Prometheus text format (see 'instrumentation').
+
+Usage (from the project directory):
+    - python -m src.currencyconverter serve --port 8080
+
+Note:
+    - The requests never fetch or parse anything: they are answered from the engines built once per
+    snapshot, and the '/rates' bodies are encoded once per snapshot and reference currency.
+    - The responses carry the version of the snapshot as their ETag: a request with a matching
+    'If-None-Match' header is answered with 304 and no body.
+    - The connections are kept alive (HTTP/1.1), so a client doesn't pay a TCP handshake per request.
+    - The amounts and the results are exact decimal strings (such as "1080434782608695.65"), with the
+    decimals of the minor unit of their currency: a JSON float would round the large amounts.
+"""
+
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8080
+DEFAULT_REFRESH_INTERVAL = 300.0
+MAX_BODY_SIZE = 1024 * 1024
+MAX_BATCH_SIZE = 10_000
+REASONS = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           413: 'Payload Too Large', 500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+
+def _convert_minor_or_none(fixed_point: 'FixedPointEngine', amount: int, source: int, target: int) -> int | None:
+    """
+    Convert one amount of minor units (None if the result doesn't fit the fixed-point arithmetic).
+    """
+    try:
+        return int(fixed_point.convert_minor_many(amount, source, target))
+    except FixedPointOverflowException:
+        return None
+
+
+class RequestException(Exception):
+    """
+    Custom exception class for an invalid request, answered with its status code and message.
+    """
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class Response:
+    """
+    The Response class holds the answer to a request.
+
+    Attributes:
+        status (int): The status code.
+        body (bytes): The body (empty for 304).
+        etag (str or None): The ETag header.
+        content_type (str): The media type of the body.
+    """
+    def __init__(self, status: int, body: bytes = b'', etag: str | None = None,
+                 content_type: str = 'application/json'):
+        self.status = status
+        self.body = body
+        self.etag = etag
+        self.content_type = content_type
+
+    @classmethod
+    def error(cls, status: int, message: str) -> 'Response':
+        return cls(status, json.dumps({'error': message}).encode('utf-8'))
+
+    def encode(self, keep_alive: bool) -> bytes:
+        """
+        Encode the status line, the headers and the body.
+        """
+        headers = [f'HTTP/1.1 {self.status} {REASONS.get(self.status, "")}']
+        if self.status != 304:
+            headers.append(f'Content-Type: {self.content_type}')
+        headers.append(f'Content-Length: {len(self.body)}')
+        if self.etag is not None:
+            headers.append(f'ETag: {self.etag}')
+            headers.append('Cache-Control: no-cache')
+        headers.append('Connection: keep-alive' if keep_alive else 'Connection: close')
+        return ('\r\n'.join(headers) + '\r\n\r\n').encode('latin-1') + self.body
+
+
+class ServiceState:
+    """
+    The ServiceState class holds everything derived from one snapshot (replaced as a whole when
+    the snapshot changes, so a request always sees consistent data).
+
+    Attributes:
+        snapshot (RateSnapshot): The exchange rates.
+        cross_rates (CrossRateEngine): The engine of the '/rates' responses.
+        fixed_point (FixedPointEngine): The engine of the conversions.
+        etag (str): The ETag of the responses (the version of the snapshot).
+    """
+    def __init__(self, snapshot: 'RateSnapshot', cross_rates: 'CrossRateEngine', fixed_point: 'FixedPointEngine'):
+        self.snapshot = snapshot
+        self.cross_rates = cross_rates
+        self.fixed_point = fixed_point
+        self.etag = f'"{snapshot.version}"'
+        self._rates_bodies = {}
+
+    def rates_body(self, base: str) -> bytes:
+        """
+        Get the encoded '/rates' body of a reference currency (encoded on first use).
+
+        Raises:
+            UnknownCurrencyException: If there is no exchange rate for the reference currency.
+        """
+        body = self._rates_bodies.get(base)
+        if body is None:
+            payload = {'base': base, 'published': self.snapshot.published, 'version': self.snapshot.version,
+                       'rates': self.cross_rates.rates_dict(base)}
+            body = self._rates_bodies[base] = json.dumps(payload).encode('utf-8')
+        return body
+
+
+def _matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Check if an 'If-None-Match' header matches an ETag.
+    """
+    if if_none_match is None:
+        return False
+    tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+    return '*' in tags or etag in tags
+
+
+class RateService:
+    """
+    The RateService class answers the conversion requests from the snapshot of a CurrencyConvertor.
+
+    Attributes:
+        currency_converter (CurrencyConvertor): The source of the snapshots (its cache and providers).
+        refresh_interval (float): The delay between two refreshes while the rates of the day aren't
+        available, in seconds.
+        refresh_scheduler (RefreshScheduler): Refreshes the snapshot after each publication.
+        state (ServiceState or None): The data of the current snapshot (None until the first one is
+        loaded).
+
+    Note:
+        - The refreshes run in worker threads: the state is replaced when the scheduler publishes a
+        new snapshot, and the event loop is never blocked by a download.
+        - 'handle' doesn't depend on the sockets, so the endpoints can be used (and tested) directly.
+    """
+    def __init__(self, currency_converter: CurrencyConvertor, refresh_interval: float = DEFAULT_REFRESH_INTERVAL):
+        self.currency_converter = currency_converter
+        self.refresh_interval = refresh_interval
+        self.refresh_scheduler = RefreshScheduler(currency_converter, retry_interval=refresh_interval)
+        self.state = None
+        self._server = None
+        self._connections = {}
+
+    def _load_state(self) -> ServiceState | None:
+        """
+        Fetch the latest snapshot and build its engines (runs in a worker thread).
+        """
+        snapshot = self.currency_converter.fetch_snapshot()
+        if snapshot is None:
+            return None
+        return self._state_of(snapshot)
+
+    def _state_of(self, snapshot: 'RateSnapshot') -> ServiceState:
+        """
+        Build the state of a snapshot (the current state if the snapshot didn't change).
+        """
+        if self.state is not None and self.state.snapshot.version == snapshot.version:
+            return self.state
+        self.currency_converter.apply_snapshot(snapshot)
+        return ServiceState(snapshot, self.currency_converter.cross_rates, self.currency_converter.fixed_point)
+
+    def _on_snapshot_changed(self, snapshot: 'RateSnapshot') -> None:
+        """
+        Replace the state with the snapshot published by the scheduler (called from its worker thread).
+        """
+        self.state = self._state_of(snapshot)
+
+    async def refresh(self) -> None:
+        """
+        Replace the state if the snapshot changed.
+        """
+        state = await asyncio.get_running_loop().run_in_executor(None, self._load_state)
+        if state is not None:
+            self.state = state
+
+    def handle(self, method: str, target: str, headers: dict[str, str], body: bytes = b'') -> Response:
+        """
+        Answer a request.
+
+        Parameters:
+            method (str): The request method.
+            target (str): The request target (path and query string).
+            headers (dict[str, str]): The request headers (lowercase names).
+            body (bytes, optional): The request body.
+
+        Returns:
+            Response: The response.
+        """
+        try:
+            response = self._respond(method, target, headers, body)
+        except Exception as e:
+            # An unexpected error still gets an answer instead of a dropped connection
+            metrics.increment('errors', stage='service')
+            print(e)
+            response = Response.error(500, 'Internal error')
+        metrics.increment('requests', status=str(response.status))
+        return response
+
+    def _respond(self, method: str, target: str, headers: dict[str, str], body: bytes) -> Response:
+        url = urlsplit(target)
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        state = self.state
+        if (method, url.path) == ('GET', '/metrics'):
+            return Response(200, metrics.to_prometheus().encode('utf-8'), content_type='text/plain; version=0.0.4')
+        try:
+            if url.path not in ('/rates', '/convert'):
+                raise RequestException(404, f'Unknown path: {url.path}')
+            if (method, url.path) not in (('GET', '/rates'), ('GET', '/convert'), ('POST', '/convert')):
+                raise RequestException(405, f'Method not allowed: {method}')
+            if state is None:
+                raise RequestException(503, 'Exchange rates are not available')
+            if method == 'GET' and _matches(headers.get('if-none-match'), state.etag):
+                return Response(304, etag=state.etag)
+            if url.path == '/rates':
+                return Response(200, state.rates_body(query.get('base', 'RON').upper()), state.etag)
+            if method == 'GET':
+                return Response(200, json.dumps(self._convert_one(state, query)).encode('utf-8'), state.etag)
+            return Response(200, json.dumps(self._convert_batch(state, body)).encode('utf-8'), state.etag)
+        except RequestException as e:
+            return Response.error(e.status, str(e))
+        except UnknownCurrencyException as e:
+            return Response.error(400, str(e))
+        except (FixedPointOverflowException, OverflowError):
+            return Response.error(400, str(FixedPointOverflowException()))
+
+    @staticmethod
+    def _convert_one(state: ServiceState, query: dict[str, str]) -> dict:
+        """
+        Answer 'GET /convert'.
+        """
+        try:
+            amount, source, target = Decimal(query['amount']), query['from'].upper(), query['to'].upper()
+        except KeyError as e:
+            raise RequestException(400, f'Missing parameter: {e.args[0]}') from None
+        except ArithmeticError:
+            raise RequestException(400, f'Invalid amount: {query["amount"]}') from None
+        if not amount.is_finite():
+            raise RequestException(400, f'Invalid amount: {query["amount"]}')
+        fixed_point = state.fixed_point
+        amount = fixed_point.from_minor(fixed_point.to_minor(amount, source), source)
+        result = fixed_point.convert(amount, source, target)
+        metrics.increment('conversions')
+        return {'amount': str(amount), 'from': source, 'to': target, 'result': str(result),
+                'published': state.snapshot.published}
+
+    @staticmethod
+    def _convert_batch(state: ServiceState, body: bytes) -> dict:
+        """
+        Answer 'POST /convert': the valid items are converted together, in one vectorized operation.
+        """
+        try:
+            items = json.loads(body, parse_float=Decimal, parse_int=Decimal)
+        except ValueError:
+            raise RequestException(400, 'The body is not valid JSON') from None
+        if not isinstance(items, list):
+            raise RequestException(400, 'The body must be a list of conversions')
+        if len(items) > MAX_BATCH_SIZE:
+            raise RequestException(413, f'At most {MAX_BATCH_SIZE} conversions per request')
+
+        fixed_point = state.fixed_point
+        results, valid, amounts, sources, targets = [], [], [], [], []
+        for item in items:
+            try:
+                source, target = str(item['from']).upper(), str(item['to']).upper()
+                amount = Decimal(item['amount']) if isinstance(item['amount'], str) else item['amount']
+                if not isinstance(amount, Decimal) or not amount.is_finite():
+                    raise ValueError()
+                sources.append(fixed_point.position(source))
+                targets.append(fixed_point.position(target))
+                amounts.append(fixed_point.to_minor(amount, source))
+            except (UnknownCurrencyException, FixedPointOverflowException) as e:
+                del sources[len(amounts):], targets[len(amounts):]
+                results.append({'error': str(e)})
+                continue
+            except (TypeError, KeyError, ValueError, ArithmeticError):
+                del sources[len(amounts):], targets[len(amounts):]
+                results.append({'error': 'Invalid conversion'})
+                continue
+            valid.append(len(results))
+            results.append({'amount': str(fixed_point.from_minor(amounts[-1], source)), 'from': source, 'to': target})
+
+        if valid:
+            try:
+                converted = fixed_point.convert_minor_many(np.array(amounts, dtype=np.int64),
+                                                           np.array(sources, dtype=np.intp),
+                                                           np.array(targets, dtype=np.intp)).tolist()
+            except FixedPointOverflowException:
+                # A result doesn't fit 64 bits: the items are converted one by one to find it
+                converted = [_convert_minor_or_none(fixed_point, *conversion)
+                             for conversion in zip(amounts, sources, targets)]
+            for position, minor_units in zip(valid, converted):
+                result = results[position]
+                if minor_units is None:
+                    result.clear()
+                    result['error'] = str(FixedPointOverflowException())
+                else:
+                    result['result'] = str(fixed_point.from_minor(minor_units, result['to']))
+            metrics.increment('conversions', len(valid))
+        return {'published': state.snapshot.published, 'version': state.snapshot.version, 'results': results}
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Answer the requests of a connection until it is closed.
+        """
+        self._connections[writer] = asyncio.current_task()
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    writer.write(Response.error(400, 'Invalid request line').encode(keep_alive=False))
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if not line.strip():
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = (headers.get('connection', '').lower() != 'close' if version == 'HTTP/1.1'
+                              else headers.get('connection', '').lower() == 'keep-alive')
+                length = int(headers.get('content-length', '0') or '0')
+                if length > MAX_BODY_SIZE:
+                    writer.write(Response.error(413, 'The body is too large').encode(keep_alive=False))
+                    break
+                body = await reader.readexactly(length) if length else b''
+                writer.write(self.handle(method, target, headers, body).encode(keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.pop(writer, None)
+            writer.close()
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.Server:
+        """
+        Load the first snapshot, start listening and start the scheduled refreshes.
+
+        Returns:
+            asyncio.Server: The listening server (its 'sockets' give the bound port).
+        """
+        try:
+            await self.refresh()
+        except Exception as e:
+            print(e)
+        self._server = await asyncio.start_server(self._serve_connection, host, port)
+        self.refresh_scheduler.snapshot = self.state.snapshot if self.state is not None else None
+        self.refresh_scheduler.subscribe(self._on_snapshot_changed)
+        self.refresh_scheduler.start()
+        return self._server
+
+    async def stop(self) -> None:
+        """
+        Stop the scheduled refreshes, close the listening socket and the idle connections.
+        """
+        self.refresh_scheduler.stop()
+        self.refresh_scheduler.unsubscribe(self._on_snapshot_changed)
+        if self._server is not None:
+            self._server.close()
+            connections = list(self._connections.items())
+            for writer, _ in connections:
+                writer.close()
+            await asyncio.gather(*(task for _, task in connections), return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    async def serve_forever(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+        """
+        Start the service and answer the requests until cancelled.
+        """
+        server = await self.start(host, port)
+        print(f'Serving on http://{host}:{server.sockets[0].getsockname()[1]}')
+        try:
+            await server.serve_forever()
+        finally:
+            await self.stop()
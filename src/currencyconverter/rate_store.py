@@ -0,0 +1,221 @@
+import bisect
+import datetime
+import itertools
+import os
+import sqlite3
+import threading
+from typing import Iterable, Iterator
+
+from src.currencyconverter.exceptions import UnknownCurrencyException
+from src.currencyconverter.rate_cache import DEFAULT_CACHE_DIR
+
+
+DEFAULT_STORE_PATH = os.path.join(DEFAULT_CACHE_DIR, 'rates_history.sqlite3')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS publications (
+    published TEXT PRIMARY KEY
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rates (
+    published TEXT NOT NULL,
+    currency TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (published, currency)
+) WITHOUT ROWID;
+"""
+
+
+def _date_range(start: datetime.date | str | None, end: datetime.date | str | None) -> tuple[str, str]:
+    """
+    Get the bounds of a date range in ISO format (all the dates for the bounds not provided).
+    """
+    start = start.isoformat() if isinstance(start, datetime.date) else start or ''
+    end = end.isoformat() if isinstance(end, datetime.date) else end or '9999-12-31'
+    return start, end
+
+
+class NoRatesForDateException(Exception):
+    """
+    Custom exception class for a date without exchange rates, raised when a conversion is requested
+    for a date before the first stored publication.
+    """
+    def __init__(self, as_of: str):
+        super().__init__(f'No exchange rates stored on or before {as_of}')
+
+
+class RateStore:
+    """
+    The RateStore class keeps the history of the published exchange rates in a local SQLite database
+    and converts amounts at the rates valid on a given date.
+
+    Attributes:
+        database_path (str): The path of the SQLite database (':memory:' for a temporary store).
+        revision (int): The number of writes since the store was opened (to detect the changes of the
+        history, such as for the caches built from it).
+
+    Note:
+        - The rates are stored per publication date and per currency (both part of the primary key),
+        so looking up one rate is an index search.
+        - The publication dates are also kept in memory as a sorted list: the publication valid on a
+        given date (the nearest one on or before it) is found by binary search.
+    """
+    def __init__(self, database_path: str = DEFAULT_STORE_PATH):
+        self.database_path = database_path
+        if database_path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(database_path)), exist_ok=True)
+        self._connection = sqlite3.connect(database_path, check_same_thread=False)
+        self._connection.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self.revision = 0
+        self._publication_dates = [row[0] for row in
+                                   self._connection.execute('SELECT published FROM publications ORDER BY published')]
+
+    def close(self) -> None:
+        """
+        Close the database connection.
+        """
+        self._connection.close()
+
+    @property
+    def publication_dates(self) -> list[str]:
+        """
+        The sorted publication dates (ISO format) that have stored exchange rates.
+        """
+        return self._publication_dates
+
+    def __contains__(self, published: str) -> bool:
+        position = bisect.bisect_left(self._publication_dates, published)
+        return position < len(self._publication_dates) and self._publication_dates[position] == published
+
+    def append_many(self, snapshots: Iterable[tuple[str, dict[str, float]]]) -> int:
+        """
+        Store several publications in a single transaction (the dates already stored are replaced).
+
+        Parameters:
+            snapshots (Iterable[tuple[str, dict[str, float]]]): Pairs of publication date (ISO
+            format) and exchange rates (the value of one unit of each currency expressed in RON).
+
+        Returns:
+            int: The number of stored publications.
+        """
+        stored_dates = []
+        with self._lock:
+            with self._connection:
+                for published, exchange_rates in snapshots:
+                    self._connection.execute('INSERT OR IGNORE INTO publications VALUES (?)', (published,))
+                    self._connection.executemany('INSERT OR REPLACE INTO rates VALUES (?, ?, ?)',
+                                                 ((published, currency, value)
+                                                  for currency, value in exchange_rates.items()))
+                    stored_dates.append(published)
+            for published in stored_dates:
+                if published not in self:
+                    bisect.insort(self._publication_dates, published)
+            if stored_dates:
+                self.revision += 1
+        return len(stored_dates)
+
+    def append_snapshot(self, published: str, exchange_rates: dict[str, float]) -> None:
+        """
+        Store the exchange rates of one publication.
+
+        Parameters:
+            published (str): The publication date (ISO format).
+            exchange_rates (dict[str, float]): The value of one unit of each currency expressed in RON.
+        """
+        self.append_many([(published, exchange_rates)])
+
+    def iter_publications(self, start: datetime.date | str | None = None,
+                          end: datetime.date | str | None = None) -> Iterator[tuple[str, dict[str, float]]]:
+        """
+        Iterate over the stored publications in chronological order, reading them from the database
+        while iterating (the history is never loaded in memory at once).
+
+        Parameters:
+            start (datetime.date or str, optional): The first date (the first publication if not provided).
+            end (datetime.date or str, optional): The last date (the last publication if not provided).
+
+        Yields:
+            tuple[str, dict[str, float]]: The publication date (ISO format) and the exchange rates.
+        """
+        rows = self._connection.execute('SELECT published, currency, value FROM rates '
+                                        'WHERE published BETWEEN ? AND ? ORDER BY published', _date_range(start, end))
+        for published, group in itertools.groupby(rows, key=lambda row: row[0]):
+            yield published, {currency: value for _, currency, value in group}
+
+    def currencies(self, start: datetime.date | str | None = None,
+                   end: datetime.date | str | None = None) -> list[str]:
+        """
+        Get the sorted codes of the currencies with a rate in at least one publication of a date range
+        (the first and the last publication if not provided).
+        """
+        rows = self._connection.execute('SELECT DISTINCT currency FROM rates WHERE published BETWEEN ? AND ? '
+                                        'ORDER BY currency', _date_range(start, end))
+        return [currency for currency, in rows]
+
+    def resolve_date(self, as_of: datetime.date | str | None = None) -> str:
+        """
+        Find the publication valid on a given date (the nearest one on or before it).
+
+        Parameters:
+            as_of (datetime.date or str, optional): The date (the latest publication if not provided).
+
+        Returns:
+            str: The publication date (ISO format).
+
+        Raises:
+            NoRatesForDateException: If there is no publication on or before the date.
+        """
+        as_of = as_of.isoformat() if isinstance(as_of, datetime.date) else as_of
+        if as_of is None:
+            position = len(self._publication_dates)
+        else:
+            position = bisect.bisect_right(self._publication_dates, as_of)
+        if position == 0:
+            raise NoRatesForDateException(as_of)
+        return self._publication_dates[position - 1]
+
+    def rates_on(self, as_of: datetime.date | str | None = None) -> dict[str, float]:
+        """
+        Get all the exchange rates valid on a given date.
+
+        Parameters:
+            as_of (datetime.date or str, optional): The date (the latest publication if not provided).
+
+        Returns:
+            dict[str, float]: The value of one unit of each currency expressed in RON.
+        """
+        published = self.resolve_date(as_of)
+        rows = self._connection.execute('SELECT currency, value FROM rates WHERE published = ?', (published,))
+        return dict(rows.fetchall())
+
+    def rate(self, currency: str, as_of: datetime.date | str | None = None) -> float:
+        """
+        Get the value of one unit of a currency expressed in RON, valid on a given date.
+
+        Raises:
+            UnknownCurrencyException: If the currency has no rate in the resolved publication.
+        """
+        if currency == 'RON':
+            return 1.0
+        published = self.resolve_date(as_of)
+        row = self._connection.execute('SELECT value FROM rates WHERE published = ? AND currency = ?',
+                                       (published, currency)).fetchone()
+        if row is None:
+            raise UnknownCurrencyException(currency)
+        return row[0]
+
+    def convert(self, amount: float, source: str, target: str, as_of: datetime.date | str | None = None) -> float:
+        """
+        Convert an amount at the exchange rates valid on a given date.
+
+        Parameters:
+            amount (float): The amount to be converted.
+            source (str): The currency code of the amount.
+            target (str): The currency code of the result.
+            as_of (datetime.date or str, optional): The date (the latest publication if not provided).
+
+        Returns:
+            float: The converted amount.
+        """
+        published = self.resolve_date(as_of)
+        return amount * self.rate(source, published) / self.rate(target, published)
@@ -0,0 +1,213 @@
+import datetime
+import threading
+import time
+from typing import Callable
+
+from src.currencyconverter.bnr_calendar import last_publication, next_publication
+from src.currencyconverter.currency_converter import CurrencyConvertor
+from src.currencyconverter.instrumentation import metrics
+from src.currencyconverter.rate_cache import RateSnapshot
+
+
+"""
+================== Refresh scheduler ==================
+
+Refresh the exchange rates once after each BNR publication (see 'bnr_calendar') instead of on
+demand, and notify the consumers (the window, the conversion service, ...) when the snapshot changed.
+
+Usage:
+    - scheduler = RefreshScheduler(CurrencyConvertor('USD'))
+    - scheduler.subscribe(lambda snapshot: print(snapshot.published))
+    - scheduler.start()
+    - scheduler.current()
+
+Note:
+    - The reads never wait for the network: 'current' returns the last snapshot at once and, if it
+    is stale, starts a revalidation in the background (stale-while-revalidate).
+    - The refresh is planned 'publication_delay' after the next publication. If the rates of the
+    day aren't published yet (or the source can't be reached), it is tried again every
+    'retry_interval' seconds until they are; the source isn't polled otherwise.
+    - The listeners are called from the refresh thread: a GUI must hand the snapshot over to its
+    own thread (such as through a queue polled with 'after').
+"""
+
+
+PUBLICATION_DELAY = datetime.timedelta(minutes=5)
+RETRY_INTERVAL = 300.0  # seconds
+
+
+class RefreshScheduler:
+    """
+    The RefreshScheduler class keeps the snapshot of a CurrencyConvertor up-to-date with the BNR
+    publications and publishes its changes.
+
+    Attributes:
+        currency_converter (CurrencyConvertor): The source of the snapshots (its cache and providers).
+        publication_delay (datetime.timedelta): The delay between a publication and its refresh.
+        retry_interval (float): The delay between two attempts while the rates of the day aren't
+        available, in seconds.
+        snapshot (RateSnapshot or None): The last snapshot (None until one is loaded).
+        next_refresh (datetime.datetime or None): When the next refresh is planned.
+        offline (bool): Whether the last refresh couldn't reach the source (the snapshot being the
+        outdated cached one).
+    """
+    def __init__(self, currency_converter: CurrencyConvertor, publication_delay: datetime.timedelta = PUBLICATION_DELAY,
+                 retry_interval: float = RETRY_INTERVAL,
+                 clock: Callable[[], datetime.datetime] | None = None):
+        self.currency_converter = currency_converter
+        self.publication_delay = publication_delay
+        self.retry_interval = retry_interval
+        self.snapshot = None
+        self.next_refresh = None
+        self.offline = False
+        self._clock = clock or (lambda: datetime.datetime.now(datetime.timezone.utc))
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._worker = None
+        self._timer = None
+        self._running = False
+
+    def subscribe(self, listener: Callable[[RateSnapshot], None]) -> None:
+        """
+        Register a function called with the new snapshot each time the snapshot changes.
+        """
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[RateSnapshot], None]) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    @property
+    def in_progress(self) -> bool:
+        """
+        True while a refresh is running.
+        """
+        worker = self._worker
+        return worker is not None and worker.is_alive()
+
+    def is_current(self, snapshot: RateSnapshot | None = None, now: datetime.datetime | None = None) -> bool:
+        """
+        Check if a snapshot (the last one if not provided) holds the rates of the last publication.
+
+        Note:
+            - A snapshot without publication date (read from the web page) is current once fetched
+            after the last publication, so the page isn't downloaded again until the next one.
+        """
+        snapshot = snapshot if snapshot is not None else self.snapshot
+        if snapshot is None:
+            return False
+        publication = last_publication(now or self._clock())
+        if snapshot.published is None:
+            return snapshot.fetched_at >= publication.timestamp()
+        return snapshot.published >= publication.date().isoformat()
+
+    def current(self) -> RateSnapshot | None:
+        """
+        Get the last snapshot without waiting, revalidating it in the background if it is stale.
+        """
+        snapshot = self.snapshot
+        if not self.is_current(snapshot):
+            self.refresh_now()
+        return snapshot
+
+    def start(self) -> None:
+        """
+        Load the cached snapshot and plan the next refresh (at once if the cached snapshot is stale).
+        """
+        self._running = True
+        if self.snapshot is None:
+            self.snapshot = self.currency_converter.rate_cache.load()
+        if self.is_current():
+            self._schedule(self._delay_to_next_publication())
+        else:
+            self.refresh_now()
+
+    def stop(self) -> None:
+        """
+        Cancel the planned refreshes (a running refresh still completes).
+        """
+        with self._lock:
+            self._running = False
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self.next_refresh = None
+
+    def join(self, timeout: float | None = None) -> None:
+        """
+        Wait for the running refresh (if any).
+        """
+        worker = self._worker
+        if worker is not None:
+            worker.join(timeout)
+
+    def refresh_now(self) -> bool:
+        """
+        Start a refresh in a worker thread, unless one is already running.
+
+        Returns:
+            bool: Whether a refresh was started.
+        """
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive():
+                return False
+            self._worker = threading.Thread(target=self._refresh, daemon=True)
+            self._worker.start()
+            return True
+
+    def _delay_to_next_publication(self) -> float:
+        now = self._clock()
+        return (next_publication(now) + self.publication_delay - now).total_seconds()
+
+    def _schedule(self, delay: float) -> None:
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._running:
+                return
+            self._timer = threading.Timer(max(0.0, delay), self.refresh_now)
+            self._timer.daemon = True
+            self._timer.start()
+            self.next_refresh = self._clock() + datetime.timedelta(seconds=delay)
+
+    def _fetch(self) -> RateSnapshot | None:
+        """
+        Get the snapshot of the last publication: from the cache if another refresh already stored it,
+        otherwise from the source (even if the cache considers its snapshot fresh).
+        """
+        cached_snapshot = self.currency_converter.rate_cache.load()
+        if cached_snapshot is not None and self.is_current(cached_snapshot):
+            return cached_snapshot
+        return self.currency_converter.fetch_snapshot(revalidate=True)
+
+    def _refresh(self) -> None:
+        """
+        Refresh the snapshot, notify the listeners if it changed and plan the next refresh.
+        """
+        started = time.time()
+        try:
+            with metrics.span('scheduled_refresh'):
+                snapshot = self._fetch()
+        except Exception as e:
+            metrics.increment('errors', stage='refresh')
+            print(e)
+            snapshot = None
+
+        # Neither current nor fetched by this refresh: the source couldn't be reached
+        self.offline = snapshot is None or (not self.is_current(snapshot) and snapshot.fetched_at < started)
+        changed = snapshot is not None and (self.snapshot is None or self.snapshot.version != snapshot.version)
+        if snapshot is not None:
+            self.snapshot = snapshot
+        if changed:
+            for listener in list(self._listeners):
+                try:
+                    listener(snapshot)
+                except Exception as e:
+                    metrics.increment('errors', stage='refresh_listener')
+                    print(e)
+
+        if self.is_current():
+            self._schedule(self._delay_to_next_publication())
+        else:
+            self._schedule(self.retry_interval)
@@ -1,4 +1,4 @@
-from currencyconverter.currency_converter_window import CurrencyConverterWindow
+import sys
 
 
 __author__ = 'Dragos-Gabriel Enache'
@@ -15,5 +15,11 @@ __all__ = []
 
 
 if __name__ == '__main__':
+    # With arguments, run the command line interface (without loading the graphical interface)
+    if len(sys.argv) > 1:
+        from currencyconverter.cli import main
+        sys.exit(main())
+
+    from currencyconverter.currency_converter_window import CurrencyConverterWindow
     currencyconverter = CurrencyConverterWindow()
     currencyconverter.mainloop()
@@ -0,0 +1,76 @@
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from benchmarks.suite import BASELINE_FORMAT_VERSION, compare, load_results, main
+
+
+def _results(**medians: float) -> dict:
+    return {'format_version': BASELINE_FORMAT_VERSION,
+            'results': {name: {'median': median, 'min': median} for name, median in medians.items()}}
+
+
+class TestSuite(unittest.TestCase):
+    """
+    Unit tests for the comparison of the benchmark results with a baseline.
+    """
+
+    def setUp(self):
+        """
+        Set up a temporary directory for the saved results.
+        """
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """
+        Remove the temporary directory after testing.
+        """
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _save(self, name: str, results: dict) -> str:
+        path = os.path.join(self.temp_dir, name)
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(results, file)
+        return path
+
+    def test_compare(self):
+        """
+        Test the compare function.
+
+        Only the benchmarks slower than the baseline beyond the threshold should be flagged, and the
+        benchmarks missing from the baseline should be skipped.
+        """
+        comparisons = compare(_results(parse=1.0, fetch=1.0), _results(parse=1.2, fetch=1.3, new=5.0), 0.25)
+
+        self.assertEqual(comparisons, [('parse', 1.0, 1.2, False), ('fetch', 1.0, 1.3, True)])
+
+    def test_load_results(self):
+        """
+        Test the load_results function with a valid file and a file in another format.
+        """
+        self.assertEqual(load_results(self._save('valid.json', _results(parse=1.0))), _results(parse=1.0))
+        with self.assertRaises(ValueError):
+            load_results(self._save('invalid.json', {'format_version': BASELINE_FORMAT_VERSION + 1}))
+
+    def test_compare_exit_code(self):
+        """
+        Test the exit code of the compare command: 1 with a regression, 0 without, 2 for an invalid baseline.
+        """
+        baseline = self._save('baseline.json', _results(parse=1.0))
+        slower = self._save('slower.json', _results(parse=2.0))
+        faster = self._save('faster.json', _results(parse=0.9))
+        invalid = self._save('invalid.json', [])
+
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            self.assertEqual(main(['compare', baseline, '--current', slower]), 1)
+            self.assertEqual(main(['compare', baseline, '--current', faster]), 0)
+            self.assertEqual(main(['compare', invalid, '--current', faster]), 2)
+        self.assertIn('REGRESSION', output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+from decimal import Decimal
+
+from src.currencyconverter.amount_parser import AmountParseException, format_amounts, parse_amounts
+
+
+class TestAmountParser(unittest.TestCase):
+    """
+    Unit tests for the amount parser.
+    """
+
+    def test_parse_amounts(self):
+        """
+        Test the parse_amounts function with several terms, separators and optional spaces.
+        """
+        self.assertEqual(parse_amounts('10EUR + 5.5 GBP, 300JPY'),
+                         [(Decimal('10'), 'EUR'), (Decimal('5.5'), 'GBP'), (Decimal('300'), 'JPY')])
+        self.assertEqual(parse_amounts(' 27.34eur '), [(Decimal('27.34'), 'EUR')])
+        self.assertEqual(parse_amounts('1 USD 2USD;-0.5RON'),
+                         [(Decimal('1'), 'USD'), (Decimal('2'), 'USD'), (Decimal('-0.5'), 'RON')])
+
+    def test_parse_amounts_invalid(self):
+        """
+        Test that the texts without an amount or a currency code are rejected with the error position.
+        """
+        for text, position in (('', 0), ('10', 0), ('EUR', 0), ('10EURO', 0), ('10EUR +', 7), ('10 EUR 5', 7)):
+            with self.assertRaises(AmountParseException, msg=text) as context:
+                parse_amounts(text)
+            self.assertEqual(context.exception.position, position, text)
+
+    def test_format_amounts(self):
+        """
+        Test the format_amounts function.
+        """
+        self.assertEqual(format_amounts(parse_amounts('10EUR,5.5gbp')), '10 EUR + 5.5 GBP')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import pathlib
+import unittest
+
+from src.currencyconverter.backfill import BackfillJob, HostLimiter
+from src.currencyconverter.fixture_server import FixtureServer
+from src.currencyconverter.http_client import HttpClient
+from src.currencyconverter.rate_store import RateStore
+
+FIXTURES_DIR = os.path.join(pathlib.Path(__file__).resolve().parent.parent, 'fixtures')
+
+
+class TestBackfillJob(unittest.TestCase):
+    """
+    Unit tests for the BackfillJob class, against the replayed yearly archive.
+    """
+
+    def setUp(self):
+        """
+        Start a FixtureServer instance serving the 2023 archive ('/nbrfxrates2023') and set up an empty store.
+        """
+        self.server = FixtureServer(FIXTURES_DIR).start()
+        self.http_client = HttpClient(retries=0, read_timeout=5.0)
+        self.rate_store = RateStore(':memory:')
+        self.backfill_job = BackfillJob(self.rate_store, self.http_client, self.server.url_for('nbrfxrates') + '{year}',
+                                        requests_per_second=None)
+
+    def tearDown(self):
+        """
+        Close the store and stop the server after testing.
+        """
+        self.rate_store.close()
+        self.http_client.close()
+        self.server.stop()
+
+    def test_run(self):
+        """
+        Test that the publications of the range are stored and that a second run downloads nothing.
+        """
+        progress = []
+
+        report = self.backfill_job.run('2023-11-14', '2023-11-17', progress=lambda *args: progress.append(args))
+        second_report = self.backfill_job.run('2023-11-14', '2023-11-17')
+
+        self.assertEqual((report.fetched_years, report.stored, report.failed), ([2023], 4, {}))
+        self.assertEqual(progress, [(2023, 4)])
+        self.assertEqual(self.rate_store.publication_dates, ['2023-11-14', '2023-11-15', '2023-11-16', '2023-11-17'])
+        self.assertEqual((second_report.skipped_years, second_report.stored), ([2023], 0))
+        self.assertEqual(self.server.request_count('nbrfxrates2023'), 1)
+
+    def test_resume(self):
+        """
+        Test that the dates already stored are not written again and that a missing archive is reported.
+        """
+        self.rate_store.append_snapshot('2023-11-15', {'EUR': 1.0, 'RON': 1.0})
+
+        report = self.backfill_job.run('2022-12-30', '2023-11-17')
+
+        self.assertEqual((report.fetched_years, report.stored), ([2023], 4))
+        self.assertIn(2022, report.failed)
+        self.assertEqual(self.rate_store.rates_on('2023-11-15')['EUR'], 1.0)
+        self.assertEqual(len(self.rate_store.publication_dates), 5)
+
+    def test_host_limiter(self):
+        """
+        Test that the requests to a host are spaced according to the rate limit.
+        """
+        delays = []
+        host_limiter = HostLimiter(concurrency=2, requests_per_second=4, clock=lambda: 10.0, sleep=delays.append)
+
+        for _ in range(3):
+            with host_limiter:
+                pass
+
+        self.assertEqual(delays, [0.25, 0.5])
+
+
+if __name__ == '__main__':
+    unittest.main()
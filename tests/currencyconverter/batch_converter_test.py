@@ -0,0 +1,92 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.currencyconverter.batch_converter import BatchConverter
+from src.currencyconverter.cross_rates import CrossRateEngine
+
+
+class TestBatchConverter(unittest.TestCase):
+    """
+    Unit tests for the BatchConverter class.
+    """
+
+    def setUp(self):
+        """
+        Set up a BatchConverter instance with a small chunk size for testing.
+        """
+        self.temp_dir = tempfile.mkdtemp()
+        self.batch_converter = BatchConverter(CrossRateEngine({'EUR': 5.0, 'USD': 4.0, 'RON': 1.0}), 'USD', chunk_size=2)
+
+    def tearDown(self):
+        """
+        Remove the temporary directory after testing.
+        """
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_convert_chunk(self):
+        """
+        Test the convert_chunk method with default and explicit targets and an unknown currency.
+        """
+        chunk = pd.DataFrame({'amount': [10.0, 8.0, 1.0], 'currency': ['EUR', 'USD', 'XYZ'],
+                              'target': [None, 'EUR', None]})
+
+        np.testing.assert_array_equal(self.batch_converter.convert_chunk(chunk), [12.5, 6.4, np.nan])
+
+    def test_convert_file(self):
+        """
+        Test the convert_file method across several chunks.
+
+        All the rows should be written in order, with the converted amount appended.
+        """
+        input_path = os.path.join(self.temp_dir, 'input.csv')
+        output_path = os.path.join(self.temp_dir, 'output.csv')
+        with open(input_path, 'w') as file:
+            file.write('amount,currency,target\n10,EUR\n8, USD,EUR\n100,RON,USD\n1,XYZ\n2.5,EUR,RON\n')
+
+        report = self.batch_converter.convert_file(input_path, output_path, has_header=True)
+
+        with open(output_path) as file:
+            lines = file.read().splitlines()
+        self.assertEqual(lines, ['amount,currency,target,converted', '10.0,EUR,USD,12.50', '8.0,USD,EUR,6.40',
+                                 '100.0,RON,USD,25.00', '1.0,XYZ,USD,', '2.5,EUR,RON,12.50'])
+        self.assertEqual((report.rows, report.unknown_rows), (5, 1))
+
+    def test_convert_file_invalid_amounts(self):
+        """
+        Test the convert_file method with malformed and missing amounts.
+
+        The invalid rows should be written without converted amount and counted, without failing the run.
+        """
+        input_path = os.path.join(self.temp_dir, 'input.csv')
+        output_path = os.path.join(self.temp_dir, 'output.csv')
+        with open(input_path, 'w') as file:
+            file.write('10,EUR\n12.5.1,EUR\nabc,EUR\n,USD\n1,XYZ\n')
+
+        report = self.batch_converter.convert_file(input_path, output_path)
+
+        with open(output_path) as file:
+            lines = file.read().splitlines()
+        self.assertEqual(lines, ['amount,currency,target,converted', '10.0,EUR,USD,12.50', '12.5.1,EUR,USD,',
+                                 'abc,EUR,USD,', ',USD,USD,', '1.0,XYZ,USD,'])
+        self.assertEqual((report.rows, report.unknown_rows, report.invalid_rows), (5, 1, 3))
+
+    def test_lowercase_currencies(self):
+        """
+        Test that the currency codes of the rows and the default target are case-insensitive.
+        """
+        batch_converter = BatchConverter(CrossRateEngine({'EUR': 5.0, 'USD': 4.0, 'RON': 1.0}), 'usd')
+        chunk = pd.DataFrame({'amount': [10.0, 8.0, 1.0], 'currency': ['eur', 'Usd', 'xyz'],
+                              'target': [None, 'eur', None]})
+
+        np.testing.assert_array_equal(batch_converter.convert_chunk(chunk), [12.5, 6.4, np.nan])
+        self.assertEqual(batch_converter.default_target, 'USD')
+        self.assertEqual(batch_converter._labels_of(chunk['currency']), ['EUR', 'USD', 'XYZ'])
+
+
+if __name__ == '__main__':
+    unittest.main()
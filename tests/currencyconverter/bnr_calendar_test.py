@@ -0,0 +1,47 @@
+import datetime
+import unittest
+
+from src.currencyconverter.bnr_calendar import (BNR_TIMEZONE, is_business_day, last_publication, next_publication,
+                                                orthodox_easter)
+
+
+class TestBnrCalendar(unittest.TestCase):
+    """
+    Unit tests for the BNR calendar module.
+    """
+
+    def test_orthodox_easter(self):
+        """
+        Test the orthodox_easter function against known dates.
+        """
+        self.assertEqual(orthodox_easter(2023), datetime.date(2023, 4, 16))
+        self.assertEqual(orthodox_easter(2024), datetime.date(2024, 5, 5))
+
+    def test_is_business_day(self):
+        """
+        Test the is_business_day function for a working day, a weekend day and legal holidays.
+        """
+        self.assertTrue(is_business_day(datetime.date(2023, 11, 17)))
+        self.assertFalse(is_business_day(datetime.date(2023, 11, 18)))
+        self.assertFalse(is_business_day(datetime.date(2023, 12, 1)))
+        self.assertFalse(is_business_day(datetime.date(2024, 5, 6)))
+
+    def test_last_publication(self):
+        """
+        Test the last_publication function before and after the daily publication time.
+        """
+        self.assertEqual(last_publication(datetime.datetime(2023, 11, 20, 12, 0, tzinfo=BNR_TIMEZONE)),
+                         datetime.datetime(2023, 11, 17, 13, 0, tzinfo=BNR_TIMEZONE))
+        self.assertEqual(last_publication(datetime.datetime(2023, 11, 20, 13, 0, tzinfo=BNR_TIMEZONE)),
+                         datetime.datetime(2023, 11, 20, 13, 0, tzinfo=BNR_TIMEZONE))
+
+    def test_next_publication(self):
+        """
+        Test the next_publication function across a holiday.
+        """
+        self.assertEqual(next_publication(datetime.datetime(2023, 11, 29, 14, 0, tzinfo=BNR_TIMEZONE)),
+                         datetime.datetime(2023, 12, 4, 13, 0, tzinfo=BNR_TIMEZONE))
+
+
+if __name__ == '__main__':
+    unittest.main()
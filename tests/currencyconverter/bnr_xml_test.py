@@ -0,0 +1,56 @@
+import io
+import os
+import pathlib
+import unittest
+
+from src.currencyconverter.bnr_xml import EmptyFeedException, iter_cubes, parse_latest
+from src.currencyconverter.rate_parsers import parse_rates_targeted
+
+
+FIXTURES_DIR = os.path.join(pathlib.Path(__file__).resolve().parent.parent, 'fixtures')
+
+
+class TestBnrXml(unittest.TestCase):
+    """
+    Unit tests for the BNR XML feed parser.
+    """
+
+    def test_parse_latest(self):
+        """
+        Test the parse_latest function on the daily feed.
+
+        The rates should match the ones displayed on the web page for the same day.
+        """
+        published, exchange_rates = parse_latest(os.path.join(FIXTURES_DIR, 'nbrfxrates.xml'))
+        with open(os.path.join(FIXTURES_DIR, 'cursbnr.html'), 'rb') as file:
+            page_rates = parse_rates_targeted(file.read())
+
+        self.assertEqual(published, '2023-11-17')
+        self.assertEqual(exchange_rates.pop('RON'), 1.0)
+        self.assertEqual(exchange_rates.keys(), page_rates.keys())
+        for currency, value in page_rates.items():
+            self.assertAlmostEqual(exchange_rates[currency], value)
+
+    def test_iter_cubes_archive(self):
+        """
+        Test the iter_cubes function on a yearly archive, read from a stream.
+
+        Each business day should be yielded in order, with the multiplier applied.
+        """
+        with open(os.path.join(FIXTURES_DIR, 'nbrfxrates2023.xml'), 'rb') as file:
+            cubes = list(iter_cubes(io.BytesIO(file.read())))
+
+        self.assertEqual([published for published, _ in cubes],
+                         ['2023-11-13', '2023-11-14', '2023-11-15', '2023-11-16', '2023-11-17'])
+        self.assertAlmostEqual(cubes[-1][1]['HUF'], 0.01308)
+
+    def test_parse_latest_empty_feed(self):
+        """
+        Test the parse_latest function on a document without any 'Cube'.
+        """
+        with self.assertRaises(EmptyFeedException):
+            parse_latest(io.BytesIO(b'<DataSet xmlns="http://www.bnr.ro/xsd"><Body></Body></DataSet>'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import contextlib
+import functools
+import io
+import json
+import os
+import pstats
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.currencyconverter.cli import main
+from src.currencyconverter.currency_converter import CurrencyConvertor
+from src.currencyconverter.instrumentation import metrics
+from src.currencyconverter.rate_cache import RateCache, RateSnapshot
+
+
+class TestCli(unittest.TestCase):
+    """
+    Unit tests for the command line interface.
+    """
+
+    def setUp(self):
+        """
+        Set up a fresh cached snapshot in a temporary directory and use it for all the commands.
+        """
+        self.temp_dir = tempfile.mkdtemp()
+        rate_cache = RateCache(self.temp_dir)
+        rate_cache.store(RateSnapshot({'EUR': 5.0, 'USD': 4.0, 'RON': 1.0}, 'test'))
+        converter_patch = patch('src.currencyconverter.cli.CurrencyConvertor',
+                                functools.partial(CurrencyConvertor, rate_cache=rate_cache))
+        converter_patch.start()
+        self.addCleanup(converter_patch.stop)
+
+    def tearDown(self):
+        """
+        Remove the temporary directory after testing.
+        """
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def run_main(self, *argv: str) -> tuple[int, str, str]:
+        """
+        Run the command line interface, capturing the exit code and the outputs.
+        """
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            exit_code = main(list(argv))
+        return exit_code, stdout.getvalue(), stderr.getvalue()
+
+    def test_convert(self):
+        """
+        Test the convert command.
+        """
+        self.assertEqual(self.run_main('convert', '100', 'eur', 'USD'), (0, '100.00 EUR = 125.00 USD\n', ''))
+
+    def test_convert_unknown_currency(self):
+        """
+        Test the convert command with an unknown currency.
+        """
+        self.assertEqual(self.run_main('convert', '100', 'EUR', 'XYZ'), (1, '', 'Unknown currency: XYZ\n'))
+
+    def test_rates(self):
+        """
+        Test the rates command.
+        """
+        exit_code, output, _ = self.run_main('rates', '--base', 'USD', '--decimals', '2')
+
+        self.assertEqual((exit_code, output), (0, 'EUR 0.80\nRON 4.00\nUSD 1.00\n'))
+
+    def test_profile_and_metrics(self):
+        """
+        Test that the '--profile' and '--metrics' options write the profile and the metrics of the command.
+        """
+        profile_path, metrics_path = os.path.join(self.temp_dir, 'convert.prof'), os.path.join(self.temp_dir, 'm.json')
+
+        exit_code, _, _ = self.run_main('--profile', profile_path, '--metrics', metrics_path,
+                                        'convert', '1', 'EUR', 'USD')
+        metrics.disable()
+
+        with open(metrics_path, encoding='utf-8') as file:
+            counters = json.load(file)['counters']
+        self.assertEqual((exit_code, counters['conversions'], counters['rate_cache_hits']), (0, 1, 1))
+        self.assertGreater(pstats.Stats(profile_path).total_calls, 0)
+
+    def test_no_gui_or_heavy_imports(self):
+        """
+        Test that importing the command line interface loads neither tkinter nor the heavy packages.
+        """
+        code = ('import sys, src.currencyconverter.cli; '
+                'print(sorted({"tkinter", "customtkinter", "numpy", "pandas", "requests", "bs4", "lxml"} '
+                '& set(sys.modules)))')
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+
+        self.assertEqual(result.stdout.strip(), '[]')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+
+import numpy as np
+
+from src.currencyconverter.cross_rates import CrossRateEngine, UnknownCurrencyException
+
+
+class TestCrossRateEngine(unittest.TestCase):
+    """
+    Unit tests for the CrossRateEngine class.
+    """
+
+    def setUp(self):
+        """
+        Set up a CrossRateEngine instance with RON-denominated rates for testing.
+        """
+        self.cross_rates = CrossRateEngine({'EUR': 5.0, 'USD': 4.0, 'RON': 1.0})
+
+    def test_rates_for(self):
+        """
+        Test the rates_for method.
+
+        The rates should express the amount of each currency for one unit of the reference currency.
+        """
+        np.testing.assert_allclose(self.cross_rates.rates_for('USD'), [0.8, 1.0, 4.0])
+
+    def test_convert_all_with_targets(self):
+        """
+        Test the convert_all method restricted to some target currencies.
+        """
+        targets = self.cross_rates.positions_of(['RON', 'USD'])
+        np.testing.assert_allclose(self.cross_rates.convert_all(10, 'EUR', targets), [50.0, 12.5])
+
+    def test_matrix_matches_rates_for(self):
+        """
+        Test that each row of the cross-rate matrix equals the rates of the row's currency.
+        """
+        for position, currency in enumerate(self.cross_rates.currencies):
+            np.testing.assert_allclose(self.cross_rates.matrix[position], self.cross_rates.rates_for(currency))
+
+    def test_convert_unknown_currency(self):
+        """
+        Test the convert method with a currency that has no exchange rate.
+        """
+        with self.assertRaises(UnknownCurrencyException):
+            self.cross_rates.convert(1, 'EUR', 'XYZ')
+
+
+if __name__ == '__main__':
+    unittest.main()
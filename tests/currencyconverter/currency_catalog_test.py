@@ -0,0 +1,111 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.currencyconverter.currency_catalog import (DEFAULT_CATALOG_PATH, DEFAULT_COMPILED_PATH, CatalogFormatException,
+                                                    compile_catalog, compiled_path_of, load_catalog, parse_catalog)
+from src.currencyconverter.exceptions import UnknownCurrencyException
+
+SOURCE = '''code,numeric,exponent,continent,listed,name
+USD,840,2,North America,1,US Dollar
+EUR,978,2,Europe,1,Euro
+JPY,392,0,Asia,1,Yen
+AUD,036,2,Oceania,0,Australian Dollar
+XAU,959,,Other,0,Gold
+'''
+
+
+class TestCurrencyCatalog(unittest.TestCase):
+    """
+    Unit tests for the CurrencyCatalog class and the compiled catalog file.
+    """
+
+    def setUp(self):
+        """
+        Set up a temporary directory with a catalog source.
+        """
+        self.temp_dir = tempfile.mkdtemp()
+        self.source_path = os.path.join(self.temp_dir, 'catalog.csv')
+        self.compiled_path = os.path.join(self.temp_dir, 'compiled', 'catalog.json')
+        with open(self.source_path, 'w', encoding='utf-8') as file:
+            file.write(SOURCE)
+
+    def tearDown(self):
+        """
+        Remove the temporary directory after testing.
+        """
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_parse_catalog(self):
+        """
+        Test the entries, the continents and the groups of the listed currencies of a parsed catalog.
+        """
+        catalog = parse_catalog(SOURCE)
+
+        self.assertEqual(len(catalog), 5)
+        self.assertEqual((catalog['JPY'].exponent, catalog['JPY'].numeric, catalog['JPY'].name), (0, '392', 'Yen'))
+        self.assertIsNone(catalog['XAU'].exponent)
+        self.assertEqual(catalog.continents, ['North America', 'Europe', 'Asia'])
+        self.assertEqual(catalog.groups(), [('North America', ['USD']), ('Europe', ['EUR']), ('Asia', ['JPY'])])
+        with self.assertRaises(UnknownCurrencyException):
+            catalog['XYZ']
+
+    def test_parse_catalog_errors(self):
+        """
+        Test that the malformed sources are rejected with the line of the error.
+        """
+        for text in ('code,name\n', SOURCE + 'USD,840,2,Europe,1,US Dollar\n', SOURCE + 'usd,840,2,Europe,1,Dollar\n',
+                     SOURCE + 'ABC,1,2,Europe,1,Abc\n', SOURCE + 'ABC,123,x,Europe,1,Abc\n'):
+            with self.assertRaises(CatalogFormatException):
+                parse_catalog(text)
+        with self.assertRaisesRegex(CatalogFormatException, 'line 7'):
+            parse_catalog(SOURCE + 'ABC,123,2,,1,Abc\n')
+
+    def test_compile_catalog(self):
+        """
+        Test that the compiled file is used while the source is unchanged, and compiled again after a change.
+        """
+        compile_catalog(self.source_path, self.compiled_path)
+        with open(self.compiled_path, 'r', encoding='utf-8') as file:
+            compiled = file.read()
+        # A compiled file that doesn't match its source content proves the source isn't parsed again
+        with open(self.compiled_path, 'w', encoding='utf-8') as file:
+            file.write(compiled.replace('"Yen"', '"Compiled Yen"'))
+
+        self.assertEqual(compile_catalog(self.source_path, self.compiled_path)['JPY'].name, 'Compiled Yen')
+        os.utime(self.source_path, ns=(0, 0))
+        self.assertEqual(compile_catalog(self.source_path, self.compiled_path)['JPY'].name, 'Compiled Yen')
+        with open(self.source_path, 'a', encoding='utf-8') as file:
+            file.write('GBP,826,2,Europe,1,Pound Sterling\n')
+        catalog = compile_catalog(self.source_path, self.compiled_path)
+        self.assertEqual((catalog['JPY'].name, catalog.groups()[1]), ('Yen', ('Europe', ['EUR', 'GBP'])))
+
+    def test_load_catalog(self):
+        """
+        Test that the loaded catalog is shared by the process and that the default catalog is consistent.
+        """
+        self.assertIs(load_catalog(self.source_path, self.compiled_path),
+                      load_catalog(self.source_path, self.compiled_path))
+
+        with open(DEFAULT_CATALOG_PATH, 'r', encoding='utf-8') as file:
+            catalog = parse_catalog(file.read())
+        self.assertGreater(len(catalog), 150)
+        self.assertEqual(len({entry.numeric for entry in catalog}), len(catalog))
+        self.assertEqual([catalog[code].exponent for code in ('EUR', 'JPY', 'KWD', 'CLF')], [2, 0, 3, 4])
+        self.assertEqual(catalog.continents, ['North America', 'South America', 'Europe', 'Asia', 'Africa'])
+
+    def test_compiled_path_of(self):
+        """
+        Test that a custom source doesn't share the compiled file of the default catalog (nor of another source).
+        """
+        other_source_path = os.path.join(self.temp_dir, 'other', 'catalog.csv')
+
+        self.assertEqual(compiled_path_of(DEFAULT_CATALOG_PATH), DEFAULT_COMPILED_PATH)
+        self.assertNotIn(compiled_path_of(self.source_path),
+                         (DEFAULT_COMPILED_PATH, compiled_path_of(other_source_path)))
+        self.assertEqual(os.path.dirname(compiled_path_of(self.source_path)), os.path.dirname(DEFAULT_COMPILED_PATH))
+
+
+if __name__ == '__main__':
+    unittest.main()
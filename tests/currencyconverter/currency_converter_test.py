@@ -1,7 +1,20 @@
+import io
+import os
+import pathlib
+import shutil
+import tempfile
+import time
 import unittest
 from unittest.mock import patch, MagicMock
 
 from src.currencyconverter.currency_converter import CurrencyConvertor
+from src.currencyconverter.exceptions import RatesUnavailableException, UnknownCurrencyException
+from src.currencyconverter.instrumentation import metrics
+from src.currencyconverter.rate_cache import RateCache, RateSnapshot
+from src.currencyconverter.rate_store import RateStore
+
+
+FIXTURES_DIR = os.path.join(pathlib.Path(__file__).resolve().parent.parent, 'fixtures')
 
 
 class TestCurrencyConvertor(unittest.TestCase):
@@ -13,9 +26,17 @@ class TestCurrencyConvertor(unittest.TestCase):
         """
         Set up a CurrencyConvertor instance for testing with USD as the currency reference.
         """
-        self.currency_converter = CurrencyConvertor(currency_for_reference='USD')
+        self.temp_dir = tempfile.mkdtemp()
+        self.rate_cache = RateCache(self.temp_dir)
+        self.currency_converter = CurrencyConvertor(currency_for_reference='USD', rate_cache=self.rate_cache)
+
+    def tearDown(self):
+        """
+        Remove the temporary cache directory after testing.
+        """
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
 
-    @patch('src.currencyconverter.currency_converter.requests.get')
+    @patch('requests.Session.get')
     def test_fetch_exchange_rates_failure(self, mock_requests_get):
         """
         Test the _fetch_exchange_rates method when a web request fails.
@@ -28,6 +49,177 @@ class TestCurrencyConvertor(unittest.TestCase):
 
         self.assertEqual(self.currency_converter.exchange_rates, {})
 
+    @patch('requests.Session.get')
+    def test_fetch_exchange_rates_from_fresh_cache(self, mock_requests_get):
+        """
+        Test the _fetch_exchange_rates method when the cache holds a fresh snapshot.
+
+        This method should use the cached exchange rates without contacting the web source.
+        """
+        self.rate_cache.store(RateSnapshot({'USD': 4.5, 'RON': 1.0}, 'test'))
+
+        self.currency_converter._fetch_exchange_rates()
+
+        mock_requests_get.assert_not_called()
+        self.assertEqual(self.currency_converter.exchange_rates, {'USD': 4.5, 'RON': 1.0})
+
+    @patch('requests.Session.get')
+    def test_fetch_exchange_rates_failure_uses_outdated_cache(self, mock_requests_get):
+        """
+        Test the _fetch_exchange_rates method when the web request fails and the cache is outdated.
+
+        This method should fall back to the outdated cached exchange rates.
+        """
+        mock_requests_get.side_effect = Exception('Mocked exception')
+        self.rate_cache.store(RateSnapshot({'USD': 4.4, 'RON': 1.0}, 'test', time.time() - 30 * 24 * 3600))
+
+        self.currency_converter._fetch_exchange_rates()
+
+        self.assertEqual(mock_requests_get.call_count, 2)
+        self.assertEqual(self.currency_converter.exchange_rates, {'USD': 4.4, 'RON': 1.0})
+
+    @patch('requests.Session.get')
+    def test_fetch_exchange_rates_not_modified(self, mock_requests_get):
+        """
+        Test the _fetch_exchange_rates method when the source didn't change since the cached snapshot.
+
+        The outdated snapshot should be revalidated with its ETag and kept as fetched now, without
+        querying the page.
+        """
+        mock_requests_get.return_value = MagicMock(status_code=304)
+        self.rate_cache.store(RateSnapshot({'USD': 4.4, 'RON': 1.0}, self.currency_converter.xml_url,
+                                           time.time() - 30 * 24 * 3600, validators={'etag': '"v1"'}))
+
+        self.currency_converter._fetch_exchange_rates()
+
+        headers = {call.args[0]: call.kwargs['headers'] for call in mock_requests_get.call_args_list}
+        self.assertEqual(headers[self.currency_converter.xml_url], {'If-None-Match': '"v1"'})
+        self.assertNotIn(self.currency_converter.url, headers)
+        self.assertEqual(self.currency_converter.exchange_rates, {'USD': 4.4, 'RON': 1.0})
+        self.assertTrue(self.currency_converter.is_up_to_date())
+
+    @patch('requests.Session.get')
+    def test_fetch_exchange_rates_stores_snapshot(self, mock_requests_get):
+        """
+        Test the _fetch_exchange_rates method when the web request succeeds.
+
+        This method should parse the downloaded table and store the result in the cache.
+        """
+        mock_requests_get.return_value = MagicMock(content=b'<table id="table-currencies"><tbody>'
+                                                           b'<tr><td>EUR</td><td>Euro</td><td>4.9750</td></tr>'
+                                                           b'</tbody></table>')
+
+        self.currency_converter._fetch_exchange_rates()
+
+        self.assertEqual(self.currency_converter.exchange_rates, {'EUR': 4.975, 'RON': 1.0})
+        self.assertEqual(self.rate_cache.load().rates, {'EUR': 4.975, 'RON': 1.0})
+
+    @patch('requests.Session.get')
+    def test_fetch_exchange_rates_from_page_skips_history(self, mock_requests_get):
+        """
+        Test the _fetch_exchange_rates method with a rate store when only the page is available.
+
+        The page doesn't state its publication date, so its rates should not be written to the history.
+        """
+        mock_requests_get.return_value = MagicMock(content=b'<table id="table-currencies"><tbody>'
+                                                           b'<tr><td>EUR</td><td>Euro</td><td>4.9750</td></tr>'
+                                                           b'</tbody></table>')
+        self.currency_converter.rate_store = RateStore(':memory:')
+
+        self.currency_converter._fetch_exchange_rates()
+
+        self.assertIsNone(self.currency_converter.snapshot.published)
+        self.assertEqual(self.currency_converter.rate_store.publication_dates, [])
+
+    @patch('requests.Session.get')
+    def test_fetch_exchange_rates_from_xml_feed(self, mock_requests_get):
+        """
+        Test the _fetch_exchange_rates method when the XML feed is available.
+
+        The rates should be read from the streamed XML feed, the web page being only a fallback.
+        """
+        with open(os.path.join(FIXTURES_DIR, 'nbrfxrates.xml'), 'rb') as file:
+            mock_requests_get.return_value = MagicMock(raw=io.BytesIO(file.read()), content=b'')
+
+        self.currency_converter._fetch_exchange_rates()
+
+        self.assertIn(self.currency_converter.xml_url, [call.args[0] for call in mock_requests_get.call_args_list])
+        self.assertEqual(self.currency_converter.snapshot.source, self.currency_converter.xml_url)
+        self.assertEqual(self.currency_converter.snapshot.published, '2023-11-17')
+        self.assertEqual(self.currency_converter.exchange_rates['EUR'], 4.972)
+
+    @patch('requests.Session.get')
+    def test_fetch_exchange_rates_appends_history(self, mock_requests_get):
+        """
+        Test the _fetch_exchange_rates method with a rate store.
+
+        The downloaded publication should be appended to the history.
+        """
+        with open(os.path.join(FIXTURES_DIR, 'nbrfxrates.xml'), 'rb') as file:
+            mock_requests_get.return_value = MagicMock(raw=io.BytesIO(file.read()))
+        self.currency_converter.rate_store = RateStore(':memory:')
+
+        self.currency_converter._fetch_exchange_rates()
+
+        self.assertEqual(self.currency_converter.rate_store.publication_dates, ['2023-11-17'])
+        self.assertAlmostEqual(self.currency_converter.rate_store.rate('JPY', '2023-11-20'), 0.03046)
+
+    @patch('requests.Session.get')
+    def test_rebase_does_not_fetch(self, mock_requests_get):
+        """
+        Test the rebase method.
+
+        Changing the reference currency should derive the rates from the fetched ones without a new request
+        (timed as the 'rebase' span).
+        """
+        self.rate_cache.store(RateSnapshot({'EUR': 5.0, 'USD': 4.0, 'RON': 1.0}, 'test'))
+        self.currency_converter.fetch_all_details()
+        metrics.enable()
+        self.addCleanup(metrics.disable)
+
+        self.currency_converter.rebase('EUR')
+
+        mock_requests_get.assert_not_called()
+        self.assertEqual(self.currency_converter.currency_for_reference, 'EUR')
+        self.assertEqual(self.currency_converter.exchange_rates, {'EUR': 1.0, 'USD': 1.25, 'RON': 5.0})
+        self.assertEqual(self.currency_converter.currency_per_continent['Europe']['RON'], 5.0)
+        self.assertEqual(metrics.histogram('rebase').count, 1)
+
+    @patch('requests.Session.get')
+    def test_convert_unavailable_rates(self, mock_requests_get):
+        """
+        Test the convert method when the rates can't be fetched and nothing is cached.
+        """
+        mock_requests_get.side_effect = Exception('Mocked exception')
+
+        with self.assertRaises(RatesUnavailableException):
+            self.currency_converter.convert(1, 'EUR', 'USD')
+
+    def test_convert_from_cache(self):
+        """
+        Test the convert method with a fresh cached snapshot.
+        """
+        self.rate_cache.store(RateSnapshot({'EUR': 5.0, 'USD': 4.0, 'RON': 1.0}, 'test'))
+
+        self.assertEqual(self.currency_converter.convert(100, 'EUR', 'USD'), 125.0)
+        with self.assertRaises(UnknownCurrencyException):
+            self.currency_converter.convert(100, 'EUR', 'XYZ')
+
+    @patch('requests.Session.get')
+    def test_load_cached_details_does_not_fetch(self, mock_requests_get):
+        """
+        Test the load_cached_details method with an outdated cached snapshot.
+
+        The outdated rates should be used without contacting the web source.
+        """
+        self.rate_cache.store(RateSnapshot({'EUR': 5.0, 'USD': 4.0, 'RON': 1.0}, 'test', time.time() - 30 * 24 * 3600))
+
+        self.currency_converter.load_cached_details()
+
+        mock_requests_get.assert_not_called()
+        self.assertFalse(self.currency_converter.is_up_to_date())
+        self.assertEqual(self.currency_converter.currency_per_continent['Europe']['EUR'], 0.8)
+
 
 if __name__ == '__main__':
     unittest.main()
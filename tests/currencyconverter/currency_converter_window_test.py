@@ -2,10 +2,9 @@ import unittest
 from unittest.mock import MagicMock
 from tkinter import Tk
 
-from customtkinter import CTkEntry
-
 from src.currencyconverter.currency_converter import CurrencyConvertor
 from src.currencyconverter.currency_converter_window import CurrencyConverterWindow
+from src.currencyconverter.rate_cache import RateSnapshot
 
 
 class TestCurrencyConverterWindow(unittest.TestCase):
@@ -46,20 +45,61 @@ class TestCurrencyConverterWindow(unittest.TestCase):
 
         self.assertEqual(self.currency_converter_window.value_to_convert_entry.get(), '10 USD')
 
+    def test_split_value_currency_several_amounts(self):
+        """
+        Test the split_value_currency method with several amounts.
+
+        The sum of the amounts should be converted, and an invalid text (or an unknown currency) should
+        leave the values and the terms unchanged.
+        """
+        self.currency_converter_window.value_to_convert_entry.insert(0, '10USD + 5 usd')
+        self.currency_converter_window.split_value_currency(MagicMock())
+        terms = self.currency_converter_window.currency_model.terms
+
+        self.currency_converter_window.value_to_convert_entry.insert('end', ' +')
+        self.currency_converter_window.split_value_currency(MagicMock())
+
+        self.assertEqual([(str(amount), currency) for amount, currency in terms], [('10', 'USD'), ('5', 'USD')])
+        self.assertEqual(self.currency_converter_window.currency_model.terms, terms)
+
+        self.currency_converter_window.value_to_convert_entry.delete(0, 'end')
+        self.currency_converter_window.value_to_convert_entry.insert(0, '10 USD + 5 XYZ')
+        self.currency_converter_window.split_value_currency(MagicMock())
+
+        self.assertEqual(self.currency_converter_window.currency_model.terms, terms)
+
+    def test_rates_state_without_publication_date(self):
+        """
+        Test the state of rates read from the web page: their fetch time is shown, and they are not
+        reported as offline while the last refresh succeeded.
+        """
+        window = self.currency_converter_window
+        window.refresh_scheduler.join()
+        window.refresh_scheduler.offline = False
+        window.currency_converter.apply_snapshot(RateSnapshot({'USD': 4.5, 'RON': 1.0}, 'page'))
+
+        window._show_rates_state()
+
+        self.assertTrue(window.status_label.cget('text').startswith('Rates of date unknown, fetched'))
+
     def test_reset_currency(self):
         """
         Test the reset_currency method.
 
         This method should reset the currency_for_reference attribute in the currency converter to 'USD'.
         """
-        self.currency_converter_window.value_widgets = [
-            CTkEntry(self.currency_converter_window), CTkEntry(self.currency_converter_window)
-        ]
-
         self.currency_converter_window.reset_currency()
 
         self.assertEqual(self.currency_converter_window.currency_converter.currency_for_reference, 'USD')
 
+    def test_currency_grids(self):
+        """
+        Test that the continent lists only create the widgets of their visible rows.
+        """
+        for currency_grid in self.currency_converter_window.currency_grids:
+            self.assertEqual(len(currency_grid.rows), currency_grid.viewport.visible)
+            self.assertLessEqual(len(currency_grid.rows), 15)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,102 @@
+import importlib
+import sys
+import types
+import unittest
+from unittest.mock import patch
+
+from src.currencyconverter.currency_model import CurrencyModel
+from src.currencyconverter.currency_registry import CurrencyRegistry
+
+
+class StubWidget:
+    """
+    A widget without Tk, recording what the grid draws (the text of a label, the content of an entry).
+    """
+    def __init__(self, master=None, **kwargs):
+        self.options = {'text': '', 'state': 'normal'}
+        self.content = ''
+        self.fractions = None
+
+    def grid(self, **kwargs):
+        pass
+
+    def grid_propagate(self, flag):
+        pass
+
+    def bind(self, *args, **kwargs):
+        pass
+
+    def configure(self, **kwargs):
+        self.options.update(kwargs)
+
+    def delete(self, first, last):
+        if self.options['state'] == 'normal':
+            self.content = ''
+
+    def insert(self, index, text):
+        if self.options['state'] == 'normal':
+            self.content = text
+
+    def set(self, *fractions):
+        self.fractions = fractions
+
+
+def import_currency_grid():
+    """
+    Import the currency_grid module with stub widgets in place of customtkinter.
+    """
+    stub_ctk = types.ModuleType('customtkinter')
+    stub_ctk.CTkFrame = stub_ctk.CTkLabel = stub_ctk.CTkEntry = stub_ctk.CTkScrollbar = StubWidget
+    with patch.dict(sys.modules, {'customtkinter': stub_ctk}):
+        sys.modules.pop('src.currencyconverter.currency_grid', None)
+        return importlib.import_module('src.currencyconverter.currency_grid')
+
+
+class TestCurrencyGrid(unittest.TestCase):
+    """
+    Unit tests for the CurrencyGrid class.
+    """
+
+    def setUp(self):
+        """
+        Set up a grid of 3 rows showing the 8 currencies of the second continent of a model.
+        """
+        currency_grid = import_currency_grid()
+        codes = ['AAA', 'BBB', 'CCC', 'DDD', 'EEE', 'FFF', 'GGG', 'HHH']
+        currency_registry = CurrencyRegistry([('North America', ['USD']), ('Europe', codes)])
+        currency_registry.set_values({code: float(index) for index, code in enumerate(codes)})
+        self.currency_model = CurrencyModel(currency_registry)
+        self.currency_grid = currency_grid.CurrencyGrid(None, self.currency_model, range(1, 9),
+                                                        height=3 * currency_grid.ROW_HEIGHT + 10)
+
+    def drawn(self) -> list[tuple[str, str]]:
+        return [(currency.options['text'], value.content) for currency, value in self.currency_grid.rows]
+
+    def test_rows(self):
+        """
+        Test that only the visible rows are created, and that they are rebound to the scrolled currencies.
+        """
+        self.assertEqual(self.drawn(), [('AAA', '0.0'), ('BBB', '1.0'), ('CCC', '2.0')])
+        self.assertIsNotNone(self.currency_grid.scrollbar)
+
+        self.currency_grid._scroll_by(4)
+
+        self.assertEqual(self.drawn(), [('EEE', '4.0'), ('FFF', '5.0'), ('GGG', '6.0')])
+        self.assertEqual([value.options['state'] for _, value in self.currency_grid.rows], ['disabled'] * 3)
+        self.assertEqual(self.currency_grid.scrollbar.fractions, self.currency_grid.viewport.fractions())
+
+    def test_redraw(self):
+        """
+        Test that the redraw method only updates the visible rows of the changed positions of the grid.
+        """
+        self.currency_grid._scroll_by(1)
+        self.currency_model.values = [9.0, 0.5, 1.5, 2.5, 3.5, 4.5, 5.5, 6.5, 7.5]
+
+        self.currency_grid.redraw([0, 1, 3, 8])
+
+        # Position 0 belongs to another continent, and positions 1 and 8 are scrolled out
+        self.assertEqual(self.drawn(), [('BBB', '1.0'), ('CCC', '2.5'), ('DDD', '3.0')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+from decimal import Decimal, ROUND_DOWN
+
+from src.currencyconverter.currency_model import CurrencyModel
+from src.currencyconverter.currency_registry import CurrencyRegistry
+from src.currencyconverter.fixed_point import FixedPointEngine, FixedPointOverflowException
+
+
+class TestCurrencyModel(unittest.TestCase):
+    """
+    Unit tests for the CurrencyModel class.
+    """
+
+    def setUp(self):
+        """
+        Set up a CurrencyModel instance with two continents for testing.
+        """
+        currency_registry = CurrencyRegistry([('North America', ['USD']), ('Europe', ['EUR', 'GBP'])])
+        currency_registry.set_values({'USD': 1.0, 'EUR': 0.8})
+        self.currency_model = CurrencyModel(currency_registry)
+        self.notifications = []
+        self.currency_model.subscribe(self.notifications.append)
+
+    def test_display_order(self):
+        """
+        Test that the currencies keep the display order and are grouped by continent.
+        """
+        self.assertEqual(self.currency_model.items(), [('USD', 1.0), ('EUR', 0.8), ('GBP', None)])
+        self.assertEqual(self.currency_model.items_by_continent(),
+                         {'North America': [('USD', 1.0)], 'Europe': [('EUR', 0.8), ('GBP', None)]})
+
+    def test_set_values_notifies_changes_only(self):
+        """
+        Test that the listeners are only notified about the values that changed.
+        """
+        self.assertEqual(self.currency_model.set_values([1.0, 0.9, None]), [1])
+        self.assertEqual(self.currency_model.set_values([1.0, 0.9, None]), [])
+        self.assertEqual(self.notifications, [[1]])
+
+    def test_convert(self):
+        """
+        Test the convert method, with a currency without exchange rate.
+        """
+        fixed_point = FixedPointEngine({'EUR': 5.0, 'USD': 4.0, 'RON': 1.0})
+
+        changed = self.currency_model.convert(fixed_point, Decimal('10'), 'EUR')
+
+        self.assertEqual(changed, [0, 1])
+        self.assertEqual(self.currency_model.values, [12.5, 10.0, None])
+        self.assertEqual((self.currency_model.amount, self.currency_model.currency), (Decimal('10'), 'EUR'))
+
+    def test_convert_many(self):
+        """
+        Test the convert_many method: the values are the sums of the converted amounts.
+        """
+        fixed_point = FixedPointEngine({'EUR': 5.0, 'USD': 4.0, 'RON': 1.0})
+
+        self.currency_model.convert_many(fixed_point, [(Decimal('10'), 'EUR'), (Decimal('2'), 'USD')])
+
+        self.assertEqual(self.currency_model.values, [14.5, 11.6, None])
+        self.assertEqual((self.currency_model.amount, self.currency_model.currency), ('10 EUR + 2 USD', None))
+
+    def test_convert_large_amount(self):
+        """
+        Test that large amounts are converted exactly, without rounding the rate first.
+        """
+        fixed_point = FixedPointEngine({'EUR': 4.972, 'USD': 4.5665, 'RON': 1.0})
+
+        self.currency_model.convert(fixed_point, '123456789.99', 'EUR')
+        self.assertEqual(self.currency_model.values[0], 134419612.36)
+        self.currency_model.convert(fixed_point, '123456789.99', 'EUR', ROUND_DOWN)
+        self.assertEqual(self.currency_model.values[0], 134419612.35)
+
+    def test_convert_many_overflow(self):
+        """
+        Test that a sum of huge amounts (each one convertible alone) raises an exception instead of
+        wrapping around, keeping the values.
+        """
+        fixed_point = FixedPointEngine({'EUR': 4.972, 'USD': 0.01, 'RON': 1.0})
+        self.currency_model.convert(fixed_point, '10', 'EUR')
+        values = list(self.currency_model.values)
+
+        with self.assertRaises(FixedPointOverflowException):
+            self.currency_model.convert_many(fixed_point, [(Decimal('8e13'), 'EUR')] * 3)
+
+        self.assertEqual(self.currency_model.values, values)
+        self.assertEqual(self.currency_model.terms, [('10', 'EUR')])
+
+
+if __name__ == '__main__':
+    unittest.main()
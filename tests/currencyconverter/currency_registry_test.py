@@ -0,0 +1,50 @@
+import unittest
+
+from src.currencyconverter.currency_registry import CurrencyRegistry
+from src.currencyconverter.exceptions import UnknownCurrencyException
+
+
+class TestCurrencyRegistry(unittest.TestCase):
+    """
+    Unit tests for the CurrencyRegistry class.
+    """
+
+    def setUp(self):
+        """
+        Set up a CurrencyRegistry instance with two continents for testing.
+        """
+        self.currency_registry = CurrencyRegistry([('Europe', ['EUR', 'RON', 'GBP']), ('Asia', ['JPY', 'EUR'])])
+
+    def test_dense_ids(self):
+        """
+        Test that the ids follow the display order and that the duplicated currencies are kept once.
+        """
+        self.assertEqual(self.currency_registry.codes, ['EUR', 'RON', 'GBP', 'JPY'])
+        self.assertEqual(self.currency_registry.id_of('JPY'), 3)
+        self.assertEqual(self.currency_registry.currencies[3].continent_id, 1)
+        self.assertEqual(self.currency_registry.continent_slice('Asia'), slice(3, 4))
+        with self.assertRaises(UnknownCurrencyException):
+            self.currency_registry.id_of('XYZ')
+
+    def test_set_values(self):
+        """
+        Test the set_values method and the continent views of the values.
+        """
+        europe = self.currency_registry.continent_values('Europe')
+
+        self.currency_registry.set_values({'EUR': 0.92, 'JPY': 149.92, 'XYZ': 1.0})
+
+        self.assertEqual(europe[0], 0.92)
+        self.assertIsNone(self.currency_registry.value('RON'))
+        self.assertEqual(self.currency_registry.as_dict(),
+                         {'Europe': {'EUR': 0.92, 'RON': None, 'GBP': None}, 'Asia': {'JPY': 149.92}})
+
+    def test_positions_in(self):
+        """
+        Test the positions_in method.
+        """
+        self.assertEqual(self.currency_registry.positions_in(['JPY', 'USD', 'EUR']).tolist(), [2, -1, -1, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,7 @@
 import unittest
 from unittest.mock import patch
+from src.currencyconverter.currency_model import CurrencyModel
+from src.currencyconverter.currency_registry import CurrencyRegistry
 from src.currencyconverter.data_validator import DataValidator, InvalidLocationException
 
 
@@ -12,9 +14,8 @@ class TestDataValidator(unittest.TestCase):
         """
         Set up a DataValidator instance for testing.
         """
-        self.currency_widgets = []
-        self.value_widgets = []
-        self.data_validator = DataValidator(self.currency_widgets, self.value_widgets)
+        self.currency_model = CurrencyModel(CurrencyRegistry())
+        self.data_validator = DataValidator(self.currency_model)
 
     @patch('src.currencyconverter.data_validator.browse_folder')
     def test_validate_and_save_to_excel_invalid_location(self, mock_browse_folder):
@@ -1,7 +1,15 @@
+import os
+import shutil
+import tempfile
 import unittest
-from doctest import master
-import customtkinter as ctk
+from decimal import Decimal
+
+from openpyxl import load_workbook
+
+from src.currencyconverter.currency_model import CurrencyModel
+from src.currencyconverter.currency_registry import CurrencyRegistry
 from src.currencyconverter.excel_converter import ExcelConverter
+from src.currencyconverter.rate_store import RateStore
 
 
 class TestExcelConverter(unittest.TestCase):
@@ -15,9 +23,11 @@ class TestExcelConverter(unittest.TestCase):
 
         This method creates an instance of ExcelConverter with specified parameters for testing.
         """
-        self.currency_widgets = [ctk.CTkLabel(master=master), ctk.CTkLabel(master=master)]
-        self.value_widgets = [ctk.CTkEntry(master=master), ctk.CTkEntry(master=master)]
-        self.excel_converter = ExcelConverter('/path/to/save', 'test_excel', self.currency_widgets, self.value_widgets)
+        currency_registry = CurrencyRegistry([('Europe', ['EUR', 'RON']), ('Asia', ['JPY'])])
+        currency_registry.set_values({'EUR': 0.92, 'RON': 4.57, 'JPY': 149.92})
+        self.currency_model = CurrencyModel(currency_registry)
+        self.currency_model.published = '2023-11-17'
+        self.excel_converter = ExcelConverter('/path/to/save', 'test_excel', self.currency_model)
 
     def test_saving_location_property(self):
         """
@@ -35,6 +45,70 @@ class TestExcelConverter(unittest.TestCase):
         """
         self.assertEqual(self.excel_converter.excel_name, 'test_excel')
 
+    def test_export_to_csv(self):
+        """
+        Test the export_to_csv method.
+
+        This test verifies that the values are read from the model and written to the CSV file.
+        """
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, True)
+        ExcelConverter(temp_dir, 'test_excel', self.currency_model).export_to_csv()
+
+        with open(os.path.join(temp_dir, 'test_excel.csv'), encoding='utf-8') as file:
+            self.assertEqual(file.read().splitlines(), ['Currency,Value', 'EUR,0.92', 'RON,4.57', 'JPY,149.92'])
+
+    def test_export_to_xlsx(self):
+        """
+        Test the export_to_xlsx method.
+
+        This test verifies that every continent gets its own sheet and that the metadata is written (the terms
+        of a sum of several amounts as its reference currency).
+        """
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, True)
+        report = ExcelConverter(temp_dir, 'test_excel', self.currency_model).export_to_xlsx()
+
+        workbook = load_workbook(report.path, read_only=True)
+        self.assertEqual(workbook.sheetnames, ['Europe', 'Asia', 'Metadata'])
+        self.assertEqual(list(workbook['Europe'].values), [('Currency', 'Value'), ('EUR', 0.92), ('RON', 4.57)])
+        metadata = dict(workbook['Metadata'].values)
+        self.assertEqual((metadata['Rates published'], metadata['Reference currency']), ('2023-11-17', 'USD'))
+        self.assertEqual(report.rows, 3)
+        workbook.close()
+
+        self.currency_model.terms = [(Decimal('10'), 'EUR'), (Decimal('5.5'), 'GBP')]
+        self.currency_model.amount, self.currency_model.currency = '10 EUR + 5.5 GBP', None
+        report = ExcelConverter(temp_dir, 'terms', self.currency_model).export_to_xlsx()
+
+        workbook = load_workbook(report.path, read_only=True)
+        self.assertEqual(dict(workbook['Metadata'].values)['Reference currency'], '10 EUR + 5.5 GBP')
+        workbook.close()
+
+    def test_export_history_to_xlsx(self):
+        """
+        Test the export_history_to_xlsx method.
+
+        This test verifies that one row is written for each publication, relative to the reference
+        currency, and that the peak memory is reported.
+        """
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, True)
+        rate_store = RateStore(os.path.join(temp_dir, 'history.sqlite3'))
+        self.addCleanup(rate_store.close)
+        rate_store.append_many([('2023-11-16', {'EUR': 5.0, 'RON': 1.0}),
+                                ('2023-11-17', {'EUR': 4.0, 'RON': 1.0, 'JPY': 0.03})])
+        excel_converter = ExcelConverter(temp_dir, 'history', self.currency_model)
+        report = excel_converter.export_history_to_xlsx(rate_store, 'EUR', measure_memory=True)
+
+        workbook = load_workbook(report.path, read_only=True)
+        self.assertEqual(list(workbook['History'].values), [('Date', 'EUR', 'RON', 'JPY'),
+                                                             ('2023-11-16', 1, 5),
+                                                             ('2023-11-17', 1, 4, 133.3333)])
+        self.assertEqual(report.rows, 2)
+        self.assertGreater(report.peak_memory, 0)
+        workbook.close()
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+from decimal import (Decimal, ROUND_CEILING, ROUND_DOWN, ROUND_FLOOR, ROUND_HALF_EVEN, ROUND_HALF_UP, ROUND_UP,
+                     localcontext)
+
+import numpy as np
+
+from src.currencyconverter.currency_catalog import DEFAULT_CATALOG_PATH, parse_catalog
+from src.currencyconverter.exceptions import UnknownCurrencyException
+from src.currencyconverter.fixed_point import (FixedPointEngine, FixedPointOverflowException, ROUNDING_MODES,
+                                               minor_unit_exponents)
+
+
+class TestFixedPointEngine(unittest.TestCase):
+    """
+    Unit tests for the FixedPointEngine class.
+    """
+
+    def setUp(self):
+        """
+        Set up a FixedPointEngine instance with BNR-like rates for testing.
+        """
+        self.rates = {'EUR': 4.972, 'USD': 4.5665, 'JPY': 0.03046, 'KRW': 0.00354, 'KWD': 14.8123, 'XAU': 290.3456,
+                      'RON': 1.0}
+        with open(DEFAULT_CATALOG_PATH, 'r', encoding='utf-8') as file:
+            self.exponents = minor_unit_exponents(parse_catalog(file.read()))
+        self.fixed_point = FixedPointEngine(self.rates, exponents=self.exponents)
+
+    def test_minor_unit_exponents(self):
+        """
+        Test the ISO 4217 exponents given to the engine (the default exponent for the missing currencies).
+        """
+        self.assertEqual([self.exponents[currency] for currency in ('EUR', 'JPY', 'KWD', 'HUF', 'XAU')],
+                         [2, 0, 3, 2, 4])
+        self.assertEqual(self.fixed_point.exponents.tolist(), [2, 2, 0, 0, 3, 4, 2])
+        self.assertEqual(self.fixed_point.exponent_of('XYZ'), 2)
+        self.assertEqual(FixedPointEngine(self.rates).exponents.tolist(), [2] * len(self.rates))
+
+    def test_convert(self):
+        """
+        Test the convert method, rounding to the minor unit of the target currency.
+        """
+        self.assertEqual(self.fixed_point.convert('100', 'EUR', 'JPY'), Decimal('16323'))
+        self.assertEqual(self.fixed_point.convert('100', 'EUR', 'KWD'), Decimal('33.567'))
+        self.assertEqual(self.fixed_point.convert('123456789.99', 'EUR', 'USD'), Decimal('134419612.36'))
+        with self.assertRaises(UnknownCurrencyException):
+            self.fixed_point.convert('1', 'EUR', 'GBP')
+
+    def test_rounding_modes_on_ties(self):
+        """
+        Test the rounding modes on the amounts exactly halfway between two minor units.
+        """
+        fixed_point = FixedPointEngine({'EUR': 2.0, 'RON': 1.0})
+        amounts = np.array([1, 3, -1, -3])  # 0.005, 0.015, -0.005 and -0.015 EUR
+        expected = {ROUND_HALF_EVEN: [0, 2, 0, -2], ROUND_HALF_UP: [1, 2, -1, -2], ROUND_DOWN: [0, 1, 0, -1],
+                    ROUND_FLOOR: [0, 1, -1, -2], ROUND_CEILING: [1, 2, 0, -1]}
+        for rounding, values in expected.items():
+            self.assertEqual(fixed_point.convert_minor(amounts, 'RON', np.array([0]), rounding).tolist(),
+                             values, rounding)
+
+    def test_matches_decimal_reference(self):
+        """
+        Test that the bulk conversions are exact: the same results as Decimal with enough precision.
+        """
+        rng = np.random.default_rng(7)
+        amounts = rng.integers(-10 ** 15, 10 ** 15, 2000)
+        sources = rng.integers(0, len(self.rates), 2000)
+        targets = rng.integers(0, len(self.rates), 2000)
+        scaled_rates = self.fixed_point.scaled_rates.tolist()
+        exponents = self.fixed_point.exponents.tolist()
+
+        for rounding in ROUNDING_MODES:
+            converted = self.fixed_point.convert_minor_many(amounts, sources, targets, rounding).tolist()
+            with localcontext() as context:
+                context.prec = 60
+                expected = [int((Decimal(amount) * scaled_rates[source] * 10 ** exponents[target] /
+                                 (scaled_rates[target] * 10 ** exponents[source])).to_integral_value(rounding))
+                            for amount, source, target in zip(amounts.tolist(), sources.tolist(), targets.tolist())]
+            self.assertEqual(converted, expected, rounding)
+
+    def test_overflow(self):
+        """
+        Test that the amounts too large for 64 bits raise an exception instead of wrapping around.
+        """
+        with self.assertRaises(FixedPointOverflowException):
+            self.fixed_point.convert_minor(np.array([2 ** 62]), 'EUR', np.array([2]))
+        with self.assertRaises(FixedPointOverflowException):
+            self.fixed_point.convert('1e30', 'EUR', 'RON')
+        with self.assertRaises(FixedPointOverflowException):
+            self.fixed_point.convert_minor_many(10 ** 30, 0, 1)
+
+    def test_exact_pairs(self):
+        """
+        Test an engine with a pair whose conversion factor is too large for the int64 limbs.
+
+        Only that pair should be converted with 'decimal', the other conversions staying available.
+        """
+        fixed_point = FixedPointEngine({'BIG': 10000000.0, 'SML': 0.000123, 'RON': 1.0})
+
+        self.assertEqual(fixed_point.convert('1', 'BIG', 'SML'), Decimal('81300813008.13'))
+        self.assertEqual(fixed_point.convert('-1', 'BIG', 'SML', ROUND_FLOOR), Decimal('-81300813008.14'))
+        self.assertEqual(fixed_point.convert('1', 'RON', 'BIG', ROUND_UP), Decimal('0.01'))
+        self.assertEqual(fixed_point.convert_minor(np.array([[100], [200]]), 'BIG').tolist(),
+                         [[100, 8130081300813, 1000000000], [200, 16260162601626, 2000000000]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import pathlib
+import shutil
+import tempfile
+import unittest
+
+import requests
+
+from src.currencyconverter.currency_converter import CurrencyConvertor
+from src.currencyconverter.fixture_server import FixtureServer, Recording, UpstreamConditions, record
+from src.currencyconverter.http_client import HttpClient
+from src.currencyconverter.rate_cache import RateCache
+from src.currencyconverter.rate_providers import BnrXmlProvider, CursBnrProvider
+
+FIXTURES_DIR = os.path.join(pathlib.Path(__file__).resolve().parent.parent, 'fixtures')
+
+
+class TestFixtureServer(unittest.TestCase):
+    """
+    Unit tests for the FixtureServer class and the recording of the responses.
+    """
+
+    def setUp(self):
+        """
+        Start a FixtureServer instance replaying the fixtures and set up an HttpClient without retries.
+        """
+        self.temp_dir = tempfile.mkdtemp()
+        self.server = FixtureServer(FIXTURES_DIR).start()
+        self.http_client = HttpClient(retries=0, read_timeout=5.0)
+
+    def tearDown(self):
+        """
+        Stop the server and remove the temporary directory after testing.
+        """
+        self.http_client.close()
+        self.server.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_replay(self):
+        """
+        Test that a recording is replayed with its headers and that its validators are honoured.
+        """
+        response = self.http_client.get(self.server.url_for('nbrfxrates'))
+        not_modified = self.http_client.get(self.server.url_for('nbrfxrates'),
+                                            validators=self.http_client.validators_of(response))
+
+        with open(os.path.join(FIXTURES_DIR, 'nbrfxrates.xml'), 'rb') as file:
+            self.assertEqual(response.content, file.read())
+        self.assertEqual(response.headers['ETag'], '"nbrfxrates-20231117"')
+        self.assertEqual((not_modified.status_code, not_modified.content), (304, b''))
+        self.assertEqual(self.server.request_count('nbrfxrates'), 2)
+
+    def test_record(self):
+        """
+        Test that a recorded response (here, replayed by the server) is saved and loaded back.
+        """
+        recording = record(self.server.url_for('cursbnr'), 'page', self.temp_dir, self.http_client)
+        loaded = Recording.load(self.temp_dir, 'page')
+
+        self.assertEqual((loaded.url, loaded.status, loaded.body), (recording.url, 200, recording.body))
+        self.assertEqual(loaded.headers['ETag'], '"cursbnr-20231117"')
+        self.assertNotIn('Content-Length', loaded.headers)
+
+    def test_errors_and_throttling(self):
+        """
+        Test the simulated errors and the throttling (429 with 'Retry-After') of the upstream conditions.
+        """
+        self.server.add_route('flaky', 'cursbnr', UpstreamConditions(error_rate=1.0, error_status=502))
+        self.server.add_route('limited', 'cursbnr', UpstreamConditions(requests_per_second=1))
+
+        with self.assertRaises(requests.HTTPError):
+            self.http_client.get(self.server.url_for('flaky'))
+        self.assertEqual(self.http_client.get(self.server.url_for('limited')).status_code, 200)
+        with self.assertRaises(requests.HTTPError) as context:
+            self.http_client.get(self.server.url_for('limited'))
+        self.assertEqual(context.exception.response.headers['Retry-After'], '1')
+
+    def test_currency_convertor_offline(self):
+        """
+        Test a whole refresh of the CurrencyConvertor class against the replayed sources.
+        """
+        currency_converter = CurrencyConvertor('EUR', rate_cache=RateCache(self.temp_dir), http_client=self.http_client,
+                                               providers=[BnrXmlProvider(self.server.url_for('nbrfxrates')),
+                                                          CursBnrProvider(self.server.url_for('cursbnr'))])
+
+        currency_converter.fetch_all_details()
+
+        self.assertEqual(currency_converter.snapshot.published, '2023-11-17')
+        self.assertEqual(self.server.request_count('cursbnr'), 0)
+        self.assertEqual(currency_converter.exchange_rates['EUR'], 1.0)
+        self.assertAlmostEqual(currency_converter.convert(100, 'EUR', 'RON'), 497.2, delta=0.1)
+
+
+if __name__ == '__main__':
+    unittest.main()
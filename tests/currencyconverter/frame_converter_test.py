@@ -0,0 +1,111 @@
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.currencyconverter.cross_rates import CrossRateEngine
+from src.currencyconverter.currency_converter import CurrencyConvertor
+from src.currencyconverter.exceptions import UnknownCurrencyException
+from src.currencyconverter.frame_converter import FrameConverter, _frame_converter_of, convert_frame
+from src.currencyconverter.rate_analytics import RateHistory
+from src.currencyconverter.rate_cache import RateCache, RateSnapshot
+from src.currencyconverter.rate_store import RateStore
+
+
+class TestFrameConverter(unittest.TestCase):
+    """
+    Unit tests for the FrameConverter class and the convert_frame function.
+    """
+
+    def setUp(self):
+        """
+        Set up the current rates and a history of two publications (EUR and USD in RON).
+        """
+        self.cross_rates = CrossRateEngine({'EUR': 5.0, 'USD': 4.0, 'RON': 1.0})
+        self.history = RateHistory(['EUR', 'RON', 'USD'])
+        self.history.append_many([('2023-01-02', {'EUR': 5.0, 'USD': 4.0, 'RON': 1.0}),
+                                  ('2023-01-04', {'EUR': 6.0, 'USD': 4.0, 'RON': 1.0})])
+        self.frame = pd.DataFrame({'amount': [10.0, 8.0, 1.0, None, 2.5],
+                                   'currency': ['EUR', 'USD', 'XYZ', 'EUR', 'EUR'],
+                                   'target': [None, 'EUR', 'USD', 'USD', 'RON']},
+                                  index=[10, 11, 12, 13, 14])
+
+    def test_convert_frame(self):
+        """
+        Test the convert_frame method with a single target, per-row targets and a categorical column.
+
+        The rows with an unknown currency or a missing amount should be converted to NaN.
+        """
+        converted = convert_frame(self.frame, 'amount', 'currency', to='USD', rates=self.cross_rates)
+
+        self.assertEqual(converted.index.tolist(), [10, 11, 12, 13, 14])
+        np.testing.assert_array_equal(converted, [12.5, 8.0, np.nan, np.nan, 3.125])
+        converted = convert_frame(self.frame, 'amount', 'currency', to='USD', rates=self.cross_rates,
+                                  target_col='target', decimals=2)
+        np.testing.assert_array_equal(converted, [12.5, 6.4, np.nan, np.nan, 12.5])
+        self.frame['currency'] = self.frame['currency'].astype('category')
+        converted = convert_frame(self.frame, 'amount', 'currency', to='RON', rates=self.cross_rates)
+        np.testing.assert_array_equal(converted, [50.0, 32.0, np.nan, np.nan, 12.5])
+        with self.assertRaises(UnknownCurrencyException):
+            convert_frame(self.frame, 'amount', 'currency', to='XYZ', rates=self.cross_rates)
+
+    def test_convert_frame_dates(self):
+        """
+        Test the convert_frame method at the rates valid on the date of each row.
+
+        Each date should use the nearest publication on or before it, whatever the type of the column,
+        and the dates before the first publication (or missing) should be converted to NaN.
+        """
+        frame = pd.DataFrame({'amount': [10.0, 10.0, 10.0, 10.0, 10.0], 'currency': ['EUR'] * 5})
+        dates = ['2023-01-01', '2023-01-03', '2023-01-04', '2023-01-09', None]
+        expected = [np.nan, 50.0, 60.0, 60.0, np.nan]
+
+        for column in (dates, pd.to_datetime(dates) + pd.Timedelta(hours=15)):
+            frame['date'] = column
+            converted = convert_frame(frame, 'amount', 'currency', to='RON', rates=self.history, date_col='date')
+            np.testing.assert_array_equal(converted, expected)
+        converted = convert_frame(frame, 'amount', 'currency', to='RON', rates=self.history)
+        np.testing.assert_array_equal(converted, [60.0] * 5)
+        with self.assertRaises(ValueError):
+            convert_frame(frame, 'amount', 'currency', to='RON', rates=self.cross_rates, date_col='date')
+
+    def test_convert_frame_currency_converter(self):
+        """
+        Test the convert_frame method with a CurrencyConvertor: its current rates, or the history of its
+        store (read once, and again after the store changed).
+        """
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, True)
+        rate_store = RateStore(':memory:')
+        self.addCleanup(rate_store.close)
+        rate_store.append_many([('2023-01-02', {'EUR': 5.0, 'HRK': 0.5, 'RON': 1.0}),
+                                ('2023-01-04', {'EUR': 6.0, 'RON': 1.0})])
+        rate_cache = RateCache(temp_dir)
+        rate_cache.store(RateSnapshot({'EUR': 4.0, 'RON': 1.0}, 'test'))
+        currency_converter = CurrencyConvertor('RON', rate_cache=rate_cache, rate_store=rate_store)
+        frame = pd.DataFrame({'amount': [10.0, 10.0, 10.0], 'currency': ['EUR', 'HRK', 'EUR'],
+                              'date': ['2023-01-03', '2023-01-03', '2023-01-09']})
+
+        converted = convert_frame(frame, 'amount', 'currency', to='RON', rates=currency_converter)
+        np.testing.assert_array_equal(converted, [40.0, np.nan, 40.0])
+        converted = convert_frame(frame, 'amount', 'currency', to='RON', rates=currency_converter, date_col='date')
+        np.testing.assert_array_equal(converted, [50.0, 5.0, 60.0])
+        self.assertIs(_frame_converter_of(currency_converter, True), _frame_converter_of(currency_converter, True))
+        rate_store.append_snapshot('2023-01-05', {'EUR': 7.0, 'RON': 1.0})
+        converted = convert_frame(frame, 'amount', 'currency', to='RON', rates=currency_converter, date_col='date')
+        np.testing.assert_array_equal(converted, [50.0, 5.0, 70.0])
+
+    def test_positions_of(self):
+        """
+        Test the positions_of method (the trailing NaN column for unknown currencies and empty cells).
+        """
+        frame_converter = FrameConverter.from_cross_rates(self.cross_rates)
+
+        np.testing.assert_array_equal(frame_converter.positions_of(self.frame['target']), [3, 0, 1, 1, 2])
+        np.testing.assert_array_equal(frame_converter.positions_of(self.frame['target'], 1), [1, 0, 1, 1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+
+from src.currencyconverter.grid_viewport import Viewport
+
+
+class TestViewport(unittest.TestCase):
+    """
+    Unit tests for the Viewport class.
+    """
+
+    def setUp(self):
+        """
+        Set up a Viewport instance showing 15 rows of a 170 positions list.
+        """
+        self.viewport = Viewport(170, 15)
+
+    def test_scroll(self):
+        """
+        Test that the scrolling is clamped to the list and reports whether the visible rows changed.
+        """
+        self.assertTrue(self.viewport.scroll_by(10))
+        self.assertEqual(self.viewport.visible_positions(), range(10, 25))
+        self.assertTrue(self.viewport.scroll_to(1000))
+        self.assertEqual(self.viewport.first, 155)
+        self.assertFalse(self.viewport.scroll_by(1))
+        self.assertTrue(self.viewport.scroll_to(-5))
+        self.assertEqual(self.viewport.first, 0)
+
+    def test_scroll_command(self):
+        """
+        Test the scrollbar commands ('moveto' and 'scroll' by units or pages) and the scrollbar fractions.
+        """
+        self.viewport.scroll_command('moveto', '0.5')
+        self.assertEqual(self.viewport.first, 85)
+        self.viewport.scroll_command('scroll', '-1', 'pages')
+        self.assertEqual(self.viewport.first, 70)
+        self.viewport.scroll_command('scroll', '2', 'units')
+        self.assertEqual(self.viewport.fractions(), (72 / 170, 87 / 170))
+
+    def test_row_of(self):
+        """
+        Test the row showing a position (None when scrolled out of view).
+        """
+        self.viewport.scroll_to(20)
+
+        self.assertEqual(self.viewport.row_of(20), 0)
+        self.assertEqual(self.viewport.row_of(34), 14)
+        self.assertIsNone(self.viewport.row_of(35))
+        self.assertIsNone(self.viewport.row_of(19))
+
+    def test_short_list(self):
+        """
+        Test that a list shorter than the rows is not scrollable.
+        """
+        viewport = Viewport(6, 15)
+
+        self.assertEqual((viewport.visible, viewport.scrollable), (6, False))
+        self.assertFalse(viewport.scroll_by(1))
+        self.assertEqual(viewport.fractions(), (0.0, 1.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from src.currencyconverter.http_client import HttpClient
+
+
+class TestHttpClient(unittest.TestCase):
+    """
+    Unit tests for the HttpClient class.
+    """
+
+    def setUp(self):
+        """
+        Set up an HttpClient instance recording its retry delays instead of sleeping.
+        """
+        self.delays = []
+        self.http_client = HttpClient(retries=2, backoff=0.5, sleep=self.delays.append)
+
+    @patch('requests.Session.get')
+    def test_retries_with_jitter(self, mock_session_get):
+        """
+        Test that the connection errors are retried after a jittered backoff.
+        """
+        response = MagicMock(status_code=200)
+        mock_session_get.side_effect = [requests.ConnectionError('reset'), requests.Timeout('slow'), response]
+
+        self.assertIs(self.http_client.get('https://example.com/rates'), response)
+        self.assertEqual(mock_session_get.call_count, 3)
+        self.assertTrue(0 <= self.delays[0] <= 0.5 and 0 <= self.delays[1] <= 1.0)
+        connect_timeout, read_timeout = mock_session_get.call_args.kwargs['timeout']
+        self.assertLessEqual((connect_timeout, read_timeout), (self.http_client.connect_timeout,
+                                                               self.http_client.read_timeout))
+
+    @patch('requests.Session.get')
+    def test_gives_up_after_retries(self, mock_session_get):
+        """
+        Test that the last error is raised when the retries are exhausted.
+        """
+        mock_session_get.return_value = MagicMock(status_code=503, headers={'Retry-After': '2'})
+
+        with self.assertRaises(requests.HTTPError):
+            self.http_client.get('https://example.com/rates')
+        self.assertEqual(mock_session_get.call_count, 3)
+        self.assertEqual(self.delays, [2.0, 2.0])
+
+    @patch('requests.Session.get')
+    def test_no_retry_past_total_timeout(self, mock_session_get):
+        """
+        Test that no retry is made if it would end after the total timeout.
+        """
+        mock_session_get.side_effect = requests.ConnectionError('refused')
+        http_client = HttpClient(total_timeout=0.01, retries=5, backoff=10.0, sleep=self.delays.append)
+
+        with self.assertRaises(requests.ConnectionError):
+            http_client.get('https://example.com/rates')
+        self.assertLessEqual(mock_session_get.call_count, 2)
+
+    def test_validators(self):
+        """
+        Test the validators of a response and the conditional headers built from them.
+        """
+        response = MagicMock(headers={'ETag': '"abc"', 'Last-Modified': 'Fri, 17 Nov 2023 11:00:00 GMT'})
+        validators = HttpClient.validators_of(response)
+
+        self.assertEqual(HttpClient.conditional_headers(validators),
+                         {'If-None-Match': '"abc"', 'If-Modified-Since': 'Fri, 17 Nov 2023 11:00:00 GMT'})
+        self.assertEqual(HttpClient.conditional_headers(None), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import json
+import unittest
+
+from src.currencyconverter.instrumentation import Metrics
+
+
+class TestMetrics(unittest.TestCase):
+    """
+    Unit tests for the Metrics class.
+    """
+
+    def setUp(self):
+        """
+        Set up an enabled Metrics instance for testing.
+        """
+        self.metrics = Metrics()
+        self.metrics.enable()
+
+    def test_disabled(self):
+        """
+        Test that nothing is recorded while the instrumentation is disabled.
+        """
+        self.metrics.disable()
+
+        with self.metrics.span('fetch'):
+            self.metrics.increment('conversions')
+
+        self.assertEqual(self.metrics.to_dict()['counters'], {})
+        self.assertIsNone(self.metrics.histogram('fetch'))
+
+    def test_spans_and_counters(self):
+        """
+        Test that the spans record their durations and count their failures.
+        """
+        with self.metrics.span('parse', provider='bnr-xml'):
+            pass
+        with self.assertRaises(ValueError):
+            with self.metrics.span('parse', provider='bnr-xml'):
+                raise ValueError()
+        self.metrics.increment('rate_cache_hits', 3)
+        self.metrics.increment('rate_cache_misses')
+
+        self.assertEqual(self.metrics.histogram('parse', provider='bnr-xml').count, 2)
+        self.assertEqual(self.metrics.counter('errors', stage='parse'), 1)
+        self.assertEqual(self.metrics.summary()['cache_hit_rate'], 0.75)
+        self.assertIn('parse{provider="bnr-xml"}', json.loads(self.metrics.to_json())['spans'])
+
+    def test_to_prometheus(self):
+        """
+        Test the Prometheus text export (cumulative buckets, sum and count).
+        """
+        self.metrics.observe('export', 0.003, format='csv')
+        self.metrics.observe('export', 20.0, format='csv')
+
+        lines = self.metrics.to_prometheus().splitlines()
+
+        self.assertIn('# TYPE currencyconverter_export_seconds histogram', lines)
+        self.assertIn('currencyconverter_export_seconds_bucket{format="csv",le="0.005"} 1', lines)
+        self.assertIn('currencyconverter_export_seconds_bucket{format="csv",le="+Inf"} 2', lines)
+        self.assertIn('currencyconverter_export_seconds_count{format="csv"} 2', lines)
+
+    def test_to_prometheus_escapes_labels(self):
+        """
+        Test that the backslashes, double quotes and line feeds of the label values are escaped.
+        """
+        self.metrics.increment('errors', stage='say "hi"\\\n')
+
+        lines = self.metrics.to_prometheus().splitlines()
+
+        self.assertIn('currencyconverter_errors_total{stage="say \\"hi\\"\\\\\\n"} 1', lines)
+
+    def test_timed(self):
+        """
+        Test that a timed function keeps its metadata and records a span per call.
+        """
+        @self.metrics.timed('render')
+        def render(value: int) -> int:
+            """Render a value."""
+            return value
+
+        self.assertEqual(render(1), 1)
+        self.assertEqual((render.__name__, render.__doc__, render.__wrapped__.__name__),
+                         ('render', 'Render a value.', 'render'))
+        self.assertEqual(self.metrics.histogram('render').count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
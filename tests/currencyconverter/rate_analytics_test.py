@@ -0,0 +1,97 @@
+import unittest
+
+import numpy as np
+
+from src.currencyconverter.exceptions import UnknownCurrencyException
+from src.currencyconverter.rate_analytics import RateAnalytics, RateHistory
+from src.currencyconverter.rate_store import RateStore
+
+
+class TestRateAnalytics(unittest.TestCase):
+    """
+    Unit tests for the RateHistory and RateAnalytics classes.
+    """
+
+    def setUp(self):
+        """
+        Set up a store with 60 publications of EUR and USD (in RON) and their history.
+        """
+        self.rate_store = RateStore(':memory:')
+        dates = np.arange(np.datetime64('2023-01-02'), np.datetime64('2023-03-03'))
+        self.eur = 5.0 + 0.01 * np.sin(np.arange(len(dates)))
+        self.usd = 4.0 + 0.002 * np.arange(len(dates))
+        self.rate_store.append_many((str(day), {'EUR': eur, 'USD': usd, 'RON': 1.0})
+                                    for day, eur, usd in zip(dates, self.eur, self.usd))
+        self.history = RateHistory.from_store(self.rate_store)
+
+    def tearDown(self):
+        """
+        Close the store after testing.
+        """
+        self.rate_store.close()
+
+    def test_history(self):
+        """
+        Test the history read from the store and its rates relative to a reference currency.
+        """
+        self.assertEqual((len(self.history), self.history.currencies), (60, ['EUR', 'RON', 'USD']))
+        np.testing.assert_allclose(self.history.rates('EUR')[:, 2], self.eur / self.usd)
+        with self.assertRaises(UnknownCurrencyException):
+            self.history.rates('XYZ')
+        with self.assertRaises(ValueError):
+            self.history.append('2023-01-15', {'EUR': 5.0})
+
+        # A currency missing from the last publication keeps its column
+        self.rate_store.append_snapshot('2022-12-30', {'EUR': 4.9, 'HRK': 0.65, 'RON': 1.0})
+        history = RateHistory.from_store(self.rate_store)
+        self.assertEqual(history.currencies, ['EUR', 'HRK', 'RON', 'USD'])
+        self.assertEqual(history.values[0, 1], 0.65)
+        self.assertTrue(np.isnan(history.values[1:, 1]).all())
+
+    def test_statistics(self):
+        """
+        Test the moving average, the volatility and the percent change against a direct computation.
+        """
+        analytics = RateAnalytics(self.history, base='EUR', window=5)
+        usd_rates = self.eur / self.usd
+        returns = np.diff(np.log(usd_rates))
+
+        self.assertTrue(np.isnan(analytics.moving_average[3, 2]))
+        self.assertAlmostEqual(analytics.moving_average[10, 2], usd_rates[6:11].mean())
+        self.assertAlmostEqual(analytics.volatility[10, 2], returns[5:10].std(ddof=1))
+        self.assertAlmostEqual(analytics.percent_change[10, 2], (usd_rates[10] / usd_rates[9] - 1) * 100)
+        self.assertEqual(analytics.latest('EUR'), {'rate': 1.0, 'moving_average': 1.0, 'volatility': 0.0,
+                                                   'percent_change': 0.0})
+
+    def test_update(self):
+        """
+        Test that the statistics updated after appending dates equal the statistics of the whole history.
+        """
+        partial = RateHistory(self.history.currencies, capacity=1)
+        partial.append_many(list(zip(self.history.dates[:40], ({'EUR': eur, 'USD': usd, 'RON': 1.0}
+                                                              for eur, usd in zip(self.eur, self.usd)))))
+        analytics = RateAnalytics(partial, base='USD', window=7)
+
+        for published, eur, usd in zip(self.history.dates[40:], self.eur[40:], self.usd[40:]):
+            partial.append(published, {'EUR': eur, 'USD': usd, 'RON': 1.0})
+            self.assertEqual(analytics.update(), 1)
+
+        full = RateAnalytics(self.history, base='USD', window=7)
+        for statistic in RateAnalytics.STATISTICS:
+            np.testing.assert_allclose(getattr(analytics, statistic), getattr(full, statistic), equal_nan=True)
+
+    def test_period_summary(self):
+        """
+        Test the minimum, the maximum and the change of the rates of each month.
+        """
+        summary = RateAnalytics(self.history, base='RON').period_summary('M')
+        january = self.usd[:30]
+
+        self.assertEqual(len(summary), 3)
+        self.assertAlmostEqual(summary[('min', 'USD')].iloc[0], 1 / january.max())
+        self.assertAlmostEqual(summary[('max', 'USD')].iloc[0], 1 / january.min())
+        self.assertAlmostEqual(summary[('change', 'USD')].iloc[0], (january[0] / january[-1] - 1) * 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import datetime
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.currencyconverter.bnr_calendar import BNR_TIMEZONE
+from src.currencyconverter.rate_cache import RateCache, RateSnapshot
+
+
+class TestRateCache(unittest.TestCase):
+    """
+    Unit tests for the RateCache class.
+    """
+
+    def setUp(self):
+        """
+        Set up a RateCache instance in a temporary directory for testing.
+        """
+        self.temp_dir = tempfile.mkdtemp()
+        self.rate_cache = RateCache(self.temp_dir)
+
+    def tearDown(self):
+        """
+        Remove the temporary directory after testing.
+        """
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_store_and_load(self):
+        """
+        Test the store and load methods.
+
+        A stored snapshot should be loaded back with the same content and version.
+        """
+        snapshot = RateSnapshot({'EUR': 4.975, 'RON': 1.0}, 'test', 1700000000.0, '2023-11-14')
+        self.rate_cache.store(snapshot)
+
+        loaded = self.rate_cache.load()
+
+        self.assertEqual(loaded.rates, snapshot.rates)
+        self.assertEqual(loaded.published, '2023-11-14')
+        self.assertEqual(loaded.version, snapshot.version)
+        self.assertEqual(os.listdir(self.temp_dir), [os.path.basename(self.rate_cache.file_path)])
+
+    def test_publication_label(self):
+        """
+        Test the publication_label property: the publication date, or the fetch time if it is unknown.
+        """
+        fetched_at = datetime.datetime(2023, 11, 17, 14, 5).timestamp()
+
+        self.assertEqual(RateSnapshot({'EUR': 4.975}, 'test', fetched_at, '2023-11-17').publication_label,
+                         '2023-11-17')
+        self.assertEqual(RateSnapshot({'EUR': 4.975}, 'test', fetched_at).publication_label,
+                         'date unknown, fetched 2023-11-17 14:05')
+
+    def test_load_missing(self):
+        """
+        Test the load method when no snapshot was stored.
+        """
+        self.assertIsNone(self.rate_cache.load())
+
+    def test_load_rejects_corrupt_entries(self):
+        """
+        Test the load method with a truncated file and with a tampered file.
+
+        Both entries should be rejected.
+        """
+        self.rate_cache.store(RateSnapshot({'EUR': 4.975}, 'test'))
+        with open(self.rate_cache.file_path, 'r') as file:
+            content = file.read()
+
+        with open(self.rate_cache.file_path, 'w') as file:
+            file.write(content[:len(content) // 2])
+        self.assertIsNone(self.rate_cache.load())
+
+        entry = json.loads(content)
+        entry['snapshot']['rates']['EUR'] = 5.5
+        with open(self.rate_cache.file_path, 'w') as file:
+            json.dump(entry, file)
+        self.assertIsNone(self.rate_cache.load())
+
+    def test_is_fresh_follows_publication_schedule(self):
+        """
+        Test the is_fresh method around the weekend.
+
+        Rates fetched on Friday afternoon should stay fresh until Monday's publication.
+        """
+        fetched_at = datetime.datetime(2023, 11, 17, 14, 0, tzinfo=BNR_TIMEZONE)
+        snapshot = RateSnapshot({'EUR': 4.975}, 'test', fetched_at.timestamp())
+
+        self.assertTrue(self.rate_cache.is_fresh(snapshot, datetime.datetime(2023, 11, 20, 12, 0, tzinfo=BNR_TIMEZONE)))
+        self.assertFalse(self.rate_cache.is_fresh(snapshot, datetime.datetime(2023, 11, 20, 13, 5, tzinfo=BNR_TIMEZONE)))
+
+    def test_is_fresh_checks_publication_date(self):
+        """
+        Test the is_fresh method with a snapshot fetched after the publication time.
+
+        Rates still dated from the previous publication (a late source) should not be fresh.
+        """
+        fetched_at = datetime.datetime(2023, 11, 17, 13, 5, tzinfo=BNR_TIMEZONE)
+        now = datetime.datetime(2023, 11, 17, 14, 0, tzinfo=BNR_TIMEZONE)
+
+        self.assertFalse(self.rate_cache.is_fresh(RateSnapshot({'EUR': 4.975}, 'test', fetched_at.timestamp(),
+                                                               '2023-11-16'), now))
+        self.assertTrue(self.rate_cache.is_fresh(RateSnapshot({'EUR': 4.975}, 'test', fetched_at.timestamp(),
+                                                              '2023-11-17'), now))
+
+    def test_is_fresh_respects_ttl(self):
+        """
+        Test the is_fresh method with a TTL shorter than the publication interval.
+        """
+        rate_cache = RateCache(self.temp_dir, ttl=datetime.timedelta(hours=1))
+        fetched_at = datetime.datetime(2023, 11, 17, 14, 0, tzinfo=BNR_TIMEZONE)
+        snapshot = RateSnapshot({'EUR': 4.975}, 'test', fetched_at.timestamp())
+
+        self.assertFalse(rate_cache.is_fresh(snapshot, datetime.datetime(2023, 11, 17, 16, 0, tzinfo=BNR_TIMEZONE)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import os
+import pathlib
+import unittest
+
+from src.currencyconverter.rate_parsers import (HTML_PARSERS, RatesTableNotFoundException, parse_rates_full,
+                                                parse_rates_targeted)
+
+
+FIXTURE_PATH = os.path.join(pathlib.Path(__file__).resolve().parent.parent, 'fixtures', 'cursbnr.html')
+
+
+class TestRateParsers(unittest.TestCase):
+    """
+    Unit tests for the exchange rates table parsers.
+    """
+
+    def setUp(self):
+        """
+        Load the saved cursbnr.ro page for testing.
+        """
+        with open(FIXTURE_PATH, 'rb') as file:
+            self.content = file.read()
+
+    def test_parsers_agree(self):
+        """
+        Test that the full and the targeted parsers extract the same exchange rates from the saved page.
+        """
+        self.assertEqual(parse_rates_full(self.content), parse_rates_targeted(self.content))
+
+    def test_multiple_units_quotes(self):
+        """
+        Test the rows quoted for multiple units (100HUF, 100JPY, 100KRW).
+
+        The rates should be stored for one unit of the currency.
+        """
+        for parser in HTML_PARSERS.values():
+            exchange_rates = parser(self.content)
+            self.assertAlmostEqual(exchange_rates['HUF'], 0.01308)
+            self.assertAlmostEqual(exchange_rates['JPY'], 0.03046)
+            self.assertAlmostEqual(exchange_rates['KRW'], 0.00354)
+            self.assertEqual(exchange_rates['EUR'], 4.972)
+            self.assertNotIn('100HUF', exchange_rates)
+
+    def test_table_not_found(self):
+        """
+        Test both parsers with a page that doesn't contain the exchange rates table.
+        """
+        for parser in HTML_PARSERS.values():
+            with self.assertRaises(RatesTableNotFoundException):
+                parser(b'<html><body><table id="other"><tbody></tbody></table></body></html>')
+
+
+if __name__ == '__main__':
+    unittest.main()
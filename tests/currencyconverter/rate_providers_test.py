@@ -0,0 +1,141 @@
+import os
+import pathlib
+import threading
+import time
+import unittest
+
+from src.currencyconverter.fixture_server import FixtureServer, UpstreamConditions
+from src.currencyconverter.http_client import HttpClient
+from src.currencyconverter.rate_cache import RateSnapshot
+from src.currencyconverter.rate_providers import (BnrXmlProvider, CursBnrProvider, EcbXmlProvider,
+                                                  NoValidRatesException, ProviderPool)
+
+FIXTURES_DIR = os.path.join(pathlib.Path(__file__).resolve().parent.parent, 'fixtures')
+
+
+class TestRateProviders(unittest.TestCase):
+    """
+    Unit tests for the rate providers and the ProviderPool class, against the replayed fixtures.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Start the fixture server, with a slow copy of the BNR feed and a broken copy of the cursbnr.ro page.
+        """
+        cls.server = FixtureServer(FIXTURES_DIR).start()
+        cls.server.add_route('bnr-slow', 'nbrfxrates', UpstreamConditions(latency=1.5))
+        cls.server.add_route('broken', 'cursbnr', UpstreamConditions(error_rate=1.0, error_status=500))
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        Stop the fixture server.
+        """
+        cls.server.stop()
+
+    def setUp(self):
+        """
+        Set up an HttpClient instance without retries for testing.
+        """
+        self.http_client = HttpClient(retries=0, read_timeout=5.0)
+        self.addCleanup(self.http_client.close)
+
+    def test_providers(self):
+        """
+        Test that every provider returns the rates in RON.
+        """
+        for provider in (BnrXmlProvider(self.server.url_for('nbrfxrates')),
+                         CursBnrProvider(self.server.url_for('cursbnr')),
+                         EcbXmlProvider(self.server.url_for('eurofxref-daily'))):
+            snapshot = provider.fetch(self.http_client)
+
+            self.assertEqual(snapshot.rates['RON'], 1.0, provider.name)
+            self.assertAlmostEqual(snapshot.rates['EUR'], 4.97, delta=0.01, msg=provider.name)
+            self.assertEqual(set(snapshot.validators), {'etag', 'last_modified'})
+
+    def test_ordered_policy(self):
+        """
+        Test that the providers are queried in order, the next one only if the previous one failed.
+        """
+        self.server.add_route('cursbnr-fallback', 'cursbnr')
+        provider_pool = ProviderPool([BnrXmlProvider(self.server.url_for('nbrfxrates')),
+                                      CursBnrProvider(self.server.url_for('cursbnr-fallback'))], self.http_client)
+
+        snapshot = provider_pool.fetch()
+
+        self.assertEqual((snapshot.source, snapshot.published), (self.server.url_for('nbrfxrates'), '2023-11-17'))
+        self.assertEqual(self.server.request_count('cursbnr-fallback'), 0)
+
+        provider_pool = ProviderPool([BnrXmlProvider(self.server.url_for('bnr-slow'), deadline=0.2),
+                                      CursBnrProvider(self.server.url_for('broken')),
+                                      CursBnrProvider(self.server.url_for('cursbnr-fallback'))], self.http_client)
+        snapshot = provider_pool.fetch()
+
+        self.assertEqual(snapshot.source, self.server.url_for('cursbnr-fallback'))
+        self.assertIsNone(snapshot.published)
+
+    def test_fastest_policy(self):
+        """
+        Test that the fastest valid response wins without waiting for the slow provider.
+
+        The slow provider should keep running in a daemon thread, which doesn't delay the exit.
+        """
+        provider_pool = ProviderPool([BnrXmlProvider(self.server.url_for('bnr-slow')),
+                                      CursBnrProvider(self.server.url_for('broken')),
+                                      CursBnrProvider(self.server.url_for('cursbnr'))], self.http_client, 'fastest')
+
+        started = time.monotonic()
+        snapshot = provider_pool.fetch()
+
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(snapshot.source, self.server.url_for('cursbnr'))
+        running = [thread for thread in threading.enumerate() if thread.name == 'rate-provider-bnr-xml']
+        self.assertTrue(running)
+        self.assertTrue(all(thread.daemon for thread in running))
+
+    def test_deadline(self):
+        """
+        Test that the providers past their deadline are not waited for.
+        """
+        for policy in ('ordered', 'fastest'):
+            provider_pool = ProviderPool([BnrXmlProvider(self.server.url_for('bnr-slow'), deadline=0.2),
+                                          CursBnrProvider(self.server.url_for('broken'))], self.http_client, policy)
+
+            started = time.monotonic()
+            with self.assertRaises(NoValidRatesException):
+                provider_pool.fetch()
+            self.assertLess(time.monotonic() - started, 1.0, policy)
+
+    def test_median_policy(self):
+        """
+        Test that the median policy combines the currencies quoted by a quorum of providers.
+        """
+        provider_pool = ProviderPool([BnrXmlProvider(self.server.url_for('nbrfxrates')),
+                                      CursBnrProvider(self.server.url_for('cursbnr')),
+                                      EcbXmlProvider(self.server.url_for('eurofxref-daily'))], self.http_client,
+                                     'median', quorum=3)
+
+        snapshot = provider_pool.fetch()
+
+        self.assertEqual(snapshot.published, '2023-11-17')
+        self.assertEqual(snapshot.rates['EUR'], 4.972)
+        self.assertNotIn('MDL', snapshot.rates)
+
+    def test_not_modified(self):
+        """
+        Test that a provider answering 304 keeps the cached rates.
+        """
+        url = self.server.url_for('nbrfxrates')
+        cached_snapshot = RateSnapshot({'EUR': 4.9, 'RON': 1.0}, url, 0, '2023-11-16',
+                                       {'etag': '"nbrfxrates-20231117"'})
+        provider_pool = ProviderPool([BnrXmlProvider(url)], self.http_client)
+
+        snapshot = provider_pool.fetch(cached_snapshot)
+
+        self.assertEqual((snapshot.rates, snapshot.published), (cached_snapshot.rates, '2023-11-16'))
+        self.assertGreater(snapshot.fetched_at, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import asyncio
+import json
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.currencyconverter.currency_converter import CurrencyConvertor
+from src.currencyconverter.rate_cache import RateCache, RateSnapshot
+from src.currencyconverter.rate_service import RateService
+
+
+class TestRateService(unittest.TestCase):
+    """
+    Unit tests for the RateService class.
+    """
+
+    def setUp(self):
+        """
+        Set up a RateService instance serving a fresh cached snapshot.
+        """
+        self.temp_dir = tempfile.mkdtemp()
+        rate_cache = RateCache(self.temp_dir)
+        rate_cache.store(RateSnapshot({'EUR': 5.0, 'USD': 4.0, 'JPY': 0.03, 'RON': 1.0}, 'test',
+                                      published='2023-11-17'))
+        self.rate_service = RateService(CurrencyConvertor('RON', rate_cache=rate_cache))
+        asyncio.run(self.rate_service.refresh())
+
+    def tearDown(self):
+        """
+        Remove the temporary directory after testing.
+        """
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_rates(self):
+        """
+        Test the '/rates' endpoint and its ETag.
+        """
+        response = self.rate_service.handle('GET', '/rates?base=eur', {})
+        not_modified = self.rate_service.handle('GET', '/rates?base=EUR', {'if-none-match': response.etag})
+
+        payload = json.loads(response.body)
+        self.assertEqual((payload['base'], payload['published']), ('EUR', '2023-11-17'))
+        self.assertEqual(payload['rates']['USD'], 1.25)
+        self.assertEqual(response.etag, f'"{self.rate_service.state.snapshot.version}"')
+        self.assertEqual((not_modified.status, not_modified.body), (304, b''))
+
+    def test_convert(self):
+        """
+        Test the 'GET /convert' endpoint and its errors.
+        """
+        response = self.rate_service.handle('GET', '/convert?amount=100&from=EUR&to=USD', {})
+
+        self.assertEqual(json.loads(response.body)['result'], '125.00')
+        self.assertEqual(self.rate_service.handle('GET', '/convert?amount=1e30&from=EUR&to=USD', {}).status, 400)
+        self.assertEqual(self.rate_service.handle('GET', '/convert?amount=1&from=EUR&to=XYZ', {}).status, 400)
+        self.assertEqual(self.rate_service.handle('GET', '/convert?amount=abc&from=EUR&to=USD', {}).status, 400)
+        self.assertEqual(self.rate_service.handle('GET', '/convert?from=EUR&to=USD', {}).status, 400)
+        self.assertEqual(self.rate_service.handle('DELETE', '/convert', {}).status, 405)
+        self.assertEqual(self.rate_service.handle('GET', '/unknown', {}).status, 404)
+
+    def test_convert_batch(self):
+        """
+        Test the 'POST /convert' endpoint: the invalid items (or too large) don't fail the batch.
+        """
+        body = json.dumps([{'amount': 100, 'from': 'EUR', 'to': 'USD'}, {'amount': '1000', 'from': 'JPY', 'to': 'RON'},
+                           {'amount': 1, 'from': 'EUR', 'to': 'XYZ'}, {'amount': 'abc', 'from': 'EUR', 'to': 'USD'},
+                           {'amount': 2.5, 'from': 'USD', 'to': 'EUR'}, {'amount': '1e30', 'from': 'EUR', 'to': 'USD'},
+                           {'amount': '5e16', 'from': 'EUR', 'to': 'RON'}]).encode('utf-8')
+
+        response = self.rate_service.handle('POST', '/convert', {}, body)
+
+        results = json.loads(response.body)['results']
+        self.assertEqual([result.get('result') for result in results],
+                         ['125.00', '30.00', None, None, '2.00', None, None])
+        self.assertEqual(results[2]['error'], 'Unknown currency: XYZ')
+        self.assertEqual(results[5]['error'], results[6]['error'])
+        self.assertIn('too large', results[6]['error'])
+        self.assertEqual(self.rate_service.handle('POST', '/convert', {}, b'{').status, 400)
+
+    def test_internal_error(self):
+        """
+        Test that an unexpected error is answered with 500 instead of escaping the handler.
+        """
+        with patch.object(RateService, '_respond', side_effect=RuntimeError('Mocked error')):
+            response = self.rate_service.handle('GET', '/rates', {})
+
+        self.assertEqual(response.status, 500)
+
+    def test_unavailable(self):
+        """
+        Test that the requests are answered with 503 until a snapshot is loaded.
+        """
+        self.rate_service.state = None
+
+        self.assertEqual(self.rate_service.handle('GET', '/rates', {}).status, 503)
+
+    def test_keep_alive(self):
+        """
+        Test that several requests are answered over one connection.
+        """
+        async def exchange():
+            server = await self.rate_service.start(port=0)
+            try:
+                reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+                writer.write(b'GET /convert?amount=1&from=EUR&to=RON HTTP/1.1\r\nHost: test\r\n\r\n'
+                             b'GET /rates HTTP/1.1\r\nHost: test\r\nConnection: close\r\n\r\n')
+                responses = await reader.read()
+                writer.close()
+                return responses
+            finally:
+                await self.rate_service.stop()
+
+        responses = asyncio.run(exchange())
+
+        self.assertEqual(responses.count(b'HTTP/1.1 200 OK'), 2)
+        self.assertIn(b'"result": "5.00"', responses)
+        self.assertTrue(responses.endswith(b'}'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import datetime
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.currencyconverter.cross_rates import UnknownCurrencyException
+from src.currencyconverter.rate_store import NoRatesForDateException, RateStore
+
+
+class TestRateStore(unittest.TestCase):
+    """
+    Unit tests for the RateStore class.
+    """
+
+    def setUp(self):
+        """
+        Set up a RateStore instance with three publications for testing.
+        """
+        self.temp_dir = tempfile.mkdtemp()
+        self.rate_store = RateStore(os.path.join(self.temp_dir, 'history.sqlite3'))
+        self.rate_store.append_many([
+            ('2023-11-17', {'EUR': 4.972, 'USD': 4.5665, 'RON': 1.0}),
+            ('2023-11-15', {'EUR': 4.970, 'USD': 4.5800, 'RON': 1.0}),
+            ('2023-11-16', {'EUR': 4.971, 'USD': 4.5700, 'RON': 1.0}),
+        ])
+
+    def tearDown(self):
+        """
+        Close the store and remove the temporary directory after testing.
+        """
+        self.rate_store.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_resolve_date(self):
+        """
+        Test the resolve_date method.
+
+        The nearest publication on or before the requested date should be found.
+        """
+        self.assertEqual(self.rate_store.publication_dates, ['2023-11-15', '2023-11-16', '2023-11-17'])
+        self.assertEqual(self.rate_store.resolve_date('2023-11-16'), '2023-11-16')
+        self.assertEqual(self.rate_store.resolve_date(datetime.date(2023, 11, 19)), '2023-11-17')
+        self.assertEqual(self.rate_store.resolve_date(), '2023-11-17')
+        with self.assertRaises(NoRatesForDateException):
+            self.rate_store.resolve_date('2023-11-14')
+
+    def test_convert_as_of(self):
+        """
+        Test the convert method at the rates of a past date.
+        """
+        self.assertAlmostEqual(self.rate_store.convert(100, 'EUR', 'USD', as_of='2023-11-15'), 497.0 / 4.58)
+        self.assertAlmostEqual(self.rate_store.convert(100, 'EUR', 'RON', as_of=datetime.date(2023, 11, 18)), 497.2)
+        with self.assertRaises(UnknownCurrencyException):
+            self.rate_store.convert(1, 'EUR', 'GBP')
+
+    def test_iter_publications(self):
+        """
+        Test the iter_publications method.
+
+        The publications in the requested range should be yielded in chronological order.
+        """
+        publications = list(self.rate_store.iter_publications('2023-11-16'))
+
+        self.assertEqual([published for published, _ in publications], ['2023-11-16', '2023-11-17'])
+        self.assertEqual(publications[0][1], {'EUR': 4.971, 'USD': 4.57, 'RON': 1.0})
+        self.assertEqual(len(list(self.rate_store.iter_publications(end=datetime.date(2023, 11, 15)))), 1)
+
+    def test_currencies(self):
+        """
+        Test the currencies method: the currencies of any publication of the range, and the revision of the writes.
+        """
+        revision = self.rate_store.revision
+        self.rate_store.append_snapshot('2023-11-14', {'EUR': 4.969, 'GBP': 5.7, 'RON': 1.0})
+
+        self.assertEqual(self.rate_store.currencies(), ['EUR', 'GBP', 'RON', 'USD'])
+        self.assertEqual(self.rate_store.currencies('2023-11-15'), ['EUR', 'RON', 'USD'])
+        self.assertEqual(self.rate_store.revision, revision + 1)
+
+    def test_history_is_persistent(self):
+        """
+        Test that a new store opened on the same database sees the stored publications.
+        """
+        rate_store = RateStore(self.rate_store.database_path)
+        try:
+            self.assertEqual(rate_store.rates_on('2023-11-16'), {'EUR': 4.971, 'USD': 4.57, 'RON': 1.0})
+        finally:
+            rate_store.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
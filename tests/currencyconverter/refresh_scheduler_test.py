@@ -0,0 +1,131 @@
+import datetime
+import os
+import pathlib
+import shutil
+import tempfile
+import unittest
+
+from src.currencyconverter.currency_converter import CurrencyConvertor
+from src.currencyconverter.fixture_server import FixtureServer, UpstreamConditions
+from src.currencyconverter.http_client import HttpClient
+from src.currencyconverter.rate_cache import RateCache, RateSnapshot
+from src.currencyconverter.rate_providers import BnrXmlProvider
+from src.currencyconverter.refresh_scheduler import RefreshScheduler
+
+FIXTURES_DIR = os.path.join(pathlib.Path(__file__).resolve().parent.parent, 'fixtures')
+# Friday 2023-11-17, 16:00 in Bucharest: the rates of the day (the 'nbrfxrates' fixture) are published
+NOW = datetime.datetime(2023, 11, 17, 14, 0, tzinfo=datetime.timezone.utc)
+# Monday 2023-11-20, 13:05 in Bucharest
+NEXT_REFRESH = datetime.datetime(2023, 11, 20, 11, 5, tzinfo=datetime.timezone.utc)
+
+
+class TestRefreshScheduler(unittest.TestCase):
+    """
+    Unit tests for the RefreshScheduler class, against the replayed BNR feed.
+    """
+
+    def setUp(self):
+        """
+        Start a FixtureServer instance and set up a cache in a temporary directory.
+        """
+        self.temp_dir = tempfile.mkdtemp()
+        self.server = FixtureServer(FIXTURES_DIR).start()
+        self.server.add_route('slow', 'nbrfxrates', UpstreamConditions(latency=0.3))
+        self.server.add_route('broken', 'nbrfxrates', UpstreamConditions(error_rate=1.0, error_status=500))
+        self.http_client = HttpClient(retries=0, read_timeout=5.0)
+        self.rate_cache = RateCache(self.temp_dir)
+        self.schedulers = []
+
+    def tearDown(self):
+        """
+        Stop the schedulers and the server, and remove the temporary directory after testing.
+        """
+        for scheduler in self.schedulers:
+            scheduler.stop()
+            scheduler.join()
+        self.http_client.close()
+        self.server.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def scheduler(self, route: str, published: str | None, fetched_at: float | None = None) -> RefreshScheduler:
+        """
+        Build a scheduler whose cached snapshot was published on a given date (and fetched at a given time).
+        """
+        self.rate_cache.store(RateSnapshot({'EUR': 5.0, 'RON': 1.0}, 'test', fetched_at, published))
+        currency_converter = CurrencyConvertor('RON', rate_cache=self.rate_cache, http_client=self.http_client,
+                                               providers=[BnrXmlProvider(self.server.url_for(route))])
+        scheduler = RefreshScheduler(currency_converter, retry_interval=3600, clock=lambda: NOW)
+        self.schedulers.append(scheduler)
+        return scheduler
+
+    def test_current_snapshot(self):
+        """
+        Test that a current snapshot is not refreshed before the next publication.
+        """
+        scheduler = self.scheduler('slow', '2023-11-17')
+
+        scheduler.start()
+
+        self.assertFalse(scheduler.in_progress)
+        self.assertEqual(scheduler.current().published, '2023-11-17')
+        self.assertEqual(scheduler.next_refresh, NEXT_REFRESH)
+        self.assertEqual(self.server.request_count('slow'), 0)
+
+    def test_stale_while_revalidate(self):
+        """
+        Test that a stale snapshot is returned at once, revalidated in the background and published once.
+        """
+        scheduler = self.scheduler('slow', '2023-11-16')
+        events = []
+        scheduler.subscribe(events.append)
+
+        scheduler.start()
+        stale = scheduler.current()
+        self.assertTrue(scheduler.in_progress)
+        self.assertFalse(scheduler.refresh_now())
+        scheduler.join()
+
+        self.assertEqual(stale.published, '2023-11-16')
+        self.assertEqual([snapshot.published for snapshot in events], ['2023-11-17'])
+        self.assertEqual(scheduler.current().published, '2023-11-17')
+        self.assertEqual(scheduler.next_refresh, NEXT_REFRESH)
+        self.assertEqual(self.server.request_count('slow'), 1)
+        self.assertFalse(scheduler.offline)
+
+    def test_unavailable_source(self):
+        """
+        Test that the refresh is tried again after 'retry_interval' while the source fails.
+        """
+        scheduler = self.scheduler('broken', '2023-11-16')
+        events = []
+        scheduler.subscribe(events.append)
+
+        scheduler.start()
+        scheduler.join()
+
+        self.assertEqual((events, scheduler.snapshot.published), ([], '2023-11-16'))
+        self.assertTrue(scheduler.offline)
+        self.assertEqual(scheduler.next_refresh, NOW + datetime.timedelta(seconds=3600))
+
+    def test_snapshot_without_publication_date(self):
+        """
+        Test a snapshot of the web page (without publication date): current once fetched after the last
+        publication, otherwise refreshed (and tried again after 'retry_interval' while the source fails).
+        """
+        scheduler = self.scheduler('broken', None, (NOW - datetime.timedelta(hours=1)).timestamp())
+
+        self.assertTrue(scheduler.is_current(self.rate_cache.load()))
+        scheduler.start()
+        self.assertEqual((self.server.request_count('broken'), scheduler.next_refresh), (0, NEXT_REFRESH))
+        scheduler.stop()
+
+        scheduler = self.scheduler('broken', None, (NOW - datetime.timedelta(days=1)).timestamp())
+        scheduler.start()
+        scheduler.join()
+
+        self.assertEqual(self.server.request_count('broken'), 1)
+        self.assertEqual(scheduler.next_refresh, NOW + datetime.timedelta(seconds=3600))
+
+
+if __name__ == '__main__':
+    unittest.main()